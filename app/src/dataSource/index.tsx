@@ -1,8 +1,9 @@
-import type { IDataSourceProps } from "../interfaces";
+import type { IDataSourceProps, ICommColumnarDatas, ICommProgressiveDatasMessage } from "../interfaces";
 import type { IRow, IDataQueryPayload } from "@kanaries/graphic-walker/interfaces";
 import commonStore from "../store/common";
 import communicationStore from "../store/communication"
 import { parser_dsl_with_meta } from "@kanaries/gw-dsl-parser";
+import { tableFromIPC } from "apache-arrow";
 import type { ICommunication } from "../utils/communication";
 
 interface MessagePayload extends IDataSourceProps {
@@ -79,6 +80,63 @@ export function finishDataService(msg: any) {
     )
 }
 
+export function decodeColumnarDatas(datas: ICommColumnarDatas | IRow[]): IRow[] {
+    if (Array.isArray(datas)) {
+        return datas;
+    }
+    const { columns, values, dictionaries, rowCount } = datas;
+    const rows = new Array<IRow>(rowCount);
+    for (let rowIndex = 0; rowIndex < rowCount; rowIndex++) {
+        rows[rowIndex] = {};
+    }
+    columns.forEach((column, columnIndex) => {
+        const columnValues = values[columnIndex];
+        const dictionary = dictionaries[columnIndex];
+        for (let rowIndex = 0; rowIndex < rowCount; rowIndex++) {
+            const value = columnValues[rowIndex];
+            rows[rowIndex][column] = dictionary && value !== null ? dictionary[value] : value;
+        }
+    });
+    return rows;
+}
+
+function decodeArrowValue(value: any): any {
+    if (typeof value === "bigint") {
+        return Number(value);
+    }
+    if (value instanceof Date) {
+        // datetimes are epoch milliseconds, as in json results
+        return value.getTime();
+    }
+    if (value !== null && typeof value === "object" && typeof value.toJSON === "function") {
+        return value.toJSON();
+    }
+    return value;
+}
+
+export function decodeArrowDatas(datas: DataView): IRow[] {
+    const table = tableFromIPC(new Uint8Array(datas.buffer, datas.byteOffset, datas.byteLength));
+    const rows = new Array<IRow>(table.numRows);
+    for (let rowIndex = 0; rowIndex < table.numRows; rowIndex++) {
+        rows[rowIndex] = {};
+    }
+    table.schema.fields.forEach((field, columnIndex) => {
+        const column = table.getChildAt(columnIndex)!;
+        for (let rowIndex = 0; rowIndex < table.numRows; rowIndex++) {
+            rows[rowIndex][field.name] = decodeArrowValue(column.get(rowIndex));
+        }
+    });
+    return rows;
+}
+
+// arrow results are arrow IPC streams in binary buffers of anywidget messages
+export function decodeDatas(datas: ICommColumnarDatas | IRow[] | DataView): IRow[] {
+    if (datas instanceof DataView) {
+        return decodeArrowDatas(datas);
+    }
+    return decodeColumnarDatas(datas);
+}
+
 interface IBatchGetDatasTask<TQuery> {
     query: TQuery;
     resolve: (value: IRow[]) => void;
@@ -87,25 +145,31 @@ interface IBatchGetDatasTask<TQuery> {
 
 function initBatchGetDatas<TQuery>(
     action: "batch_get_datas_by_sql" | "batch_get_datas_by_payload",
-    comm: ICommunication | null
+    comm: ICommunication | null,
+    onApproximate?: (queries: TQuery[], datas: IRow[][], approximate: boolean[], progressiveId: string) => void
 ) {
     const taskList = [] as IBatchGetDatasTask<TQuery>[];
+    const resultFormat = comm?.supportsBuffers ? "arrow" : "columnar";
 
     const batchGetDatas = async(taskList: IBatchGetDatasTask<TQuery>[]) => {
         const result = action === "batch_get_datas_by_sql"
             ? await comm?.sendMsg(
                 action,
-                { queryList: taskList.map(task => task.query as string) },
+                { queryList: taskList.map(task => task.query as string), resultFormat },
                 60_000
             )
             : await comm?.sendMsg(
                 action,
-                { queryList: taskList.map(task => task.query as IDataQueryPayload) },
+                { queryList: taskList.map(task => task.query as IDataQueryPayload), resultFormat },
                 60_000
             );
         if (result?.data?.datas) {
+            const datas = result.data.datas.map(decodeDatas);
+            if (result.data.approximate && result.data.progressiveId) {
+                onApproximate?.(taskList.map(task => task.query), datas, result.data.approximate, result.data.progressiveId);
+            }
             for (let i = 0; i < taskList.length; i++) {
-                taskList[i].resolve(result.data.datas[i]);
+                taskList[i].resolve(datas[i]);
             }
         } else {
             for (let i = 0; i < taskList.length; i++) {
@@ -168,10 +232,132 @@ export function getDatasFromKernelBySql(fieldMetas: any, comm: ICommunication |
     }
 }
 
+const PROGRESSIVE_EXACT_DATAS_MAX_SIZE = 64;
+// pending progressive queries whose payloads are not computed again within it are stale, eg: the chart changed
+const PROGRESSIVE_STALE_CHECK_DELAY = 1_000;
+
+interface IProgressiveState {
+    // progressive id -> query key of each approximated index, until its exact datas are pushed
+    pendingQueries: Map<string, Map<number, string>>;
+    // approximate datas are answered locally while their exact query is pending, so charts never query the kernel again
+    approximateDatas: Map<string, IRow[]>;
+    exactDatas: Map<string, IRow[]>;
+    computedQueryKeys: Set<string>;
+    staleCheckTimer: ReturnType<typeof setTimeout> | null;
+}
+
+// shared by computation callbacks of one walker, they are recreated to show exact datas
+const progressiveStates = new WeakMap<ICommunication, IProgressiveState>();
+
+function createProgressiveState(): IProgressiveState {
+    return {
+        pendingQueries: new Map(),
+        approximateDatas: new Map(),
+        exactDatas: new Map(),
+        computedQueryKeys: new Set(),
+        staleCheckTimer: null,
+    };
+}
+
+function getProgressiveState(comm: ICommunication | null): IProgressiveState {
+    if (comm === null) {
+        return createProgressiveState();
+    }
+    let state = progressiveStates.get(comm);
+    if (state === undefined) {
+        state = createProgressiveState();
+        progressiveStates.set(comm, state);
+    }
+    return state;
+}
+
+function onApproximateDatas(
+    state: IProgressiveState,
+    queries: IDataQueryPayload[],
+    datas: IRow[][],
+    approximate: boolean[],
+    progressiveId: string
+) {
+    const queryKeys = new Map<number, string>();
+    approximate.forEach((isApproximate, index) => {
+        if (isApproximate) {
+            const queryKey = JSON.stringify(queries[index]);
+            queryKeys.set(index, queryKey);
+            state.approximateDatas.set(queryKey, datas[index]);
+        }
+    });
+    state.pendingQueries.set(progressiveId, queryKeys);
+}
+
+function onExactDatas(state: IProgressiveState, message: ICommProgressiveDatasMessage) {
+    const queryKeys = state.pendingQueries.get(message.progressiveId);
+    state.pendingQueries.delete(message.progressiveId);
+    if (queryKeys === undefined) {
+        // cancelled as stale, or invalidated by kernel
+        return;
+    }
+    message.indexes.forEach((index, i) => {
+        const queryKey = queryKeys.get(index);
+        if (queryKey === undefined) {
+            return;
+        }
+        state.approximateDatas.delete(queryKey);
+        state.exactDatas.delete(queryKey);
+        state.exactDatas.set(queryKey, decodeDatas(message.datas[i]));
+        if (state.exactDatas.size > PROGRESSIVE_EXACT_DATAS_MAX_SIZE) {
+            state.exactDatas.delete(state.exactDatas.keys().next().value!);
+        }
+    });
+    communicationStore.refreshProgressiveDatas();
+}
+
+function onInvalidateDatas(state: IProgressiveState) {
+    // the kernel dropped its query cache after data changed, pending exact datas are of former data
+    state.pendingQueries.clear();
+    state.approximateDatas.clear();
+    state.exactDatas.clear();
+    communicationStore.refreshProgressiveDatas();
+}
+
+function cancelStaleProgressiveQueries(state: IProgressiveState, comm: ICommunication | null) {
+    state.staleCheckTimer = null;
+    state.pendingQueries.forEach((queryKeys, progressiveId) => {
+        if ([...queryKeys.values()].some(queryKey => state.computedQueryKeys.has(queryKey))) {
+            return;
+        }
+        state.pendingQueries.delete(progressiveId);
+        queryKeys.forEach(queryKey => state.approximateDatas.delete(queryKey));
+        comm?.sendMsgAsync("cancel_request", { rid: progressiveId });
+    });
+    state.computedQueryKeys.clear();
+}
+
+function onComputeQuery(state: IProgressiveState, queryKey: string, comm: ICommunication | null) {
+    state.computedQueryKeys.add(queryKey);
+    if (state.staleCheckTimer === null) {
+        state.staleCheckTimer = setTimeout(() => cancelStaleProgressiveQueries(state, comm), PROGRESSIVE_STALE_CHECK_DELAY);
+    }
+}
+
 export function getDatasFromKernelByPayload(comm: ICommunication | null) {
-    const batchGetDatasByPayload = initBatchGetDatas<IDataQueryPayload>("batch_get_datas_by_payload", comm);
+    const state = getProgressiveState(comm);
+    const batchGetDatasByPayload = initBatchGetDatas<IDataQueryPayload>(
+        "batch_get_datas_by_payload",
+        comm,
+        (queries, datas, approximate, progressiveId) => onApproximateDatas(state, queries, datas, approximate, progressiveId)
+    );
+    // kernels with `progressive_query` answer from a sample first, then push exact datas
+    comm?.registerEndpoint("update_datas_by_payload", (message: ICommProgressiveDatasMessage) => onExactDatas(state, message));
+    comm?.registerEndpoint("invalidate_datas", () => onInvalidateDatas(state));
     return async (payload: IDataQueryPayload) => {
-        const result = await batchGetDatasByPayload.getDatas({...payload, limit: payload.limit ?? DEFAULT_LIMIT}) ?? [];
+        const query = {...payload, limit: payload.limit ?? DEFAULT_LIMIT};
+        const queryKey = JSON.stringify(query);
+        onComputeQuery(state, queryKey, comm);
+        const localDatas = state.exactDatas.get(queryKey) ?? state.approximateDatas.get(queryKey);
+        if (localDatas !== undefined) {
+            return localDatas;
+        }
+        const result = await batchGetDatasByPayload.getDatas(query) ?? [];
         if (!payload.limit && result.length === DEFAULT_LIMIT) {
             notifyDataLimit();
         }
@@ -306,9 +306,12 @@ const ExploreApp: React.FC<IAppProps & {initChartFlag: boolean}> = (props) => {
         return undefined;
     }, [props.showCloudTool, props.enableAskViz, props.enableVlChat]);
 
+    const [progressiveDatasVersion, setProgressiveDatasVersion] = useState(communicationStore.progressiveDatasVersion);
+    useEffect(() => reaction(() => communicationStore.progressiveDatasVersion, setProgressiveDatasVersion), []);
+
     const computationCallback = React.useMemo(
         () => getComputationCallback(props),
-        [props.useKernelCalc, props.parseDslType, props.fieldMetas, props.__comm],
+        [props.useKernelCalc, props.parseDslType, props.fieldMetas, props.__comm, progressiveDatasVersion],
     );
 
     const modeChange = (value: string) => {
@@ -8,14 +8,21 @@ export type IViewField = IMutField;
 
 export interface ICommSqlQueryRequest {
     sql: string;
+    resultFormat?: "rows" | "arrow" | "columnar";
 }
 
 export interface ICommPayloadQueryRequest {
     payload: IDataQueryPayload;
+    resultFormat?: "rows" | "arrow" | "columnar";
 }
 
 export interface ICommBatchQueryRequest<TQuery> {
     queryList: TQuery[];
+    resultFormat?: "rows" | "arrow" | "columnar";
+}
+
+export interface ICommCancelRequestRequest {
+    rid: string;
 }
 
 export interface ICommUploadSpecToCloudRequest {
@@ -90,6 +97,7 @@ export interface ICommEnvelope<TAction extends string = string, TData = any> {
     data: TData;
     rid?: string;
     gid?: string | number;
+    timeout?: number;
 }
 
 export type ICommEmptyRequest = Record<string, never>;
@@ -100,12 +108,33 @@ export interface ICommLatestVisSpecResponse {
     visSpec: Record<string, any>[];
 }
 
+export interface ICommColumnarDatas {
+    columns: string[];
+    values: any[][];
+    dictionaries: (any[] | null)[];
+    rowCount: number;
+}
+
 export interface ICommDataRowsResponse {
-    datas: IRow[];
+    datas: IRow[] | ICommColumnarDatas;
+    approximate?: boolean;
+    progressiveId?: string;
 }
 
 export interface ICommBatchDataRowsResponse {
-    datas: IRow[][];
+    datas: IRow[][] | ICommColumnarDatas[];
+    approximate?: boolean[];
+    progressiveId?: string;
+}
+
+export interface ICommProgressiveDatasMessage {
+    progressiveId: string;
+    indexes: number[];
+    datas: IRow[][] | ICommColumnarDatas[];
+}
+
+export interface ICommCancelRequestResponse {
+    cancelled: boolean;
 }
 
 export interface ICommUploadSpecToCloudResponse {
@@ -128,6 +157,7 @@ export interface ICommUploadCloudDashboardResponse {
 
 export interface ICommRequestMap {
     ping: ICommEmptyRequest;
+    cancel_request: ICommCancelRequestRequest;
     request_data: ICommEmptyRequest;
     get_latest_vis_spec: ICommEmptyRequest;
     save_chart: ICommSaveChartRequest;
@@ -148,6 +178,7 @@ export interface ICommRequestMap {
 
 export interface ICommResponseMap {
     ping: ICommEmptyResponse;
+    cancel_request: ICommCancelRequestResponse;
     request_data: ICommEmptyResponse;
     get_latest_vis_spec: ICommLatestVisSpecResponse;
     save_chart: ICommEmptyResponse;
@@ -9,6 +9,7 @@ export type {
     ICommChartImageRequest,
     ICommChatChartRequest,
     ICommCloudCallbackResponse,
+    ICommColumnarDatas,
     ICommDataRowsResponse,
     ICommEmptyRequest,
     ICommEmptyResponse,
@@ -16,6 +17,7 @@ export type {
     ICommLatestVisSpecResponse,
     ICommOpenDesktopRequest,
     ICommPayloadQueryRequest,
+    ICommProgressiveDatasMessage,
     ICommRequestEnvelope,
     ICommRequestMap,
     ICommResponse,
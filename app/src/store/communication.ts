@@ -3,15 +3,23 @@ import { ICommunication } from '../utils/communication';
 
 class CommunicationStore {
     comm: ICommunication | null = null;
+    // bumped when exact datas of approximate (sampled) results arrive, charts are computed again to show them
+    progressiveDatasVersion = 0;
 
     setComm(comm: ICommunication) {
         this.comm = comm;
     }
 
+    refreshProgressiveDatas() {
+        this.progressiveDatasVersion += 1;
+    }
+
     constructor() {
         makeObservable(this, {
             comm: observable,
+            progressiveDatasVersion: observable,
             setComm: action,
+            refreshProgressiveDatas: action,
         });
     }
 }
@@ -23,6 +23,8 @@ interface ICommunication {
         data: ICommRequestMap[TAction],
         rid?: string | null
     ) => void;
+    // binary query results(arrow IPC streams) are sent as message buffers
+    supportsBuffers?: boolean;
 }
 
 const getSignalName = (rid: string) => {
@@ -42,6 +44,9 @@ const raiseRequestError = (message: string, code: number) => {
         <>{message}</>
     )
     switch (code) {
+        case 10002:
+            // cancelled by the user, or superseded by a newer request of the same chart
+            return;
         case 20001:
             showMsg = (
                 <>
@@ -244,12 +249,15 @@ const initHttpCommunication = async(gid: string, baseUrl: string) => {
         data: ICommRequestMap[TAction],
         timeout: number = 30_000
     ): Promise<ICommResponse<ICommResponseMap[TAction]>> => {
+        const rid = uuidv4();
         const timer = setTimeout(() => {
             raiseRequestError("communication timeout", 0);
+            // stop the kernel query, nobody waits for its result anymore
+            sendMsgAsync("cancel_request", { rid });
             throw(new Error("get result timeout"));
         }, timeout);
         try {
-            const resp = await sendMsgAsync(action, data);
+            const resp = await sendMsgAsync(action, data, rid, timeout);
             if (resp.code !== 0) {
                 raiseRequestError(resp.message, resp.code);
                 throw new Error(resp.message);
@@ -260,9 +268,19 @@ const initHttpCommunication = async(gid: string, baseUrl: string) => {
         }
     }
 
-    const sendMsgAsync = async<TAction extends ICommAction>(action: TAction, data: ICommRequestMap[TAction]) => {
-        const rid = uuidv4();
-        const message: ICommRequestEnvelope<TAction> = { action, data, rid, gid };
+    const sendMsgAsync = async<TAction extends ICommAction>(
+        action: TAction,
+        data: ICommRequestMap[TAction],
+        rid: string | null = null,
+        timeout?: number
+    ) => {
+        const message: ICommRequestEnvelope<TAction> = {
+            action,
+            data,
+            rid: rid ?? uuidv4(),
+            gid,
+            timeout: timeout === undefined ? undefined : timeout / 1000,
+        };
         return await (await fetch(
             url,
             {
@@ -288,27 +306,52 @@ const streamlitComponentCallback = (data: any) => {
     }
 }
 
+const BUFFER_PLACEHOLDER_KEY = "__pyg_buffer__";
+
+const resolveBufferPlaceholder = (value: any, buffers: DataView[]) => {
+    if (value !== null && typeof value === "object" && BUFFER_PLACEHOLDER_KEY in value) {
+        return buffers[value[BUFFER_PLACEHOLDER_KEY]];
+    }
+    return value;
+}
+
+// `datas` of a response or of a message pushed by kernel refers to buffers by placeholders
+const resolveDatasBuffers = (container: any, buffers: DataView[]) => {
+    const datas = container?.datas;
+    if (buffers.length === 0 || datas === undefined) {
+        return;
+    }
+    container.datas = Array.isArray(datas)
+        ? datas.map(item => resolveBufferPlaceholder(item, buffers))
+        : resolveBufferPlaceholder(datas, buffers);
+}
+
 const initAnywidgetCommunication = async(gid: string, model: import("@anywidget/types").AnyModel) => {
     const bufferMap = new Map<string, any>();
+    const endpoints = new Map<string, (data: any) => any>();
 
-    const onMessage = (msg: string) => {
+    const onMessage = (msg: string, buffers: DataView[]) => {
         const data = JSON.parse(msg) as ICommResponseEnvelope;
         const action = data.action;
         if (action === "finish_request") {
             if (!data.rid) {
                 return;
             }
+            resolveDatasBuffers(data.data?.data, buffers);
             bufferMap.set(data.rid, data.data);
             document.dispatchEvent(new CustomEvent(getSignalName(data.rid)));
             return
         }
+        // messages pushed by kernel, such as exact datas of progressive queries
+        resolveDatasBuffers(data.data, buffers);
+        endpoints.get(action as string)?.(data.data);
     }
 
-    model.on("msg:custom", msg => {
+    model.on("msg:custom", (msg: any, buffers: DataView[] = []) => {
         if (msg.type !== "pyg_response") {
             return;
         }
-        onMessage(msg.data);
+        onMessage(msg.data, buffers);
     });
 
     const sendMsg = async<TAction extends ICommAction>(
@@ -319,7 +362,7 @@ const initAnywidgetCommunication = async(gid: string, model: import("@anywidget/
         const rid = uuidv4();
         const promise = new Promise<ICommResponse<ICommResponseMap[TAction]>>((resolve, reject) => {
             setTimeout(() => {
-                sendMsgAsync(action, data, rid);
+                sendMsgAsync(action, data, rid, timeout);
             }, 0);
             const timer = setTimeout(() => {
                 raiseRequestError("communication timeout", 0);
@@ -342,19 +385,29 @@ const initAnywidgetCommunication = async(gid: string, model: import("@anywidget/
     const sendMsgAsync = <TAction extends ICommAction>(
         action: TAction,
         data: ICommRequestMap[TAction],
-        rid: string | null = null
+        rid: string | null = null,
+        timeout?: number
     ) => {
         const messageRid = rid ?? uuidv4();
-        const message: ICommRequestEnvelope<TAction> = { gid, rid: messageRid, action, data };
+        const message: ICommRequestEnvelope<TAction> = {
+            gid,
+            rid: messageRid,
+            action,
+            data,
+            timeout: timeout === undefined ? undefined : timeout / 1000,
+        };
         model.send({type: "pyg_request", msg: message});
     }
 
-    const registerEndpoint = (_: string, __: (data: any) => any) => {}
+    const registerEndpoint = (action: string, callback: (data: any) => any) => {
+        endpoints.set(action, callback);
+    }
 
     return {
         sendMsg,
         registerEndpoint,
         sendMsgAsync,
+        supportsBuffers: true,
     }
 }
 
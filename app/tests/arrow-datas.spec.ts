@@ -0,0 +1,59 @@
+import { expect, test } from "@playwright/test";
+import { tableFromArrays, tableToIPC } from "apache-arrow";
+
+test("decodes arrow results sent as anywidget buffers", async ({ page }) => {
+    const table = tableFromArrays({
+        city: ["London", "Tokyo"],
+        value: Float64Array.from([1.5, 2.5]),
+        count: BigInt64Array.from([3n, 4n]),
+    });
+    const ipcBytes = Array.from(tableToIPC(table, "stream"));
+
+    await page.goto("/");
+    // app modules are served by the vite dev server
+    await page.addScriptTag({
+        type: "module",
+        content: `
+            import { initAnywidgetCommunication } from "/pyg_dev_app/src/utils/communication.tsx";
+            import { decodeDatas } from "/pyg_dev_app/src/dataSource/index.tsx";
+            window.pygArrowModules = { initAnywidgetCommunication, decodeDatas };
+        `,
+    });
+    await page.waitForFunction(() => (window as any).pygArrowModules !== undefined);
+    const datas = await page.evaluate(async (ipcBytes) => {
+        const { initAnywidgetCommunication, decodeDatas } = (window as any).pygArrowModules;
+        const handlers: ((msg: any, buffers: DataView[]) => void)[] = [];
+        const sent: any[] = [];
+        const model = {
+            on: (_: string, handler: (msg: any, buffers: DataView[]) => void) => handlers.push(handler),
+            send: (message: any) => sent.push(message),
+        };
+
+        const comm = await initAnywidgetCommunication("arrow-gid", model as any);
+        const response = comm.sendMsg("batch_get_datas_by_payload", { queryList: [], resultFormat: "arrow" });
+        while (sent.length === 0) {
+            await new Promise((resolve) => setTimeout(resolve, 10));
+        }
+        const envelope = {
+            gid: "arrow-gid",
+            rid: sent[0].msg.rid,
+            action: "finish_request",
+            data: { code: 0, message: "", data: { datas: [{ __pyg_buffer__: 0 }] } },
+        };
+        const buffer = new Uint8Array(ipcBytes).buffer;
+        handlers.forEach((handler) => handler({ type: "pyg_response", data: JSON.stringify(envelope) }, [new DataView(buffer)]));
+
+        const result = await response;
+        return { supportsBuffers: comm.supportsBuffers, datas: result.data.datas.map(decodeDatas) };
+    }, ipcBytes);
+
+    expect(datas).toEqual({
+        supportsBuffers: true,
+        datas: [
+            [
+                { city: "London", value: 1.5, count: 3 },
+                { city: "Tokyo", value: 2.5, count: 4 },
+            ],
+        ],
+    });
+});
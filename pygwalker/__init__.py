@@ -3,6 +3,8 @@ from pygwalker.utils.log import init_logging as __init_logging
 __init_logging()
 
 # pylint: disable=wrong-import-position
+from typing import Any, TYPE_CHECKING
+import importlib
 import logging
 
 from pygwalker.utils.randoms import rand_str as __rand_str
@@ -13,12 +15,41 @@ from pygwalker.services.kaggle import show_tips_user_kaggle as __show_tips_user_
 __version__ = "0.6.0rc0"
 __hash__ = __rand_str()
 
-from pygwalker.api.adapter import walk, render, table
-from pygwalker.api.html import to_html
-from pygwalker.data_parsers.base import FieldSpec
-from pygwalker.api.component import component
-from pygwalker.api.walker import Walker
-from . import spec
+# public api is imported on first access, so `import pygwalker` doesn't pay for pandas, duckdb, sqlglot and ipywidgets
+_LAZY_ATTRS = {
+    "walk": "pygwalker.api.adapter",
+    "render": "pygwalker.api.adapter",
+    "table": "pygwalker.api.adapter",
+    "to_html": "pygwalker.api.html",
+    "FieldSpec": "pygwalker.data_parsers.base",
+    "component": "pygwalker.api.component",
+    "Walker": "pygwalker.api.walker",
+}
+_LAZY_SUBMODULES = {"spec"}
+
+if TYPE_CHECKING:
+    from pygwalker.api.adapter import walk, render, table
+    from pygwalker.api.html import to_html
+    from pygwalker.data_parsers.base import FieldSpec
+    from pygwalker.api.component import component
+    from pygwalker.api.walker import Walker
+    from . import spec
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRS:
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name]), name)
+    elif name in _LAZY_SUBMODULES:
+        value = importlib.import_module(f"{__name__}.{name}")
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS) | _LAZY_SUBMODULES)
+
 
 if GlobalVarManager.privacy == "offline":
     logging.getLogger(__name__).info(
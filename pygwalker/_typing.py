@@ -20,6 +20,7 @@ if TYPE_CHECKING:
         import polars as pl
 
         dataframe_types.append(pl.DataFrame)
+        dataframe_types.append(pl.LazyFrame)
     except ModuleNotFoundError:
         pass
     try:
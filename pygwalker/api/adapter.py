@@ -3,18 +3,18 @@ from typing import Union, List, Optional, TYPE_CHECKING
 from typing_extensions import Literal
 
 from pygwalker.data_parsers.base import FieldSpec
-from pygwalker.data_parsers.database_parser import Connector
 from pygwalker._typing import DataFrame, IAppearance, IComputation, IThemeKey
 from pygwalker.utils.runtime_env import get_current_env
 from pygwalker.api import jupyter
 from pygwalker.api import webserver
 
 if TYPE_CHECKING:
+    from pygwalker.data_parsers.database_parser import Connector
     from pygwalker.api.walker import Walker
 
 
 def walk(
-    dataset: Union[DataFrame, Connector, str, "Walker"],
+    dataset: Union[DataFrame, "Connector", str, "Walker"],
     gid: Union[int, str] = None,
     *,
     env: Literal["JupyterAnywidget", "Jupyter", "JupyterWidget"] = "JupyterAnywidget",
@@ -96,7 +96,7 @@ def walk(
 
 
 def render(
-    dataset: Union[DataFrame, Connector, str],
+    dataset: Union[DataFrame, "Connector", str],
     spec: str = "",
     *,
     theme_key: IThemeKey = "g2",
@@ -151,7 +151,7 @@ def render(
 
 
 def table(
-    dataset: Union[DataFrame, Connector, str],
+    dataset: Union[DataFrame, "Connector", str],
     *,
     theme_key: IThemeKey = "g2",
     appearance: IAppearance = "media",
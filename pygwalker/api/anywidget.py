@@ -5,7 +5,6 @@ from typing_extensions import Literal
 
 from .pygwalker import PygWalker
 from pygwalker.data_parsers.base import FieldSpec
-from pygwalker.data_parsers.database_parser import Connector
 from pygwalker._typing import DataFrame, IAppearance, IComputation, IThemeKey
 from pygwalker.services.format_invoke_walk_code import get_formated_spec_params_code_from_frame
 from pygwalker.communications.anywidget_comm import AnywidgetCommunication
@@ -20,6 +19,7 @@ from pygwalker.api._walker_reuse import (
 from pygwalker.services.anywidget_widget import create_anywidget_for_walker
 
 if TYPE_CHECKING:
+    from pygwalker.data_parsers.database_parser import Connector
     from pygwalker.api.walker import Walker
 
 
@@ -61,7 +61,7 @@ def _reject_walker_construction_params(
 
 
 def walk(
-    dataset: Union[DataFrame, Connector, str, "Walker"],
+    dataset: Union[DataFrame, "Connector", str, "Walker"],
     gid: Union[int, str] = None,
     *,
     field_specs: Optional[List[FieldSpec]] = None,
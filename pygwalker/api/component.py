@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Union, TYPE_CHECKING
 from typing_extensions import Literal
 from copy import deepcopy
 
@@ -9,11 +9,13 @@ import sqlglot.expressions as exp
 from .pygwalker import PygWalker
 from pygwalker._typing import DataFrame, IAppearance, IComputation, IThemeKey, ISpecIOMode
 from pygwalker.data_parsers.base import FieldSpec
-from pygwalker.data_parsers.database_parser import Connector
 from pygwalker.utils.computation import resolve_computation_mode
 from pygwalker.utils.randoms import rand_str
 from pygwalker.utils.spec import resolve_spec_input
 
+if TYPE_CHECKING:
+    from pygwalker.data_parsers.database_parser import Connector
+
 
 GRAPHIC_WALKER_AGG_FUNCS = {
     "sum",
@@ -424,7 +426,7 @@ class Component:
 
 
 def component(
-    dataset: Union[DataFrame, Connector, str],
+    dataset: Union[DataFrame, "Connector", str],
     *,
     field_specs: Optional[List[FieldSpec]] = None,
     spec: str = "",
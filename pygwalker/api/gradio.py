@@ -1,19 +1,21 @@
-from typing import Union, List, Optional
+from typing import Union, List, Optional, TYPE_CHECKING
 from typing_extensions import Literal
 
 from .pygwalker import PygWalker
 from pygwalker.communications.gradio_comm import BASE_URL_PATH, GradioCommunication
 from pygwalker.data_parsers.base import FieldSpec
-from pygwalker.data_parsers.database_parser import Connector
 from pygwalker._typing import DataFrame, IAppearance, IComputation, ISpecIOMode, IThemeKey
 from pygwalker.utils.check_walker_params import check_expired_params
 from pygwalker.utils.computation import resolve_computation_mode
 from pygwalker.utils.spec import resolve_spec_input
 
+if TYPE_CHECKING:
+    from pygwalker.data_parsers.database_parser import Connector
+
 
 # pylint: disable=protected-access
 def get_html_on_gradio(
-    dataset: Union[DataFrame, Connector],
+    dataset: Union[DataFrame, "Connector"],
     gid: Union[int, str] = None,
     *,
     field_specs: Optional[List[FieldSpec]] = None,
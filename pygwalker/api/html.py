@@ -1,4 +1,4 @@
-from typing import Union, Dict, Optional, Any, List
+from typing import Union, Dict, Optional, Any, List, TYPE_CHECKING
 import logging
 
 from typing_extensions import Literal
@@ -7,7 +7,6 @@ from .pygwalker import PygWalker
 from pygwalker.services.data_parsers import get_parser
 from pygwalker.services.preview_image import render_gw_chart_preview_html
 from pygwalker.data_parsers.base import FieldSpec
-from pygwalker.data_parsers.database_parser import Connector
 from pygwalker._typing import DataFrame, IAppearance, IComputation, IThemeKey
 from pygwalker.utils.randoms import generate_hash_code
 from pygwalker.utils.check_walker_params import check_expired_params
@@ -19,6 +18,9 @@ from pygwalker.api._walker_reuse import (
     reject_walker_construction_params,
 )
 
+if TYPE_CHECKING:
+    from pygwalker.data_parsers.database_parser import Connector
+
 logger = logging.getLogger(__name__)
 
 
@@ -264,7 +266,7 @@ def to_render_html(
 
 
 def to_chart_html(
-    dataset: Union[DataFrame, Connector, str],
+    dataset: Union[DataFrame, "Connector", str],
     spec: Dict[str, Any],
     *,
     spec_type: Literal["graphic-walker", "vega"] = "graphic-walker",
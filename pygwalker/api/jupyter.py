@@ -6,7 +6,6 @@ from typing_extensions import Literal
 
 from .pygwalker import PygWalker
 from pygwalker.data_parsers.base import FieldSpec
-from pygwalker.data_parsers.database_parser import Connector
 from pygwalker._typing import DataFrame, IAppearance, IComputation, IThemeKey
 from pygwalker.services.format_invoke_walk_code import get_formated_spec_params_code_from_frame
 from pygwalker.services.kaggle import auto_set_kanaries_api_key_on_kaggle, adjust_kaggle_default_font_size
@@ -22,6 +21,7 @@ from pygwalker.api._walker_reuse import (
 )
 
 if TYPE_CHECKING:
+    from pygwalker.data_parsers.database_parser import Connector
     from pygwalker.api.walker import Walker
 
 
@@ -117,7 +117,7 @@ def _reject_walker_construction_params(
 
 
 def walk(
-    dataset: Union[DataFrame, Connector, str, "Walker"],
+    dataset: Union[DataFrame, "Connector", str, "Walker"],
     gid: Union[int, str] = None,
     *,
     env: Literal["JupyterAnywidget", "Jupyter", "JupyterWidget"] = "JupyterAnywidget",
@@ -253,7 +253,7 @@ def walk(
 
 
 def render(
-    dataset: Union[DataFrame, Connector, str],
+    dataset: Union[DataFrame, "Connector", str],
     spec: str = "",
     *,
     theme_key: IThemeKey = "g2",
@@ -308,7 +308,7 @@ def render(
 
 
 def table(
-    dataset: Union[DataFrame, Connector, str],
+    dataset: Union[DataFrame, "Connector", str],
     *,
     theme_key: IThemeKey = "g2",
     appearance: IAppearance = "media",
@@ -1,16 +1,18 @@
-from typing import List, Optional, Union
+from typing import List, Optional, Union, TYPE_CHECKING
 from datetime import datetime
 
 from pygwalker.data_parsers.base import FieldSpec
 from pygwalker._typing import DataFrame
 from pygwalker.utils.display import display_html
-from pygwalker.data_parsers.database_parser import Connector
 from pygwalker.services.cloud_service import CloudService
 from pygwalker.services.data_parsers import get_parser
 
+if TYPE_CHECKING:
+    from pygwalker.data_parsers.database_parser import Connector
+
 
 def create_cloud_dataset(
-    dataset: Union[DataFrame, Connector],
+    dataset: Union[DataFrame, "Connector"],
     *,
     name: Optional[str] = None,
     is_public: bool = False,
@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, TYPE_CHECKING
 import json
 import keyword
 import warnings
@@ -8,7 +8,6 @@ import pandas as pd
 
 from pygwalker._typing import DataFrame, IAppearance, IThemeKey
 from pygwalker.data_parsers.base import BaseDataParser, FieldSpec
-from pygwalker.data_parsers.database_parser import Connector
 from pygwalker.utils.display import display_html
 from pygwalker.utils.randoms import rand_str
 from pygwalker.services.global_var import GlobalVarManager
@@ -32,6 +31,9 @@ from pygwalker.services.track import track_event
 from pygwalker.utils.randoms import generate_hash_code
 from pygwalker.communications.hacker_comm import BaseCommunication
 
+if TYPE_CHECKING:
+    from pygwalker.data_parsers.database_parser import Connector
+
 
 def _warn_legacy_jupyter_transport(entrypoint: str) -> None:
     warnings.warn(
@@ -49,7 +51,7 @@ class PygWalker:
         self,
         *,
         gid: Optional[Union[int, str]],
-        dataset: Union[DataFrame, Connector, str],
+        dataset: Union[DataFrame, "Connector", str],
         field_specs: List[FieldSpec],
         spec: str,
         source_invoke_code: str,
@@ -72,6 +74,12 @@ class PygWalker:
         else:
             self.gid = gid
         self.cloud_service = CloudService(self.kanaries_api_key)
+        # duckdb resource settings of this walker, override `GlobalVarManager.duckdb_settings`
+        self.duckdb_settings = kwargs.pop("duckdb_settings", None)
+        # dimension sets of rollups, eg: [["city"], ["city", "weather"]], only for kernel computation
+        self.pre_aggregations = kwargs.pop("pre_aggregations", None)
+        # answer charts of large kernel tables from a sample first, then push their exact results
+        self.progressive_query = kwargs.pop("progressive_query", None)
         self.data_bridge = DataBridge(
             dataset=dataset,
             field_specs=field_specs,
@@ -107,6 +115,11 @@ class PygWalker:
         # Temporarily adapt to pandas import module bug
         if self.kernel_computation:
             self.data_bridge.warm_kernel_table()
+            self.data_bridge.build_pre_aggregations()
+            self.data_bridge.build_progressive_sample()
+            if self.pre_aggregations or self.progressive_query:
+                # rollups and samples rewrite payloads, so payloads are compiled in kernel instead of browser
+                self.parse_dsl_type = "server"
         if GlobalVarManager.privacy == "offline":
             self.show_cloud_tool = False
 
@@ -117,7 +130,7 @@ class PygWalker:
     def _get_data_parser(
         self,
         *,
-        dataset: Union[DataFrame, Connector, str],
+        dataset: Union[DataFrame, "Connector", str],
         field_specs: List[FieldSpec],
         cloud_computation: bool,
         kanaries_api_key: str,
@@ -129,6 +142,9 @@ class PygWalker:
             cloud_computation=cloud_computation,
             kanaries_api_key=kanaries_api_key,
             cloud_service=cloud_service,
+            duckdb_settings=self.duckdb_settings,
+            pre_aggregations=self.pre_aggregations,
+            progressive_query=self.progressive_query,
         )
 
     def _get_parse_dsl_type(self, data_parser: BaseDataParser) -> Literal["server", "client"]:
@@ -230,6 +246,12 @@ class PygWalker:
     def _chart_name_index_map(self, value):
         self.spec_manager.chart_name_index_map = value
 
+    def close(self):
+        """
+        Release the kernel computation resources held by this walker.
+        """
+        self.data_parser.close()
+
     def to_html(self, iframe_width: Optional[str] = None, iframe_height: Optional[str] = None) -> str:
         props = self._get_props()
         return self._get_render_iframe(props, iframe_width=iframe_width, iframe_height=iframe_height)
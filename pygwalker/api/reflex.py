@@ -1,4 +1,4 @@
-from typing import Union, List, Optional
+from typing import Union, List, Optional, TYPE_CHECKING
 
 import reflex as rx
 from typing_extensions import Literal
@@ -9,18 +9,20 @@ from pygwalker.communications.reflex_comm import (
     ReflexCommunication,
 )
 from pygwalker.data_parsers.base import FieldSpec
-from pygwalker.data_parsers.database_parser import Connector
 from pygwalker._typing import DataFrame, IAppearance, IComputation, ISpecIOMode, IThemeKey
 from pygwalker.utils.check_walker_params import check_expired_params
 from pygwalker.utils.computation import resolve_computation_mode
 from pygwalker.utils.spec import resolve_spec_input
 
+if TYPE_CHECKING:
+    from pygwalker.data_parsers.database_parser import Connector
+
 
 # pylint: disable=protected-access
 
 
 def get_component(
-    dataset: Union[DataFrame, Connector],
+    dataset: Union[DataFrame, "Connector"],
     gid: Union[int, str] = None,
     *,
     field_specs: Optional[List[FieldSpec]] = None,
@@ -11,12 +11,11 @@ import arrow
 from .pygwalker import PygWalker
 from pygwalker.communications.streamlit_comm import hack_streamlit_server, BASE_URL_PATH, StreamlitCommunication
 from pygwalker.data_parsers.base import FieldSpec
-from pygwalker.data_parsers.database_parser import Connector
 from pygwalker._typing import DataFrame, IAppearance, IComputation, ISpecIOMode, IThemeKey
 from pygwalker.utils.randoms import rand_str
 from pygwalker.utils.check_walker_params import check_expired_params
 from pygwalker.utils.computation import resolve_computation_mode
-from pygwalker.utils.encode import DataFrameEncoder
+from pygwalker.utils.encode import json_dumps
 from pygwalker.utils.spec import resolve_spec_input
 from pygwalker.services.streamlit_components import pygwalker_component
 from pygwalker.services.data_parsers import get_dataset_hash
@@ -28,6 +27,7 @@ from pygwalker.api._walker_reuse import (
 )
 
 if TYPE_CHECKING:
+    from pygwalker.data_parsers.database_parser import Connector
     from pygwalker.api.walker import Walker
 
 
@@ -103,7 +103,7 @@ class StreamlitRenderer:
 
     def __init__(
         self,
-        dataset: Union[DataFrame, Connector, "Walker"],
+        dataset: Union[DataFrame, "Connector", "Walker"],
         gid: Union[int, str] = None,
         *,
         field_specs: Optional[List[FieldSpec]] = None,
@@ -341,7 +341,7 @@ class StreamlitRenderer:
         **kwargs: Dict[str, Any],
     ):
         data_source = [] if self.walker.kernel_computation else self.walker.origin_data_source
-        data_source = json.loads(json.dumps(data_source, cls=DataFrameEncoder))
+        data_source = json.loads(json_dumps(data_source))
         props = self.walker._get_props("streamlit", data_source)
         props["gwMode"] = mode
         props["communicationUrl"] = BASE_URL_PATH
@@ -354,7 +354,7 @@ class StreamlitRenderer:
 
 
 def get_streamlit_html(
-    dataset: Union[DataFrame, Connector, "Walker"],
+    dataset: Union[DataFrame, "Connector", "Walker"],
     gid: Union[int, str] = None,
     *,
     field_specs: Optional[List[FieldSpec]] = None,
@@ -1,4 +1,4 @@
-from typing import Any, List, Optional, Union
+from typing import Any, List, Optional, Union, TYPE_CHECKING
 import warnings
 
 from typing_extensions import Literal
@@ -6,13 +6,15 @@ from typing_extensions import Literal
 from .pygwalker import PygWalker
 from pygwalker.api import webserver
 from pygwalker.data_parsers.base import FieldSpec
-from pygwalker.data_parsers.database_parser import Connector
 from pygwalker._typing import DataFrame, IAppearance, IComputation, ISpecIOMode, IThemeKey
 from pygwalker.utils.check_walker_params import check_expired_params
 from pygwalker.utils.computation import resolve_computation_mode
 from pygwalker.utils.runtime_env import get_current_env
 from pygwalker.utils.spec import resolve_spec_input
 
+if TYPE_CHECKING:
+    from pygwalker.data_parsers.database_parser import Connector
+
 
 IWalkerShowEnv = Literal[
     "auto",
@@ -59,7 +61,7 @@ class Walker:
 
     def __init__(
         self,
-        dataset: Union[DataFrame, Connector, str],
+        dataset: Union[DataFrame, "Connector", str],
         gid: Optional[Union[int, str]] = None,
         *,
         field_specs: Optional[List[FieldSpec]] = None,
@@ -11,11 +11,10 @@ from typing_extensions import Literal
 
 from .pygwalker import PygWalker
 from pygwalker.data_parsers.base import FieldSpec
-from pygwalker.data_parsers.database_parser import Connector
 from pygwalker._typing import DataFrame, IAppearance, IComputation, IThemeKey
 from pygwalker.utils.check_walker_params import check_expired_params
 from pygwalker.utils.computation import resolve_computation_mode
-from pygwalker.utils.encode import DataFrameEncoder
+from pygwalker.utils.encode import json_dumps_bytes
 from pygwalker.utils.free_port import find_free_port
 from pygwalker.utils.spec import resolve_spec_input
 from pygwalker.communications.base import BaseCommunication
@@ -27,6 +26,7 @@ from pygwalker.api._walker_reuse import (
 )
 
 if TYPE_CHECKING:
+    from pygwalker.data_parsers.database_parser import Connector
     from pygwalker.api.walker import Walker
 
 _MAX_HEALTH_TIMEOUT_SECONDS = 3
@@ -96,7 +96,7 @@ class _PygWalkerHandler(http.server.SimpleHTTPRequestHandler):
         self.send_response(200)
         self.send_header("Content-type", "application/json")
         self.end_headers()
-        self.wfile.write(json.dumps(result, cls=DataFrameEncoder).encode("utf-8"))
+        self.wfile.write(json_dumps_bytes(result))
 
     def log_message(self, format, *args):
         pass
@@ -212,7 +212,7 @@ def _start_server(
 
 
 def walk(
-    dataset: Union[DataFrame, Connector, str, "Walker"],
+    dataset: Union[DataFrame, "Connector", str, "Walker"],
     gid: Optional[Union[int, str]] = None,
     *,
     field_specs: Optional[List[FieldSpec]] = None,
@@ -312,7 +312,7 @@ def walk(
 
 
 def render(
-    dataset: Union[DataFrame, Connector, str],
+    dataset: Union[DataFrame, "Connector", str],
     spec: str = "",
     *,
     theme_key: IThemeKey = "g2",
@@ -374,7 +374,7 @@ def render(
 
 
 def table(
-    dataset: Union[DataFrame, Connector, str],
+    dataset: Union[DataFrame, "Connector", str],
     *,
     theme_key: IThemeKey = "g2",
     appearance: IAppearance = "media",
@@ -1,16 +1,49 @@
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional, List, Tuple
+from concurrent.futures import Future
 import uuid
-import json
 
 import anywidget
 
 from .base import BaseCommunication
-from pygwalker.utils.encode import DataFrameEncoder
+from .protocol import CommMessageRequest, validate_request
+from pygwalker.services.request_coalescer import request_coalescer
+from pygwalker.services.request_dispatcher import request_dispatcher
+from pygwalker.utils.encode import json_dumps
+
+BUFFER_PLACEHOLDER_KEY = "__pyg_buffer__"
+BINARY_TYPES = (bytes, bytearray, memoryview)
+
+
+def _extract_datas_buffers(data: Any) -> Tuple[Any, List[Any]]:
+    """
+    Move binary query results(arrow IPC stream) out of the json envelope into widget buffers.
+    `datas` of a response, or of a message pushed by kernel, is looked up.
+    Each binary value is replaced by `{"__pyg_buffer__": index}`, index refers to the buffers list.
+    """
+    if not isinstance(data, dict):
+        return data, []
+    if isinstance(data.get("data"), dict):
+        response_data, buffers = _extract_datas_buffers(data["data"])
+        return {**data, "data": response_data}, buffers
+    datas = data.get("datas")
+
+    if isinstance(datas, BINARY_TYPES):
+        buffers = [datas]
+        placeholder = {BUFFER_PLACEHOLDER_KEY: 0}
+    elif isinstance(datas, list) and datas and all(isinstance(item, BINARY_TYPES) for item in datas):
+        buffers = list(datas)
+        placeholder = [{BUFFER_PLACEHOLDER_KEY: index} for index in range(len(datas))]
+    else:
+        return data, []
+
+    return {**data, "datas": placeholder}, buffers
 
 
 class AnywidgetCommunication(BaseCommunication):
     """communication class for anywidget"""
 
+    supports_push = True
+
     def register_widget(self, widget: anywidget.AnyWidget) -> None:
         """register widget"""
         self.widget = widget
@@ -20,8 +53,9 @@ class AnywidgetCommunication(BaseCommunication):
         """send message base on anywidget"""
         if rid is None:
             rid = uuid.uuid1().hex
+        data, buffers = _extract_datas_buffers(data)
         msg = {"gid": self.gid, "rid": rid, "action": action, "data": data}
-        self.widget.send({"type": "pyg_response", "data": json.dumps(msg, cls=DataFrameEncoder)})
+        self.widget.send({"type": "pyg_response", "data": json_dumps(msg)}, buffers or None)
 
     def _on_mesage(self, _: anywidget.AnyWidget, data: Dict[str, Any], buffers: List[Any]):
         if data.get("type", "") != "pyg_request":
@@ -32,5 +66,45 @@ class AnywidgetCommunication(BaseCommunication):
             return
 
         rid = msg.get("rid") if isinstance(msg, dict) else None
+        if isinstance(msg, dict) and msg.get("action") in self._blocking_endpoints:
+            self._receive_blocking_msg(msg, rid)
+            return
+        self._reply(msg, rid)
+
+    def _reply(self, msg: Any, rid: Optional[str]):
         resp = self._receive_msg_envelope(msg)
         self.send_msg_async("finish_request", resp, rid)
+
+    def _receive_blocking_msg(self, msg: Dict[str, Any], rid: Optional[str]):
+        """
+        Comm messages are handled one by one, queries run on the request worker pool
+        so that `cancel_request` of a running query is handled while it runs.
+        Identical requests in flight share one execution, see `RequestCoalescer`.
+        """
+        try:
+            request = validate_request(CommMessageRequest, msg)
+        except Exception:
+            # answers the protocol error
+            self._reply(msg, rid)
+            return
+
+        shared_future, is_owner = request_coalescer.acquire(self.gid, request.action, request.data, request.rid)
+        if not is_owner:
+            shared_future.add_done_callback(lambda future: self._reply_shared(request.action, future, rid))
+            return
+
+        def _run():
+            try:
+                response = self._receive_msg(request.action, request.data, request.rid, request.timeout)
+            except BaseException as e:
+                shared_future.set_exception(e)
+                raise
+            shared_future.set_result(response)
+            self.send_msg_async("finish_request", response, rid)
+
+        request_dispatcher.submit(self.gid, _run)
+
+    def _reply_shared(self, action: str, future: Future, rid: Optional[str]):
+        error = future.exception()
+        resp = future.result() if error is None else self._error_response(action, None, error)
+        self.send_msg_async("finish_request", resp, rid)
@@ -1,7 +1,12 @@
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Optional
+import asyncio
 
 from pygwalker.communications.protocol import CommMessageRequest, CommResponse, dump_comm_response, validate_request
 from pygwalker.errors import BaseError, CommProtocolError, ErrorCode
+from pygwalker.services.global_var import GlobalVarManager
+from pygwalker.services.query_control import query_controller
+from pygwalker.services.request_coalescer import request_coalescer
+from pygwalker.services.request_dispatcher import request_dispatcher
 from pygwalker.services.track import track_event
 
 
@@ -23,12 +28,18 @@ class BaseCommunication:
     {
         "rid": "xxx",
         "action": "xxx",
-        "data": {}
+        "data": {},
+        "timeout": 30
     }
+    queries of blocking endpoints can be cancelled by rid, or are interrupted beyond timeout seconds.
     """
 
+    # whether `send_msg_async` can push messages to frontend, http servers only answer requests
+    supports_push = False
+
     def __init__(self, gid: str) -> None:
         self._endpoint_map = {}
+        self._blocking_endpoints = set()
         self.gid = gid
 
     def send_msg_async(self, action: str, data: Dict[str, Any]):
@@ -50,21 +61,76 @@ class BaseCommunication:
         except Exception as e:
             return self._error_response("", None, e)
 
-        return self._receive_msg(request.action, request.data)
+        return self._receive_msg(request.action, request.data, request.rid, request.timeout)
+
+    async def _receive_msg_envelope_async(
+        self,
+        message: Any,
+        encode: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> Any:
+        """
+        Async version of `_receive_msg_envelope` for http servers,
+        blocking endpoints run on the request worker pool so the event loop is never blocked.
+        `encode` converts the response in the same worker, eg: serializing it to http body.
+        Identical requests in flight share one execution, see `RequestCoalescer`.
+        """
+        encode = encode or (lambda result: result)
+        try:
+            request = validate_request(CommMessageRequest, message)
+        except BaseError as e:
+            return encode(self._error_response("", None, e))
+        except Exception as e:
+            return encode(self._error_response("", None, e))
+
+        if request.action not in self._blocking_endpoints:
+            return encode(self._receive_msg(request.action, request.data))
+
+        shared_future, is_owner = request_coalescer.acquire(self.gid, request.action, request.data, request.rid)
+        if not is_owner:
+            response = await asyncio.wrap_future(shared_future)
+            return await asyncio.get_running_loop().run_in_executor(None, encode, response)
+
+        def _run() -> Any:
+            try:
+                response = self._receive_msg(request.action, request.data, request.rid, request.timeout)
+            except BaseException as e:
+                shared_future.set_exception(e)
+                raise
+            shared_future.set_result(response)
+            return encode(response)
+
+        future = request_dispatcher.submit(self.gid, _run)
+        return await asyncio.wrap_future(future)
 
-    def _receive_msg(self, action: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _receive_msg(
+        self,
+        action: str,
+        data: Dict[str, Any],
+        rid: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
         handler_func = self._endpoint_map.get(action, None)
         if handler_func is None:
             return dump_comm_response(
                 CommResponse(code=ErrorCode.INVALID_REQUEST, data=None, message=f"Unknown action: {action}")
             )
         try:
-            data = handler_func(data)
+            if action in self._blocking_endpoints:
+                timeout = GlobalVarManager.query_timeout if timeout is None else timeout
+                with query_controller.request(rid, timeout):
+                    data = handler_func(data)
+            else:
+                data = handler_func(data)
             return dump_comm_response(CommResponse(code=0, data=data, message="success"))
         except BaseError as e:
             return self._error_response(action, data, e)
         except Exception as e:
             return self._error_response(action, data, e)
 
-    def register(self, endpoint: str, func: Callable[[Dict[str, Any]], Any]):
+    def register(self, endpoint: str, func: Callable[[Dict[str, Any]], Any], blocking: bool = False):
+        """register endpoint, `blocking` endpoints (such as data queries) are run on worker pool by async servers"""
         self._endpoint_map[endpoint] = func
+        if blocking:
+            self._blocking_endpoints.add(endpoint)
+        else:
+            self._blocking_endpoints.discard(endpoint)
@@ -1,12 +1,12 @@
-import json
+from functools import partial
 import gc
 
 from starlette.routing import Route
 from starlette.responses import JSONResponse, Response
 from starlette.requests import Request
 
-from pygwalker.utils.encode import DataFrameEncoder
 from .base import BaseCommunication
+from .http_response import encode_http_response, to_starlette_response
 
 try:
     from fastapi import FastAPI
@@ -26,11 +26,12 @@ async def _pygwalker_router(req: Request) -> Response:
     json_data = await req.json()
 
     # pylint: disable=protected-access
-    result = comm_obj._receive_msg_envelope(json_data)
+    encoded = await comm_obj._receive_msg_envelope_async(
+        json_data, partial(encode_http_response, accept_encoding=req.headers.get("accept-encoding", ""))
+    )
     # pylint: enable=protected-access
 
-    result = json.dumps(result, cls=DataFrameEncoder)
-    return JSONResponse(json.loads(result))
+    return to_starlette_response(encoded)
 
 
 class GradioCommunication(BaseCommunication):
@@ -7,7 +7,7 @@ import time
 from ipywidgets import Text, Layout, Box
 
 from .base import BaseCommunication
-from pygwalker.utils.encode import DataFrameEncoder
+from pygwalker.utils.encode import json_dumps
 
 
 class HackerCommunication(BaseCommunication):
@@ -17,6 +17,8 @@ class HackerCommunication(BaseCommunication):
     some expired buffers and locks will not be cleaned up.
     """
 
+    supports_push = True
+
     def __init__(self, gid: str) -> None:
         super().__init__(gid)
         self._kernel_widget = self._get_kernel_widget()
@@ -35,7 +37,7 @@ class HackerCommunication(BaseCommunication):
             rid = uuid.uuid1().hex
         msg = {"gid": self.gid, "rid": rid, "action": action, "data": data}
         with self._send_msg_lock:
-            self._html_widget.value = json.dumps(msg, cls=DataFrameEncoder)
+            self._html_widget.value = json_dumps(msg)
             self._html_widget.placeholder = str(self.__increase)
             self.__increase += 1
             time.sleep(0.1)
@@ -0,0 +1,45 @@
+from typing import Any, Dict, NamedTuple
+import gzip
+
+from pygwalker.utils.encode import json_dumps_bytes
+
+JSON_MEDIA_TYPE = "application/json"
+# small responses are not worth the cpu time of compression
+COMPRESSION_MIN_BYTES = 16 * 1024
+COMPRESSION_LEVEL = 5
+
+
+class EncodedResponse(NamedTuple):
+    """A comm response already encoded as http body"""
+
+    body: bytes
+    headers: Dict[str, str]
+
+
+def _accept_gzip(accept_encoding: str) -> bool:
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        if coding.strip().lower() == "gzip":
+            return params.replace(" ", "") not in {"q=0", "q=0.0"}
+    return False
+
+
+def encode_http_response(result: Any, accept_encoding: str = "") -> EncodedResponse:
+    """
+    Encode comm response to json bytes once, and gzip it when the client accepts it.
+    It is shared by all http-based transports (streamlit, gradio and reflex).
+    """
+    body = json_dumps_bytes(result)
+    headers = {"Content-Type": JSON_MEDIA_TYPE}
+    if len(body) >= COMPRESSION_MIN_BYTES and _accept_gzip(accept_encoding):
+        body = gzip.compress(body, compresslevel=COMPRESSION_LEVEL)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    return EncodedResponse(body, headers)
+
+
+def to_starlette_response(encoded: EncodedResponse) -> Any:
+    """Wrap encoded response as starlette Response without re-serializing it"""
+    from starlette.responses import Response
+
+    return Response(content=encoded.body, headers=encoded.headers, media_type=JSON_MEDIA_TYPE)
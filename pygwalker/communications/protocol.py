@@ -1,6 +1,7 @@
 from typing import Any, Dict, List, Optional, Type, Union
 
 from pydantic import BaseModel, Field, ValidationError
+from typing_extensions import Literal
 
 from pygwalker.utils.pydantic_compat import PYDANTIC_V2, model_dump, model_validate
 
@@ -37,6 +38,11 @@ else:
             extra = "forbid"
 
 
+# "rows": a list of row dicts, "arrow": arrow IPC stream bytes per result,
+# "columnar": a ColumnarDatas object per result.
+DataResultFormat = Literal["rows", "arrow", "columnar"]
+
+
 class DataQueryPayload(CommBaseModel):
     workflow: List[Dict[str, Any]]
     tag: Optional[str] = None
@@ -49,6 +55,8 @@ class CommMessageRequest(CommBaseModel):
     data: Dict[str, Any] = Field(default_factory=dict)
     rid: Optional[str] = None
     gid: Optional[Union[int, str]] = None
+    # seconds, queries of the request are interrupted beyond it
+    timeout: Optional[float] = None
 
 
 class CommResponse(CommBaseModel):
@@ -63,18 +71,26 @@ class EmptyRequest(CommBaseModel):
 
 class SqlQueryRequest(CommBaseModel):
     sql: str
+    result_format: Optional[DataResultFormat] = Field(None, alias="resultFormat")
 
 
 class PayloadQueryRequest(CommBaseModel):
     payload: DataQueryPayload
+    result_format: Optional[DataResultFormat] = Field(None, alias="resultFormat")
 
 
 class BatchSqlQueryRequest(CommBaseModel):
     query_list: List[str] = Field(..., alias="queryList")
+    result_format: Optional[DataResultFormat] = Field(None, alias="resultFormat")
 
 
 class BatchPayloadQueryRequest(CommBaseModel):
     query_list: List[DataQueryPayload] = Field(..., alias="queryList")
+    result_format: Optional[DataResultFormat] = Field(None, alias="resultFormat")
+
+
+class CancelRequestRequest(CommBaseModel):
+    rid: str
 
 
 class UploadSpecToCloudRequest(CommBaseModel):
@@ -146,12 +162,41 @@ class LatestVisSpecResponse(CommBaseModel):
     vis_spec: List[Dict[str, Any]] = Field(..., alias="visSpec")
 
 
+class ColumnarDatas(CommBaseModel):
+    """
+    Column names once and values as per-column arrays.
+    Values of a column with dictionary are indexes of its dictionary.
+    """
+
+    columns: List[str]
+    values: List[List[Any]]
+    dictionaries: List[Optional[List[Any]]]
+    row_count: int = Field(..., alias="rowCount")
+
+
 class DataRowsResponse(CommBaseModel):
-    datas: List[Dict[str, Any]]
+    datas: Union[List[Dict[str, Any]], ColumnarDatas]
+    # estimated from a sample, the exact datas are pushed by a ProgressiveDatasMessage of progressive_id
+    approximate: Optional[bool] = None
+    progressive_id: Optional[str] = Field(None, alias="progressiveId")
 
 
 class BatchDataRowsResponse(CommBaseModel):
-    datas: List[List[Dict[str, Any]]]
+    datas: Union[List[List[Dict[str, Any]]], List[ColumnarDatas]]
+    approximate: Optional[List[bool]] = None
+    progressive_id: Optional[str] = Field(None, alias="progressiveId")
+
+
+class ProgressiveDatasMessage(CommBaseModel):
+    """exact datas pushed after an approximate response, indexes refer to datas of the response"""
+
+    progressive_id: str = Field(..., alias="progressiveId")
+    indexes: List[int]
+    datas: Union[List[List[Dict[str, Any]]], List[ColumnarDatas]]
+
+
+class CancelRequestResponse(CommBaseModel):
+    cancelled: bool
 
 
 class UploadSpecToCloudResponse(CommBaseModel):
@@ -174,6 +219,7 @@ class UploadCloudDashboardResponse(CommBaseModel):
 
 COMM_REQUEST_MODELS: Dict[str, Type[BaseModel]] = {
     "ping": EmptyRequest,
+    "cancel_request": CancelRequestRequest,
     "request_data": EmptyRequest,
     "get_latest_vis_spec": EmptyRequest,
     "save_chart": SaveChartRequest,
@@ -194,6 +240,7 @@ COMM_REQUEST_MODELS: Dict[str, Type[BaseModel]] = {
 
 COMM_RESPONSE_MODELS: Dict[str, Type[BaseModel]] = {
     "ping": EmptyResponse,
+    "cancel_request": CancelRequestResponse,
     "request_data": EmptyResponse,
     "get_latest_vis_spec": LatestVisSpecResponse,
     "save_chart": EmptyResponse,
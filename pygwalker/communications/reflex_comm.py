@@ -1,9 +1,11 @@
+from functools import partial
 import json
+
 from starlette.responses import JSONResponse, Response
 from starlette.requests import Request
 
-from pygwalker.utils.encode import DataFrameEncoder
 from .base import BaseCommunication
+from .http_response import encode_http_response, to_starlette_response
 
 try:
     from fastapi import FastAPI
@@ -26,11 +28,10 @@ async def _pygwalker_router(req: Request) -> Response:
     try:
         json_data = await req.json()
 
-        result = comm_obj._receive_msg_envelope(json_data)
-
-        # Fixed: Proper JSON encoding with DataFrameEncoder
-        encoded_result = json.loads(json.dumps(result, cls=DataFrameEncoder))
-        return JSONResponse(encoded_result)
+        encoded = await comm_obj._receive_msg_envelope_async(
+            json_data, partial(encode_http_response, accept_encoding=req.headers.get("accept-encoding", ""))
+        )
+        return to_starlette_response(encoded)
 
     except json.JSONDecodeError:
         return JSONResponse({"success": False, "message": "Invalid JSON in request body"})
@@ -66,11 +67,10 @@ def _create_pygwalker_app() -> FastAPI:
             # Process the request with validation
             json_data = await request.json()
 
-            result = comm_obj._receive_msg_envelope(json_data)
-
-            # Fixed: Proper JSON encoding with DataFrameEncoder
-            encoded_result = json.loads(json.dumps(result, cls=DataFrameEncoder))
-            return JSONResponse(encoded_result)
+            encoded = await comm_obj._receive_msg_envelope_async(
+                json_data, partial(encode_http_response, accept_encoding=request.headers.get("accept-encoding", ""))
+            )
+            return to_starlette_response(encoded)
 
         except json.JSONDecodeError:
             return JSONResponse({"success": False, "message": "Invalid JSON in request body"})
@@ -1,3 +1,4 @@
+from functools import partial
 import gc
 import json
 import re
@@ -22,9 +23,9 @@ except ImportError:  # pragma: no cover - depends on the installed Streamlit sta
     Mount = None
     Route = None
 
-from pygwalker.utils.encode import DataFrameEncoder
 from pygwalker.errors import StreamlitPygwalkerApiError
 from .base import BaseCommunication
+from .http_response import encode_http_response, to_starlette_response
 
 streamlit_comm_map = {}
 
@@ -56,7 +57,7 @@ class PygwalkerHandler(tornado.web.RequestHandler):
     def check_xsrf_cookie(self):
         return True
 
-    def post(self, gid: str):
+    async def post(self, gid: str):
         comm_obj = streamlit_comm_map.get(gid, None)
         if comm_obj is None:
             self.write({"success": False, "message": f"Unknown gid: {gid}"})
@@ -64,10 +65,14 @@ class PygwalkerHandler(tornado.web.RequestHandler):
         json_data = json.loads(self.request.body)
 
         # pylint: disable=protected-access
-        result = comm_obj._receive_msg_envelope(json_data)
+        encoded = await comm_obj._receive_msg_envelope_async(
+            json_data, partial(encode_http_response, accept_encoding=self.request.headers.get("Accept-Encoding", ""))
+        )
         # pylint: enable=protected-access
 
-        self.write(json.dumps(result, cls=DataFrameEncoder))
+        for key, value in encoded.headers.items():
+            self.set_header(key, value)
+        self.write(encoded.body)
         return
 
 
@@ -79,11 +84,12 @@ async def _pygwalker_router(req):
     json_data = await req.json()
 
     # pylint: disable=protected-access
-    result = comm_obj._receive_msg_envelope(json_data)
+    encoded = await comm_obj._receive_msg_envelope_async(
+        json_data, partial(encode_http_response, accept_encoding=req.headers.get("accept-encoding", ""))
+    )
     # pylint: enable=protected-access
 
-    result = json.dumps(result, cls=DataFrameEncoder)
-    return JSONResponse(json.loads(result))
+    return to_starlette_response(encoded)
 
 
 def _register_tornado_handler() -> bool:
@@ -1,25 +1,37 @@
-from typing import Generic, Dict, List, Any, Optional
+from typing import Generic, Dict, List, Any, Optional, Callable, Tuple, TypeVar, TYPE_CHECKING
 from typing_extensions import Literal
 from functools import cached_property, lru_cache
 from datetime import datetime, date
 from datetime import timedelta
 import abc
 import io
+import logging
 
 from pydantic import BaseModel
 
-try:
-    import duckdb
-except ModuleNotFoundError as exc:  # pragma: no cover - exercised in subprocess import tests.
-    from pygwalker.utils.dependencies import raise_missing_duckdb
-
-    raise_missing_duckdb(exc)
-import arrow
-import pytz
-
 from pygwalker._typing import DataFrame
+from pygwalker.utils.duckdb_connection import DuckdbConnection, check_duckdb_settings, fetch_arrow_table, fetch_rows
+from pygwalker.utils.encode import arrow_to_columnar_datas, rows_to_columnar_datas
 from pygwalker.utils.payload_to_sql import get_sql_from_payload
 from pygwalker.utils.estimate_tools import estimate_average_data_size
+from pygwalker.utils.randoms import generate_hash_code
+from pygwalker.services.query_cache import query_result_cache, get_rows_size, get_arrow_table_size
+from pygwalker.services.global_var import GlobalVarManager
+from pygwalker.services.query_control import query_controller
+from pygwalker.services.pre_aggregation import PreAggregationEngine, check_pre_aggregations
+from pygwalker.services.progressive_query import ProgressiveQueryEngine
+from pygwalker.services.batch_query import (
+    DEFAULT_LOCAL_BATCH_QUERY_WORKERS,
+    execute_batch,
+    resolve_batch_query_max_workers,
+)
+
+if TYPE_CHECKING:
+    import duckdb
+    import pandas as pd
+    import pyarrow as pa
+
+logger = logging.getLogger(__name__)
 
 
 # pylint: disable=broad-except
@@ -40,11 +52,22 @@ class FieldSpec(BaseModel):
 
 
 INFINITY_DATA_SIZE = 1 << 62
+# rows sampled evenly from the whole dataframe to infer field types
+INFER_SAMPLE_SIZE = 1000
+# rows of the sample checked to infer temporal values, parsing strings is much slower than reading dtypes
+TEMPORAL_INFER_SAMPLE_SIZE = 100
+TEMPORAL_INFER_MIN_RATIO = 0.9
+NUMBER_TO_DIMENSION_MAX_CARDINALITY = 16
+
+T = TypeVar("T")
 
 
 class BaseDataParser(abc.ABC):
     """Base class for data parser"""
 
+    # seconds before cached query results expire, None means results are valid until invalidated
+    query_cache_ttl: Optional[float] = None
+
     @abc.abstractmethod
     def __init__(
         self,
@@ -121,6 +144,90 @@ class BaseDataParser(abc.ABC):
         """Estimate data bytes size"""
         raise NotImplementedError
 
+    def get_datas_by_sql_arrow(self, sql: str) -> "pa.Table":
+        """get records as pyarrow.Table"""
+        import pyarrow as pa
+
+        return pa.Table.from_pylist(self.get_datas_by_sql(sql))
+
+    def get_datas_by_payload_arrow(self, payload: Dict[str, Any]) -> "pa.Table":
+        """get records as pyarrow.Table"""
+        import pyarrow as pa
+
+        return pa.Table.from_pylist(self.get_datas_by_payload(payload))
+
+    def batch_get_datas_by_sql_arrow(self, sql_list: List[str]) -> List["pa.Table"]:
+        """batch get records as pyarrow.Table"""
+        return execute_batch(self.get_datas_by_sql_arrow, sql_list, self.batch_query_max_workers)
+
+    def batch_get_datas_by_payload_arrow(self, payload_list: List[Dict[str, Any]]) -> List["pa.Table"]:
+        """batch get records as pyarrow.Table"""
+        return execute_batch(self.get_datas_by_payload_arrow, payload_list, self.batch_query_max_workers)
+
+    def get_datas_by_sql_columnar(self, sql: str) -> Dict[str, Any]:
+        """get records as columnar wire format"""
+        return rows_to_columnar_datas(self.get_datas_by_sql(sql))
+
+    def get_datas_by_payload_columnar(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """get records as columnar wire format"""
+        return rows_to_columnar_datas(self.get_datas_by_payload(payload))
+
+    def batch_get_datas_by_sql_columnar(self, sql_list: List[str]) -> List[Dict[str, Any]]:
+        """batch get records as columnar wire format"""
+        return execute_batch(self.get_datas_by_sql_columnar, sql_list, self.batch_query_max_workers)
+
+    def batch_get_datas_by_payload_columnar(self, payload_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """batch get records as columnar wire format"""
+        return execute_batch(self.get_datas_by_payload_columnar, payload_list, self.batch_query_max_workers)
+
+    @property
+    def batch_query_max_workers(self) -> int:
+        """max queries of a batch run concurrently"""
+        return resolve_batch_query_max_workers(1)
+
+    @cached_property
+    def dataset_fingerprint(self) -> str:
+        """fingerprint of dataset, query results are cached by it"""
+        return generate_hash_code()
+
+    def _query_cache_key(self, kind: str, query: str) -> Tuple[str, str, str]:
+        return (self.dataset_fingerprint, kind, query.strip())
+
+    def _cached_query(self, kind: str, query: str, compute: Callable[[], T], size_of: Callable[[T], int]) -> T:
+        """get query result from query cache, or compute and cache it"""
+        return query_result_cache.get_or_compute(
+            self._query_cache_key(kind, query), compute, size_of, self.query_cache_ttl
+        )
+
+    def invalidate_query_cache(self) -> None:
+        """drop cached query results, call it after the underlying data changes"""
+        query_result_cache.invalidate(self.dataset_fingerprint)
+        for listener in self.__dict__.get("_invalidate_listeners", []):
+            try:
+                listener()
+            except Exception as e:
+                logger.warning("Failed to notify invalidation of query cache: %s", e)
+
+    def add_invalidate_listener(self, listener: Callable[[], None]) -> None:
+        """call listener after query cache is invalidated, eg: to drop datas cached by frontend"""
+        self.__dict__.setdefault("_invalidate_listeners", []).append(listener)
+
+    def close(self) -> None:
+        """release resources held by parser, such as database connections"""
+        # results without ttl never expire, results with ttl are shared by parsers of the same remote dataset
+        if self.query_cache_ttl is None:
+            query_result_cache.invalidate(self.dataset_fingerprint)
+
+    def build_pre_aggregations(self, background: bool = True) -> None:
+        """build rollups configured by `pre_aggregations`, only kernel tables of dataframes support them"""
+
+    def build_progressive_sample(self, background: bool = True) -> None:
+        """sample data for `progressive_query`, only kernel tables of dataframes support it"""
+
+    def get_approximate_sql_by_payload(self, payload: Dict[str, Any]) -> Optional[str]:
+        """sql answering payload approximately from a sample of data, None if it must be answered exactly"""
+        return None
+
 
 class BaseDataFrameDataParser(Generic[DataFrame], BaseDataParser):
     """DataFrame property getter"""
@@ -141,71 +248,156 @@ class BaseDataFrameDataParser(Generic[DataFrame], BaseDataParser):
         self.infer_string_to_date = infer_string_to_date
         self.infer_number_to_dimension = infer_number_to_dimension
         self.other_params = other_params
+        self._duckdb_conn = DuckdbConnection({"pygwalker_mid_table": self._duckdb_df}, self.duckdb_settings)
+
+    @property
+    def duckdb_settings(self) -> Dict[str, Any]:
+        """duckdb resource settings, settings of walker override global settings"""
+        return {
+            **GlobalVarManager.duckdb_settings,
+            **check_duckdb_settings(self.other_params.get("duckdb_settings") or {}),
+        }
 
     @cached_property
-    def field_metas(self) -> List[Dict[str, str]]:
-        duckdb.register("pygwalker_mid_table", self._duckdb_df)
-        result = duckdb.query("SELECT * FROM pygwalker_mid_table LIMIT 1")
-        data = result.fetchone()
-        return get_data_meta_type(dict(zip(result.columns, data))) if data else []
+    def pre_aggregation(self) -> Optional[PreAggregationEngine]:
+        pre_aggregations = self.other_params.get("pre_aggregations")
+        if not pre_aggregations:
+            return None
+        return PreAggregationEngine("pygwalker_mid_table", check_pre_aggregations(pre_aggregations))
+
+    def build_pre_aggregations(self, background: bool = True) -> None:
+        if self.pre_aggregation is not None:
+            self.pre_aggregation.start(self._duckdb_conn, self.field_metas, background)
 
     @cached_property
-    def raw_fields(self) -> List[Dict[str, str]]:
-        return [self._infer_prop(col, self.field_specs) for _, col in enumerate(self._example_df.columns)]
+    def progressive_query(self) -> Optional[ProgressiveQueryEngine]:
+        if not self.other_params.get("progressive_query"):
+            return None
+        return ProgressiveQueryEngine("pygwalker_mid_table")
 
-    def _infer_prop(self, col: str, field_specs: List[FieldSpec] = None) -> Dict[str, str]:
-        """get IMutField
+    def build_progressive_sample(self, background: bool = True) -> None:
+        if self.progressive_query is not None:
+            self.progressive_query.start(self._duckdb_conn, background)
 
-        Returns:
-            (IMutField, Dict)
-        """
-        s = self._example_df[col]
-        orig_fname = col
+    def get_approximate_sql_by_payload(self, payload: Dict[str, Any]) -> Optional[str]:
+        if self.progressive_query is None:
+            return None
+        return self.progressive_query.get_sql(payload, self.field_metas)
 
-        field_spec_map = {field_spec.fname: field_spec for field_spec in field_specs}
+    @cached_property
+    def field_metas(self) -> List[Dict[str, str]]:
+        # duckdb binds the schema of registered dataframe without scanning it
+        result = self._duckdb_conn.execute("DESCRIBE SELECT * FROM pygwalker_mid_table")
+        return [
+            {"key": column_name, "type": get_duckdb_field_meta_type(column_type)}
+            for column_name, column_type, *_ in result.fetchall()
+        ]
 
-        field_spec = field_spec_map.get(orig_fname, FieldSpec(fname=orig_fname))
-        semantic_type = (
-            self._infer_semantic(s, orig_fname) if field_spec.semantic_type == "?" else field_spec.semantic_type
-        )
-        analytic_type = (
-            self._infer_analytic(s, orig_fname) if field_spec.analytic_type == "?" else field_spec.analytic_type
-        )
-        fname = orig_fname if field_spec.display_as is None else field_spec.display_as
+    @cached_property
+    def raw_fields(self) -> List[Dict[str, str]]:
+        field_spec_map = {field_spec.fname: field_spec for field_spec in self.field_specs}
+        field_types = self._infer_field_types(self._get_infer_sample())
+        return [
+            self._get_field(col, field_spec_map.get(col, FieldSpec(fname=col)), semantic_type, analytic_type)
+            for col, (semantic_type, analytic_type) in field_types.items()
+        ]
+
+    def _get_infer_sample(self) -> DataFrame:
+        """rows evenly spaced over the whole dataframe, so nulls or outliers at the head don't decide field types"""
+        if len(self._duckdb_df) <= INFER_SAMPLE_SIZE:
+            return self._duckdb_df
+        step = len(self._duckdb_df) // INFER_SAMPLE_SIZE
+        return self._duckdb_df[::step][:INFER_SAMPLE_SIZE]
+
+    def _infer_field_types(self, sample: DataFrame) -> Dict[str, Tuple[str, str]]:
+        """infer (semantic_type, analytic_type) of all columns in one pass over sample"""
+        raise NotImplementedError
+
+    def _get_field(self, col: str, field_spec: FieldSpec, semantic_type: str, analytic_type: str) -> Dict[str, str]:
+        """get IMutField"""
         return {
             "fid": col,
-            "name": fname,
-            "semanticType": semantic_type,
-            "analyticType": analytic_type,
+            "name": col if field_spec.display_as is None else field_spec.display_as,
+            "semanticType": semantic_type if field_spec.semantic_type == "?" else field_spec.semantic_type,
+            "analyticType": analytic_type if field_spec.analytic_type == "?" else field_spec.analytic_type,
         }
 
     def get_datas_by_sql(self, sql: str) -> List[Dict[str, Any]]:
         """get datas by duckdb"""
-        try:
-            duckdb.query("SET TimeZone = 'UTC'")
-        except Exception:
-            pass
+        return self._cached_query("rows", sql, lambda: self._query_datas(sql), get_rows_size)
 
-        duckdb.register("pygwalker_mid_table", self._duckdb_df)
+    def _execute_duckdb(self, sql: str, fetch: Callable[["duckdb.DuckDBPyConnection"], T]) -> T:
+        """execute and fetch sql on cursor of current thread, it is interrupted when its request is cancelled"""
+        cursor = self._duckdb_conn.cursor()
+        with query_controller.interruptible(cursor.interrupt):
+            return fetch(cursor.execute(sql))
 
-        result = duckdb.query(sql)
-        return [dict(zip(result.columns, row)) for row in result.fetchall()]
+    def _query_datas(self, sql: str) -> List[Dict[str, Any]]:
+        return self._execute_duckdb(sql, fetch_rows)
+
+    def get_datas_by_sql_arrow(self, sql: str) -> "pa.Table":
+        """get datas by duckdb without materializing python rows"""
+        return self._cached_query(
+            "arrow", sql, lambda: self._execute_duckdb(sql, fetch_arrow_table), get_arrow_table_size
+        )
+
+    def invalidate_query_cache(self) -> None:
+        # duckdb snapshots registered frames, reopen the connection to register the latest data.
+        # cache is dropped after, so results of the former connection are never cached again, listeners query latest data.
+        self._close_duckdb_conn()
+        if self.pre_aggregation is not None:
+            self.pre_aggregation.restart(self._duckdb_conn, self.field_metas)
+        if self.progressive_query is not None:
+            self.progressive_query.restart(self._duckdb_conn)
+        super().invalidate_query_cache()
+
+    def close(self) -> None:
+        self._close_duckdb_conn()
+        super().close()
+
+    def _close_duckdb_conn(self) -> None:
+        # background builds are interrupted first, duckdb must not tear down cursors running their queries
+        if self.pre_aggregation is not None:
+            self.pre_aggregation.close()
+        if self.progressive_query is not None:
+            self.progressive_query.close()
+        self._duckdb_conn.close()
 
     def _rename_dataframe(self, df: DataFrame) -> DataFrame:
         """rename dataframe"""
         raise NotImplementedError
 
+    def _payload_to_sql(self, payload: Dict[str, Any]) -> str:
+        """compile payload against a pre-aggregated rollup if one can answer it, or the whole table"""
+        if self.pre_aggregation is not None:
+            sql = self.pre_aggregation.get_sql(payload)
+            if sql is not None:
+                return sql
+        return get_sql_from_payload("pygwalker_mid_table", payload, {"pygwalker_mid_table": self.field_metas})
+
     def get_datas_by_payload(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
-        sql = get_sql_from_payload("pygwalker_mid_table", payload, {"pygwalker_mid_table": self.field_metas})
-        return self.get_datas_by_sql(sql)
+        return self.get_datas_by_sql(self._payload_to_sql(payload))
+
+    def get_datas_by_payload_arrow(self, payload: Dict[str, Any]) -> "pa.Table":
+        return self.get_datas_by_sql_arrow(self._payload_to_sql(payload))
+
+    def get_datas_by_sql_columnar(self, sql: str) -> Dict[str, Any]:
+        return arrow_to_columnar_datas(self.get_datas_by_sql_arrow(sql))
+
+    def get_datas_by_payload_columnar(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return arrow_to_columnar_datas(self.get_datas_by_payload_arrow(payload))
 
     def batch_get_datas_by_sql(self, sql_list: List[str]) -> List[List[Dict[str, Any]]]:
         """batch get records"""
-        return [self.get_datas_by_sql(sql) for sql in sql_list]
+        return execute_batch(self.get_datas_by_sql, sql_list, self.batch_query_max_workers)
 
     def batch_get_datas_by_payload(self, payload_list: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
         """batch get records"""
-        return [self.get_datas_by_payload(payload) for payload in payload_list]
+        return execute_batch(self.get_datas_by_payload, payload_list, self.batch_query_max_workers)
+
+    @property
+    def batch_query_max_workers(self) -> int:
+        return resolve_batch_query_max_workers(DEFAULT_LOCAL_BATCH_QUERY_WORKERS)
 
     @property
     def dataset_type(self) -> str:
@@ -225,6 +417,8 @@ class BaseDataFrameDataParser(Generic[DataFrame], BaseDataParser):
 def is_temporal_field(value: Any, infer_string_to_date: bool) -> bool:
     """check if field is temporal"""
     if infer_string_to_date:
+        import arrow
+
         try:
             arrow.get(str(value))
         except Exception:
@@ -234,6 +428,43 @@ def is_temporal_field(value: Any, infer_string_to_date: bool) -> bool:
     return isinstance(value, (datetime, date))
 
 
+def get_temporal_ratios(df: "pd.DataFrame", infer_string_to_date: bool) -> Dict[str, float]:
+    """
+    Ratio of temporal values among non-null values of each column, vectorized version of `is_temporal_field`.
+    Only `TEMPORAL_INFER_SAMPLE_SIZE` rows evenly spaced over df are checked.
+    """
+    import numpy as np
+    import pandas as pd
+
+    ratios = dict.fromkeys(df.columns, 0.0)
+    if df.empty:
+        return ratios
+
+    step = max(len(df) // TEMPORAL_INFER_SAMPLE_SIZE, 1)
+    col_values = df.iloc[::step].to_numpy(dtype=object).T
+    not_null = pd.notna(col_values)
+    col_indexes = np.nonzero(not_null)[0]
+    values = col_values[not_null]
+    if len(values) == 0:
+        return ratios
+
+    if infer_string_to_date and int(pd.__version__.split(".", 1)[0]) >= 2:
+        # accepts the same iso-8601 strings as `arrow.get`
+        parsed = pd.to_datetime(pd.Series(values).astype(str), errors="coerce", format="ISO8601", utc=True)
+        is_temporal = parsed.notna().to_numpy()
+    elif infer_string_to_date:
+        is_temporal = np.fromiter((is_temporal_field(value, True) for value in values), bool, len(values))
+    else:
+        is_temporal = np.fromiter((isinstance(value, (datetime, date)) for value in values), bool, len(values))
+
+    temporal_counts = np.bincount(col_indexes, weights=is_temporal, minlength=len(df.columns))
+    value_counts = np.bincount(col_indexes, minlength=len(df.columns))
+    for col, temporal_count, value_count in zip(df.columns, temporal_counts, value_counts):
+        if value_count:
+            ratios[col] = temporal_count / value_count
+    return ratios
+
+
 def is_geo_field(field_name: str) -> bool:
     """check if filed is"""
     field_name = field_name.lower().strip(" .")
@@ -242,6 +473,8 @@ def is_geo_field(field_name: str) -> bool:
 
 def format_temporal_string(value: str) -> str:
     """Convert temporal fields to a fixed format"""
+    import arrow
+
     return arrow.get(value).strftime("%Y-%m-%d %H:%M:%S")
 
 
@@ -260,8 +493,57 @@ def get_data_meta_type(data: Dict[str, Any]) -> List[Dict[str, str]]:
     return meta_types
 
 
+DUCKDB_NUMBER_TYPES = {
+    "TINYINT",
+    "SMALLINT",
+    "INTEGER",
+    "BIGINT",
+    "HUGEINT",
+    "UTINYINT",
+    "USMALLINT",
+    "UINTEGER",
+    "UBIGINT",
+    "UHUGEINT",
+    "FLOAT",
+    "DOUBLE",
+    "DECIMAL",
+    "BOOLEAN",
+}
+
+
+def get_duckdb_field_meta_type(column_type: str) -> str:
+    """field meta type of duckdb column type, such as `TIMESTAMP WITH TIME ZONE` or `DECIMAL(18,3)`"""
+    column_type = column_type.upper()
+    if column_type in ("TIMESTAMP WITH TIME ZONE", "TIMESTAMPTZ"):
+        return "datetime_tz"
+    # TIMESTAMP, TIMESTAMP_S, TIMESTAMP_MS, TIMESTAMP_NS
+    if column_type.startswith("TIMESTAMP"):
+        return "datetime"
+    if column_type.split("(", 1)[0] in DUCKDB_NUMBER_TYPES:
+        return "number"
+    return "string"
+
+
+def get_pandas_field_metas(df: "pd.DataFrame") -> List[Dict[str, str]]:
+    """field metas from dtypes of pandas dataframe, object columns are decided by their first non-null value"""
+    field_metas = []
+    for col, dtype in df.dtypes.items():
+        if dtype.kind == "M":
+            field_meta_type = "datetime_tz" if getattr(dtype, "tz", None) is not None else "datetime"
+        elif dtype.kind in "iufb":
+            field_meta_type = "number"
+        elif dtype.kind == "O" and df[col].first_valid_index() is not None:
+            field_meta_type = get_data_meta_type({col: df[col].loc[df[col].first_valid_index()]})[0]["type"]
+        else:
+            field_meta_type = "string"
+        field_metas.append({"key": col, "type": field_meta_type})
+    return field_metas
+
+
 @lru_cache()
 def get_timezone_base_offset(offset_seconds: int) -> Optional[str]:
+    import pytz
+
     utc_offset = timedelta(seconds=offset_seconds)
     now = datetime.now(pytz.utc)
     for tz in map(pytz.timezone, pytz.all_timezones_set):
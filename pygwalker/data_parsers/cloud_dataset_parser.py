@@ -2,21 +2,30 @@ from typing import Any, Dict, List, Optional
 from functools import cached_property
 from decimal import Decimal
 import logging
+import json
 import io
 
 import pandas as pd
 
-from .base import BaseDataParser, get_data_meta_type, INFINITY_DATA_SIZE
+from .base import BaseDataParser, get_pandas_field_metas, INFINITY_DATA_SIZE
 from .pandas_parser import PandasDataFrameDataParser
 from pygwalker.data_parsers.base import FieldSpec
 from pygwalker.services.cloud_service import CloudService
+from pygwalker.services.query_cache import REMOTE_DATASET_CACHE_TTL, get_rows_size, query_result_cache
+from pygwalker.utils.encode import rows_to_columnar_datas
 
 logger = logging.getLogger(__name__)
 
 
+def _get_payload_key(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, sort_keys=True, default=str)
+
+
 class CloudDatasetParser(BaseDataParser):
     """data parser for database"""
 
+    query_cache_ttl = REMOTE_DATASET_CACHE_TTL
+
     def __init__(
         self,
         dataset_id: str,
@@ -41,10 +50,14 @@ class CloudDatasetParser(BaseDataParser):
                 example_df[column] = example_df[column].astype(float)
         return example_df
 
+    @property
+    def dataset_fingerprint(self) -> str:
+        return f"cloud_dataset_{self.dataset_id}"
+
     @cached_property
     def field_metas(self) -> List[Dict[str, str]]:
-        data = self._get_all_datas(1)
-        return get_data_meta_type(data[0]) if data else []
+        # derived from rows already fetched for example dataframe, no extra query
+        return get_pandas_field_metas(self.example_pandas_df)
 
     @cached_property
     def raw_fields(self) -> List[Dict[str, str]]:
@@ -66,8 +79,12 @@ class CloudDatasetParser(BaseDataParser):
         return df.to_dict(orient="records")
 
     def get_datas_by_payload(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
-        result = self._cloud_service.query_from_dataset(self.dataset_id, payload)
-        return result
+        return self._cached_query(
+            "payload",
+            _get_payload_key(payload),
+            lambda: self._cloud_service.query_from_dataset(self.dataset_id, payload),
+            get_rows_size,
+        )
 
     def get_datas_by_sql(self, sql: str) -> List[Dict[str, Any]]:
         pass
@@ -96,8 +113,35 @@ class CloudDatasetParser(BaseDataParser):
 
     def batch_get_datas_by_payload(self, payload_list: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
         """batch get records"""
-        result = self._cloud_service.batch_query_from_dataset(self.dataset_id, payload_list)
-        return [item["rows"] for item in result]
+        results = [None] * len(payload_list)
+        missed_indexes = []
+        for index, payload in enumerate(payload_list):
+            hit, rows = query_result_cache.get(self._query_cache_key("payload", _get_payload_key(payload)))
+            if hit:
+                results[index] = rows
+            else:
+                missed_indexes.append(index)
+
+        if missed_indexes:
+            missed_payloads = [payload_list[index] for index in missed_indexes]
+            result = self._cloud_service.batch_query_from_dataset(self.dataset_id, missed_payloads)
+            for index, payload, item in zip(missed_indexes, missed_payloads, result):
+                results[index] = item["rows"]
+                query_result_cache.put(
+                    self._query_cache_key("payload", _get_payload_key(payload)),
+                    item["rows"],
+                    get_rows_size(item["rows"]),
+                    self.query_cache_ttl,
+                )
+        return results
+
+    def batch_get_datas_by_sql_columnar(self, sql_list: List[str]) -> List[Dict[str, Any]]:
+        """batch get records as columnar wire format"""
+        return [rows_to_columnar_datas(rows) for rows in self.batch_get_datas_by_sql(sql_list)]
+
+    def batch_get_datas_by_payload_columnar(self, payload_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """batch get records as columnar wire format"""
+        return [rows_to_columnar_datas(rows) for rows in self.batch_get_datas_by_payload(payload_list)]
 
     @property
     def dataset_type(self) -> str:
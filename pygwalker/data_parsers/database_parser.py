@@ -1,31 +1,55 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Set, TYPE_CHECKING, TypeVar
+from contextlib import contextmanager
 from functools import cached_property
 from decimal import Decimal
+import threading
+import hashlib
 import logging
 import json
 import io
 
 from sqlalchemy import create_engine, text
-from sqlalchemy.engine import Engine, Connection
+from sqlalchemy.engine import Engine, Connection, CursorResult
+from sqlalchemy.pool import AssertionPool, SingletonThreadPool, StaticPool
 import pandas as pd
 import sqlglot.expressions as exp
 import sqlglot
 
-from .base import BaseDataParser, get_data_meta_type, INFINITY_DATA_SIZE
+from .base import BaseDataParser, get_pandas_field_metas, INFINITY_DATA_SIZE
 from .pandas_parser import PandasDataFrameDataParser
 from pygwalker.data_parsers.base import FieldSpec
 from pygwalker.utils.custom_sqlglot import DuckdbDialect
 from pygwalker.utils.payload_to_sql import get_sql_from_payload
+from pygwalker.utils.encode import rows_to_columnar_datas
+from pygwalker.utils.randoms import generate_hash_code
+from pygwalker.services.query_cache import REMOTE_DATASET_CACHE_TTL, get_arrow_table_size, get_rows_size
+from pygwalker.services.query_control import query_controller
+from pygwalker.services.sql_memo import sql_transpile_memo
+from pygwalker.services.batch_query import (
+    DEFAULT_REMOTE_BATCH_QUERY_WORKERS,
+    execute_batch,
+    resolve_batch_query_max_workers,
+)
 from pygwalker.errors import ViewSqlSameColumnError
 
+if TYPE_CHECKING:
+    import pyarrow as pa
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+# rows fetched from the server-side cursor at a time, each chunk becomes one arrow record batch
+QUERY_STREAM_BATCH_SIZE = 10_000
+
 
 def _check_view_sql(sql: str) -> None:
     """check view sql, it will raise ViewSqlSameColumnError if view sql contain same column"""
-    select_columns = [select.alias_or_name for select in sqlglot.parse_one(sql).find(exp.Select)]
+    ast = sqlglot.parse_one(sql)
+    select_columns = [select.alias_or_name for select in ast.find(exp.Select)]
 
-    has_join = sqlglot.parse_one(sql).find(exp.Join) is not None
+    has_join = ast.find(exp.Join) is not None
     has_select_all = any(column == "*" for column in select_columns)
     select_expr_count = len(select_columns)
     hash_same_column = len(set(select_columns)) != select_expr_count
@@ -38,6 +62,111 @@ def _check_view_sql(sql: str) -> None:
         raise ViewSqlSameColumnError("view sql can not contain same column")
 
 
+def _cancel_dbapi_connection(connection: Connection) -> None:
+    """cancel the running statement of connection, if its dbapi driver supports it (eg: psycopg2, sqlite3, duckdb)"""
+    dbapi_connection = connection.connection.dbapi_connection
+    for method_name in ("cancel", "interrupt"):
+        cancel = getattr(dbapi_connection, method_name, None)
+        if callable(cancel):
+            cancel()
+            return
+
+
+def _first_not_none(values: Sequence[Any]) -> Any:
+    return next((value for value in values if value is not None), None)
+
+
+def _decimal_to_float(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return None if value.is_nan() else float(value)
+    return value
+
+
+def _decode_json(value: Any) -> Any:
+    if isinstance(value, (str, bytes, bytearray)):
+        return json.loads(value)
+    return value
+
+
+def _convert_column(values: Sequence[Any], is_json: bool) -> Sequence[Any]:
+    """decode json column and convert decimal column to float, the type of a column is checked once"""
+    if is_json:
+        return [_decode_json(value) for value in values]
+    if isinstance(_first_not_none(values), Decimal):
+        return [_decimal_to_float(value) for value in values]
+    return values
+
+
+def _to_arrow_array(values: Sequence[Any], is_json: bool) -> "pa.Array":
+    import pyarrow as pa
+
+    if is_json:
+        try:
+            return pa.array(_convert_column(values, True))
+        except (pa.ArrowException, TypeError, ValueError):
+            # json values of different shapes can't be one arrow type, keep the json text
+            return pa.array(values)
+    if isinstance(_first_not_none(values), Decimal):
+        # converting python floats is much faster than inferring arrow decimals from Decimal objects
+        return pa.array(_convert_column(values, False), type=pa.float64())
+    return pa.array(values)
+
+
+def _concat_record_batches(names: List[str], batches: List["pa.RecordBatch"]) -> "pa.Table":
+    """concat record batches, columns inferred as null or as another type in some batches are unified"""
+    import pyarrow as pa
+
+    if not batches:
+        return pa.table({name: pa.array([]) for name in names})
+    columns = []
+    for index in range(len(names)):
+        chunks = [batch.column(index) for batch in batches]
+        target_type = next((chunk.type for chunk in chunks if not pa.types.is_null(chunk.type)), pa.null())
+        try:
+            columns.append(pa.chunked_array([chunk.cast(target_type) for chunk in chunks], type=target_type))
+        except (pa.ArrowException, TypeError, ValueError):
+            columns.append(pa.chunked_array([pa.array([value for chunk in chunks for value in chunk.to_pylist()])]))
+    return pa.Table.from_arrays(columns, names=names)
+
+
+class _BatchConnections:
+    """Connections checked out by queries of a batch, each one is reused by the following queries."""
+
+    def __init__(self, engine: Engine):
+        self._engine = engine
+        self._lock = threading.Lock()
+        self._idle_connections: List[Connection] = []
+        self._connections: List[Connection] = []
+
+    @contextmanager
+    def checkout(self) -> Iterator[Connection]:
+        with self._lock:
+            connection = self._idle_connections.pop() if self._idle_connections else None
+        if connection is None:
+            connection = self._engine.connect()
+            with self._lock:
+                self._connections.append(connection)
+
+        try:
+            yield connection
+        except BaseException:
+            # the connection may be broken or in an aborted transaction, don't reuse it
+            connection.close()
+            raise
+
+        transaction = connection.get_transaction()
+        if transaction is not None:
+            transaction.rollback()
+        with self._lock:
+            self._idle_connections.append(connection)
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._connections, self._idle_connections = self._connections, [], []
+        for connection in connections:
+            connection.close()
+
+
 class Connector:
     """
     database connector, it will cache engine by url.
@@ -57,7 +186,19 @@ class Connector:
         if engine_params is None:
             engine_params = {}
 
-        self._init_instance(self._get_or_create_engine(url, engine_params), view_sql)
+        engine = self._get_or_create_engine(url, engine_params)
+        self._init_instance(engine, view_sql)
+        # engines created by url are shared by the whole process, so are the query results of the same view.
+        # `self.url` masks the password, credentials and connect args must not share cached results.
+        self.fingerprint = hashlib.md5(
+            "_".join(
+                [
+                    engine.url.render_as_string(hide_password=False),
+                    view_sql,
+                    json.dumps(engine_params, sort_keys=True, default=repr),
+                ]
+            ).encode()
+        ).hexdigest()
 
     @classmethod
     def from_sqlalchemy_engine(cls, engine: Engine, view_sql: str) -> "Connector":
@@ -88,6 +229,7 @@ class Connector:
         self.view_sql = view_sql
         self._json_type_code_set = self.JSON_TYPE_CODE_SET_MAP.get(self.dialect_name, set())
         self._existing_conn = None
+        self.fingerprint = generate_hash_code()
         self._run_pre_init_sql(engine)
 
     def _get_or_create_engine(self, url: str, engine_params: Dict[str, Any]) -> Engine:
@@ -104,34 +246,95 @@ class Connector:
             with engine.connect(True) as connection:
                 connection.execute(text(pre_init_sql))
 
-    def query_datas(self, sql: str) -> List[Dict[str, Any]]:
-        field_type_map = {}
-        should_close_connection = self._existing_conn is None
-        connection = self._existing_conn or self.engine.connect()
-
+    @contextmanager
+    def _connect(self, connections: Optional[_BatchConnections] = None) -> Iterator[Connection]:
+        if self._existing_conn is not None:
+            yield self._existing_conn
+        elif connections is not None:
+            with connections.checkout() as connection:
+                yield connection
+        else:
+            with self.engine.connect() as connection:
+                yield connection
+
+    @contextmanager
+    def _execute(self, sql: str, connections: Optional[_BatchConnections] = None) -> Iterator[CursorResult]:
+        """execute sql with a server-side cursor if the driver supports it, rows are fetched while iterating"""
+        with self._connect(connections) as connection:
+            with query_controller.interruptible(lambda: _cancel_dbapi_connection(connection)):
+                yield connection.execute(text(sql).execution_options(stream_results=True))
+
+    def _get_json_indexes(self, result: CursorResult) -> Set[int]:
+        if not self._json_type_code_set:
+            return set()
+        return {
+            index
+            for index, column_desc in enumerate(result.cursor.description)
+            if column_desc[1] in self._json_type_code_set
+        }
+
+    def query_datas(self, sql: str, connections: Optional[_BatchConnections] = None) -> List[Dict[str, Any]]:
+        rows = []
+        with self._execute(sql, connections) as result:
+            keys = list(result.keys())
+            json_indexes = self._get_json_indexes(result)
+            for partition in result.partitions(QUERY_STREAM_BATCH_SIZE):
+                columns = [
+                    _convert_column(values, index in json_indexes) for index, values in enumerate(zip(*partition))
+                ]
+                rows.extend(dict(zip(keys, row)) for row in zip(*columns))
+        return rows
+
+    def query_arrow(self, sql: str, connections: Optional[_BatchConnections] = None) -> "pa.Table":
+        """query datas as pyarrow.Table, rows are streamed into record batches instead of python dicts"""
+        import pyarrow as pa
+
+        batches = []
+        with self._execute(sql, connections) as result:
+            keys = list(result.keys())
+            json_indexes = self._get_json_indexes(result)
+            for partition in result.partitions(QUERY_STREAM_BATCH_SIZE):
+                arrays = [
+                    _to_arrow_array(values, index in json_indexes) for index, values in enumerate(zip(*partition))
+                ]
+                batches.append(pa.RecordBatch.from_arrays(arrays, names=keys))
+        return _concat_record_batches(keys, batches)
+
+    @contextmanager
+    def batch_connections(self) -> Iterator[Optional[_BatchConnections]]:
+        """reuse connections across queries of a batch, instead of checking out one from the engine per query"""
+        if self._existing_conn is not None:
+            yield None
+            return
+        connections = _BatchConnections(self.engine)
         try:
-            result = connection.execute(text(sql))
-            if self.dialect_name in self.JSON_TYPE_CODE_SET_MAP:
-                field_type_map = {column_desc[0]: column_desc[1] for column_desc in result.cursor.description}
-            return [
-                {
-                    key: json.loads(value) if field_type_map.get(key, -1) in self._json_type_code_set else value
-                    for key, value in item.items()
-                }
-                for item in result.mappings()
-            ]
+            yield connections
         finally:
-            if should_close_connection:
-                connection.close()
+            connections.close()
 
     @property
     def dialect_name(self) -> str:
         return self.engine.dialect.name
 
+    @property
+    def max_concurrent_queries(self) -> Optional[int]:
+        """max queries can run concurrently, limited by connection pool, None means no limit"""
+        if self._existing_conn is not None:
+            return 1
+        pool = self.engine.pool
+        # each thread of these pools shares one connection, or gets its own in-memory database
+        if isinstance(pool, (SingletonThreadPool, StaticPool, AssertionPool)):
+            return 1
+        pool_size = getattr(pool, "size", None)
+        if callable(pool_size):
+            return max(pool_size(), 1)
+        return None
+
 
 class DatabaseDataParser(BaseDataParser):
     """data parser for database"""
 
+    query_cache_ttl = REMOTE_DATASET_CACHE_TTL
     sqlglot_dialect_map = {
         "postgresql": "postgres",
         "mssql": "tsql",
@@ -160,29 +363,47 @@ class DatabaseDataParser(BaseDataParser):
                 example_df[column] = example_df[column].astype(float)
         return example_df
 
-    def _format_sql(self, sql: str) -> str:
-        sqlglot_dialect_name = self.sqlglot_dialect_map.get(self.conn.dialect_name, self.conn.dialect_name)
+    @property
+    def _sqlglot_dialect_name(self) -> str:
+        return self.sqlglot_dialect_map.get(self.conn.dialect_name, self.conn.dialect_name)
+
+    @cached_property
+    def _view_sql_ast(self) -> exp.Expression:
+        """view sql is parsed once, each query gets a copy of it"""
+        return sqlglot.parse(self.conn.view_sql, read=self._sqlglot_dialect_name)[0]
 
-        sub_query = exp.Subquery(
-            this=sqlglot.parse(self.conn.view_sql, read=sqlglot_dialect_name)[0],
-            alias=exp.TableAlias(this="temp_view_name"),
+    def _format_sql(self, sql: str) -> str:
+        sqlglot_dialect_name = self._sqlglot_dialect_name
+        return sql_transpile_memo.get_or_compute(
+            ("connector", sqlglot_dialect_name, self.conn.view_sql, sql),
+            lambda: self._transpile_sql(sql, sqlglot_dialect_name),
         )
+
+    def _transpile_sql(self, sql: str, sqlglot_dialect_name: str) -> str:
+        """replace placeholder table with view sql, and transpile duckdb sql to dialect of database"""
         ast = sqlglot.parse(sql, read=DuckdbDialect)[0]
         for from_exp in ast.find_all(exp.From):
             if str(from_exp.this).strip('"') == self.placeholder_table_name:
+                sub_query = exp.Subquery(
+                    this=self._view_sql_ast.copy(),
+                    alias=exp.TableAlias(this="temp_view_name"),
+                )
                 from_exp.this.replace(sub_query)
 
-        sql = ast.sql(sqlglot_dialect_name)
-        return sql
+        return ast.sql(sqlglot_dialect_name)
 
     @property
     def placeholder_table_name(self) -> str:
         return "___pygwalker_temp_view_name___"
 
+    @property
+    def dataset_fingerprint(self) -> str:
+        return f"connector_{self.conn.fingerprint}"
+
     @cached_property
     def field_metas(self) -> List[Dict[str, str]]:
-        data = self._get_datas_by_sql(f"SELECT * FROM {self.placeholder_table_name} LIMIT 1")
-        return get_data_meta_type(data[0]) if data else []
+        # derived from rows already fetched for example dataframe, no extra query
+        return get_pandas_field_metas(self.example_pandas_df)
 
     @cached_property
     def raw_fields(self) -> List[Dict[str, str]]:
@@ -203,22 +424,33 @@ class DatabaseDataParser(BaseDataParser):
         df = df.replace({float("nan"): None})
         return df.to_dict(orient="records")
 
-    def get_datas_by_payload(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
-        sql = get_sql_from_payload(
+    def _payload_to_sql(self, payload: Dict[str, Any]) -> str:
+        return get_sql_from_payload(
             self.placeholder_table_name, payload, {self.placeholder_table_name: self.field_metas}
         )
-        sql = self._format_sql(sql)
-        result = self.conn.query_datas(sql)
-        return result
+
+    def get_datas_by_payload(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return self._get_datas_by_sql(self._payload_to_sql(payload))
 
     def get_datas_by_sql(self, sql: str) -> List[Dict[str, Any]]:
         return self._get_datas_by_sql(sql)
 
-    def _get_datas_by_sql(self, sql: str) -> List[Dict[str, Any]]:
+    def _get_datas_by_sql(self, sql: str, connections: Optional[_BatchConnections] = None) -> List[Dict[str, Any]]:
         """a private method for get_datas_by_sql"""
-        sql = self._format_sql(sql)
-        result = self.conn.query_datas(sql)
-        return result
+        return self._cached_query(
+            "rows", sql, lambda: self.conn.query_datas(self._format_sql(sql), connections), get_rows_size
+        )
+
+    def get_datas_by_sql_arrow(self, sql: str) -> "pa.Table":
+        return self._get_datas_by_sql_arrow(sql)
+
+    def get_datas_by_payload_arrow(self, payload: Dict[str, Any]) -> "pa.Table":
+        return self._get_datas_by_sql_arrow(self._payload_to_sql(payload))
+
+    def _get_datas_by_sql_arrow(self, sql: str, connections: Optional[_BatchConnections] = None) -> "pa.Table":
+        return self._cached_query(
+            "arrow", sql, lambda: self.conn.query_arrow(self._format_sql(sql), connections), get_arrow_table_size
+        )
 
     def to_csv(self) -> io.BytesIO:
         content = io.BytesIO()
@@ -230,13 +462,44 @@ class DatabaseDataParser(BaseDataParser):
         self.example_pandas_df.toPandas().to_parquet(content, index=False, compression="snappy")
         return content
 
+    def _execute_batch(self, query: Callable[[T, Optional[_BatchConnections]], R], items: List[T]) -> List[R]:
+        """run queries of a batch on connections shared by the batch"""
+        with self.conn.batch_connections() as connections:
+            return execute_batch(lambda item: query(item, connections), items, self.batch_query_max_workers)
+
     def batch_get_datas_by_sql(self, sql_list: List[str]) -> List[List[Dict[str, Any]]]:
         """batch get records"""
-        return [self.get_datas_by_sql(sql) for sql in sql_list]
+        return self._execute_batch(self._get_datas_by_sql, sql_list)
 
     def batch_get_datas_by_payload(self, payload_list: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
         """batch get records"""
-        return [self.get_datas_by_payload(payload) for payload in payload_list]
+        return self._execute_batch(
+            lambda payload, connections: self._get_datas_by_sql(self._payload_to_sql(payload), connections),
+            payload_list,
+        )
+
+    def batch_get_datas_by_sql_arrow(self, sql_list: List[str]) -> List["pa.Table"]:
+        """batch get records as pyarrow.Table"""
+        return self._execute_batch(self._get_datas_by_sql_arrow, sql_list)
+
+    def batch_get_datas_by_payload_arrow(self, payload_list: List[Dict[str, Any]]) -> List["pa.Table"]:
+        """batch get records as pyarrow.Table"""
+        return self._execute_batch(
+            lambda payload, connections: self._get_datas_by_sql_arrow(self._payload_to_sql(payload), connections),
+            payload_list,
+        )
+
+    def batch_get_datas_by_sql_columnar(self, sql_list: List[str]) -> List[Dict[str, Any]]:
+        """batch get records as columnar wire format"""
+        return [rows_to_columnar_datas(rows) for rows in self.batch_get_datas_by_sql(sql_list)]
+
+    def batch_get_datas_by_payload_columnar(self, payload_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """batch get records as columnar wire format"""
+        return [rows_to_columnar_datas(rows) for rows in self.batch_get_datas_by_payload(payload_list)]
+
+    @property
+    def batch_query_max_workers(self) -> int:
+        return resolve_batch_query_max_workers(DEFAULT_REMOTE_BATCH_QUERY_WORKERS, self.conn.max_concurrent_queries)
 
     @property
     def dataset_type(self) -> str:
@@ -0,0 +1,179 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+import glob
+import io
+import os
+import tempfile
+
+import pyarrow as pa
+
+from .base import BaseDataFrameDataParser, FieldSpec, INFER_SAMPLE_SIZE, INFINITY_DATA_SIZE
+from .pyarrow_parser import arrow_table_to_records, infer_arrow_field_types
+from pygwalker.services.fname_encodings import rename_columns
+from pygwalker.utils.duckdb_connection import DuckdbConnection, fetch_arrow_table
+
+FILE_FORMAT_READERS = {
+    "parquet": "read_parquet",
+    "csv": "read_csv_auto",
+    "json": "read_json_auto",
+}
+
+FILE_EXTENSION_FORMATS = {
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".csv": "csv",
+    ".tsv": "csv",
+    ".json": "json",
+    ".jsonl": "json",
+    ".ndjson": "json",
+}
+
+FilePath = Union[str, "os.PathLike[str]"]
+
+
+def _quote_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _quote_identifier(value: str) -> str:
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _expand_path(path: FilePath) -> str:
+    return os.path.expanduser(os.fspath(path))
+
+
+def is_file_dataset(dataset: Any) -> bool:
+    """path-like objects, existing paths and globs matching files are file datasets, other strings are cloud dataset ids"""
+    if isinstance(dataset, os.PathLike):
+        return True
+    if not isinstance(dataset, str):
+        return False
+    path = _expand_path(dataset)
+    if os.path.exists(path):
+        return True
+    return glob.has_magic(path) and next(glob.iglob(path, recursive=True), None) is not None
+
+
+def _get_directory_extension(path: str) -> str:
+    for _, dirs, files in os.walk(path):
+        dirs[:] = sorted(name for name in dirs if not name.startswith((".", "_")))
+        for name in sorted(files):
+            extension = os.path.splitext(name)[1].lower()
+            if extension in FILE_EXTENSION_FORMATS and not name.startswith((".", "_")):
+                return extension
+    raise ValueError(f"No parquet, csv or json file found in directory: {path}")
+
+
+def get_file_source(path: FilePath) -> Tuple[str, str]:
+    """
+    Get (file_format, source_sql) of a file, glob or directory.
+    Directories are scanned recursively as hive-partitioned datasets.
+    """
+    path = _expand_path(path)
+    if os.path.isdir(path):
+        extension = _get_directory_extension(path)
+        pattern = os.path.join(path, "**", f"*{extension}")
+        options = ", hive_partitioning = true"
+    else:
+        extension = os.path.splitext(path)[1].lower()
+        pattern = path
+        options = ""
+
+    if extension not in FILE_EXTENSION_FORMATS:
+        raise ValueError(
+            f"Unsupported file format: {path}. Supported file extensions: {', '.join(FILE_EXTENSION_FORMATS)}."
+        )
+    file_format = FILE_EXTENSION_FORMATS[extension]
+    if extension == ".tsv":
+        options += ", delim = '\\t'"
+    return file_format, f"SELECT * FROM {FILE_FORMAT_READERS[file_format]}({_quote_literal(pattern)}{options})"
+
+
+def get_file_paths(path: FilePath) -> List[str]:
+    """files matched by file dataset path"""
+    path = _expand_path(path)
+    if os.path.isdir(path):
+        extension = _get_directory_extension(path)
+        return sorted(glob.glob(os.path.join(path, "**", f"*{extension}"), recursive=True))
+    if os.path.exists(path):
+        return [path]
+    return sorted(glob.glob(path, recursive=True))
+
+
+class FileDatasetParser(BaseDataFrameDataParser[str]):
+    """
+    Parser for parquet, csv and json files, globs and hive-partitioned directories.
+    duckdb scans the files out-of-core through a view, the table is never loaded into python.
+    """
+
+    def __init__(
+        self,
+        path: FilePath,
+        field_specs: List[FieldSpec],
+        infer_string_to_date: bool,
+        infer_number_to_dimension: bool,
+        other_params: Dict[str, Any],
+    ):
+        self.origin_df = path
+        self.df = _expand_path(path)
+        self.file_format, source_sql = get_file_source(path)
+        self.field_specs = field_specs
+        self.infer_string_to_date = infer_string_to_date
+        self.infer_number_to_dimension = infer_number_to_dimension
+        self.other_params = other_params
+        self._duckdb_conn = self._get_duckdb_conn(source_sql)
+
+    def _get_duckdb_conn(self, source_sql: str) -> DuckdbConnection:
+        conn = DuckdbConnection({}, self.duckdb_settings, views={"pygwalker_mid_table": source_sql})
+        # file schema comes from parquet metadata or csv/json sniffing, files are not scanned
+        columns = [row[0] for row in conn.execute("DESCRIBE SELECT * FROM pygwalker_mid_table").fetchall()]
+        new_columns = rename_columns(columns)
+        if new_columns == columns:
+            return conn
+
+        conn.close()
+        projection = ", ".join(
+            f"{_quote_identifier(column)} AS {_quote_identifier(new_column)}"
+            for column, new_column in zip(columns, new_columns)
+        )
+        return DuckdbConnection(
+            {}, self.duckdb_settings, views={"pygwalker_mid_table": f"SELECT {projection} FROM ({source_sql})"}
+        )
+
+    def _fetch_arrow(self, sql: str) -> pa.Table:
+        return fetch_arrow_table(self._duckdb_conn.execute(sql))
+
+    def to_records(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        limit_sql = "" if limit is None else f" LIMIT {int(limit)}"
+        return arrow_table_to_records(self._fetch_arrow(f"SELECT * FROM pygwalker_mid_table{limit_sql}"))
+
+    def _copy_to(self, options: str) -> io.BytesIO:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, "pygwalker_data")
+            self._duckdb_conn.execute(
+                f"COPY (SELECT * FROM pygwalker_mid_table) TO {_quote_literal(file_path)} ({options})"
+            )
+            with open(file_path, "rb") as f:
+                return io.BytesIO(f.read())
+
+    def to_csv(self) -> io.BytesIO:
+        return self._copy_to("FORMAT CSV, HEADER")
+
+    def to_parquet(self) -> io.BytesIO:
+        return self._copy_to("FORMAT PARQUET, COMPRESSION SNAPPY")
+
+    def _get_infer_sample(self) -> pa.Table:
+        # head rows only need the first row groups, a uniform sample would scan all files
+        return self._fetch_arrow(f"SELECT * FROM pygwalker_mid_table LIMIT {INFER_SAMPLE_SIZE}")
+
+    def _infer_field_types(self, sample: pa.Table) -> Dict[str, Tuple[str, str]]:
+        return infer_arrow_field_types(sample, self.infer_string_to_date, self.infer_number_to_dimension)
+
+    @property
+    def dataset_type(self) -> str:
+        return f"file_{self.file_format}"
+
+    @property
+    def data_size(self) -> int:
+        # files may not fit in memory, always compute in kernel
+        return INFINITY_DATA_SIZE
@@ -1,10 +1,13 @@
 import io
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from modin import pandas as mpd
+import pandas as pd
 
-from .base import BaseDataFrameDataParser, FieldSpec, is_temporal_field, is_geo_field
+from .base import BaseDataFrameDataParser, FieldSpec, is_geo_field
+from .pandas_parser import infer_pandas_field_types
 from pygwalker.services.fname_encodings import rename_columns
+from pygwalker.utils.duckdb_connection import DuckdbConnection
 
 
 class ModinPandasDataFrameDataParser(BaseDataFrameDataParser[mpd.DataFrame]):
@@ -20,6 +23,7 @@ class ModinPandasDataFrameDataParser(BaseDataFrameDataParser[mpd.DataFrame]):
     ):
         super().__init__(df, field_specs, infer_string_to_date, infer_number_to_dimension, other_params)
         self._duckdb_df = self.df._to_pandas()
+        self._duckdb_conn = DuckdbConnection({"pygwalker_mid_table": self._duckdb_df}, self.duckdb_settings)
         self._example_df = self._duckdb_df[:1000]
 
     def to_records(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
@@ -42,37 +46,11 @@ class ModinPandasDataFrameDataParser(BaseDataFrameDataParser[mpd.DataFrame]):
         df.columns = rename_columns(list(df.columns))
         return df
 
-    def _infer_semantic(self, s: mpd.Series, field_name: str):
-        if len(s) == 0 and not is_geo_field(field_name):
-            return "nominal"
-
-        kind = s.dtype.kind
-
-        if kind in "fcmiu" or is_geo_field(field_name):
-            return "quantitative"
-        if kind in "M":
-            return "temporal"
-        if kind in "bOSUV" and len(s) > 0 and is_temporal_field(s.iloc[0], self.infer_string_to_date):
-            return "temporal"
-
-        return "nominal"
-
-    def _infer_analytic(self, s: mpd.Series, field_name: str):
-        if len(s) == 0:
-            return "dimension"
-
-        kind = s.dtype.kind
-
-        if is_geo_field(field_name):
-            return "dimension"
-
-        if self.infer_number_to_dimension and kind in "iu" and len(s.unique()) <= 16:
-            return "dimension"
-
-        if kind in "fcmiu":
-            return "measure"
-
-        return "dimension"
+    def _infer_field_types(self, sample: pd.DataFrame) -> Dict[str, Tuple[str, str]]:
+        # sample is taken from the pandas copy used by duckdb
+        if len(sample) == 0:
+            return {col: ("quantitative" if is_geo_field(col) else "nominal", "dimension") for col in sample.columns}
+        return infer_pandas_field_types(sample, self.infer_string_to_date, self.infer_number_to_dimension)
 
     @property
     def dataset_type(self) -> str:
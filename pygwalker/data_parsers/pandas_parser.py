@@ -1,12 +1,81 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import io
 
+import numpy as np
 import pandas as pd
 
-from .base import BaseDataFrameDataParser, is_temporal_field, is_geo_field
+from .base import (
+    BaseDataFrameDataParser,
+    NUMBER_TO_DIMENSION_MAX_CARDINALITY,
+    TEMPORAL_INFER_MIN_RATIO,
+    get_temporal_ratios,
+    is_geo_field,
+)
 from pygwalker.services.fname_encodings import rename_columns
 
 
+def _get_cardinalities(df: pd.DataFrame) -> Dict[str, int]:
+    """count distinct values (null included) of each column"""
+    numpy_cols = [col for col, dtype in df.dtypes.items() if isinstance(dtype, np.dtype)]
+    cardinalities = {}
+    if numpy_cols and len(df) > 0:
+        # sort all numpy columns at once instead of hashing column by column
+        values = np.sort(df[numpy_cols].to_numpy(), axis=0)
+        counts = (np.diff(values, axis=0) != 0).sum(axis=0) + 1
+        cardinalities.update(zip(numpy_cols, counts.tolist()))
+    other_cols = [col for col in df.columns if col not in cardinalities]
+    # null counts as one value, as `len(series.unique())` did before types of all columns were inferred at once
+    cardinalities.update(df[other_cols].nunique(dropna=False).to_dict())
+    return cardinalities
+
+
+def infer_pandas_field_types(
+    df: pd.DataFrame,
+    infer_string_to_date: bool,
+    infer_number_to_dimension: bool,
+) -> Dict[str, Tuple[str, str]]:
+    """infer (semantic_type, analytic_type) of all columns of pandas dataframe"""
+    dtypes = dict(df.dtypes.items())
+    kinds = {col: dtype.kind for col, dtype in dtypes.items()}
+    geo_fields = {col for col in kinds if is_geo_field(col)}
+
+    # columns of string dtype never hold date objects, only need checking when parsing strings to date
+    temporal_candidate_cols = [
+        col
+        for col, kind in kinds.items()
+        if kind in "OSUV"
+        and col not in geo_fields
+        and (infer_string_to_date or not isinstance(dtypes[col], pd.StringDtype))
+    ]
+    temporal_ratios = get_temporal_ratios(df[temporal_candidate_cols], infer_string_to_date)
+
+    low_cardinality_cols = set()
+    if infer_number_to_dimension:
+        integer_cols = [col for col, kind in kinds.items() if kind in "iu" and col not in geo_fields]
+        cardinalities = _get_cardinalities(df[integer_cols])
+        low_cardinality_cols = {
+            col for col, cardinality in cardinalities.items() if cardinality <= NUMBER_TO_DIMENSION_MAX_CARDINALITY
+        }
+
+    field_types = {}
+    for col, kind in kinds.items():
+        if kind in "fcmiu" or col in geo_fields:
+            semantic_type = "quantitative"
+        elif kind == "M" or temporal_ratios.get(col, 0) >= TEMPORAL_INFER_MIN_RATIO:
+            semantic_type = "temporal"
+        else:
+            semantic_type = "nominal"
+
+        if col in geo_fields or col in low_cardinality_cols:
+            analytic_type = "dimension"
+        elif kind in "fcmiu":
+            analytic_type = "measure"
+        else:
+            analytic_type = "dimension"
+        field_types[col] = (semantic_type, analytic_type)
+    return field_types
+
+
 class PandasDataFrameDataParser(BaseDataFrameDataParser[pd.DataFrame]):
     """prop parser for pandas.DataFrame"""
 
@@ -30,31 +99,8 @@ class PandasDataFrameDataParser(BaseDataFrameDataParser[pd.DataFrame]):
         df.columns = rename_columns(list(df.columns))
         return df
 
-    def _infer_semantic(self, s: pd.Series, field_name: str):
-        kind = s.dtype.kind
-
-        if kind in "fcmiu" or is_geo_field(field_name):
-            return "quantitative"
-        if kind in "M":
-            return "temporal"
-        if kind in "bOSUV" and len(s) > 0 and is_temporal_field(s.iloc[0], self.infer_string_to_date):
-            return "temporal"
-
-        return "nominal"
-
-    def _infer_analytic(self, s: pd.Series, field_name: str):
-        kind = s.dtype.kind
-
-        if is_geo_field(field_name):
-            return "dimension"
-
-        if self.infer_number_to_dimension and kind in "iu" and len(s.unique()) <= 16:
-            return "dimension"
-
-        if kind in "fcmiu":
-            return "measure"
-
-        return "dimension"
+    def _infer_field_types(self, sample: pd.DataFrame) -> Dict[str, Tuple[str, str]]:
+        return infer_pandas_field_types(sample, self.infer_string_to_date, self.infer_number_to_dimension)
 
     @property
     def dataset_type(self) -> str:
@@ -1,9 +1,19 @@
-from typing import List, Any, Dict, Optional
+from typing import List, Any, Dict, Optional, Tuple
 import io
 
+import pandas as pd
 import polars as pl
 
-from .base import BaseDataFrameDataParser, is_temporal_field, is_geo_field
+from .base import (
+    BaseDataFrameDataParser,
+    FieldSpec,
+    INFER_SAMPLE_SIZE,
+    INFINITY_DATA_SIZE,
+    NUMBER_TO_DIMENSION_MAX_CARDINALITY,
+    TEMPORAL_INFER_MIN_RATIO,
+    get_temporal_ratios,
+    is_geo_field,
+)
 from pygwalker.services.fname_encodings import rename_columns
 
 
@@ -28,6 +38,13 @@ def _is_temporal_dtype(dtype: pl.DataType) -> bool:
     return dtype in pl.TEMPORAL_DTYPES
 
 
+def _get_lazy_columns(lf: pl.LazyFrame) -> List[str]:
+    collect_schema = getattr(lf, "collect_schema", None)
+    if collect_schema is not None:
+        return collect_schema().names()
+    return lf.columns
+
+
 class PolarsDataFrameDataParser(BaseDataFrameDataParser[pl.DataFrame]):
     """prop parser for polars.DataFrame"""
 
@@ -50,32 +67,99 @@ class PolarsDataFrameDataParser(BaseDataFrameDataParser[pl.DataFrame]):
         df = df.rename({old_col: new_col for old_col, new_col in zip(df.columns, rename_columns(df.columns))})
         return df
 
-    def _infer_semantic(self, s: pl.Series, field_name: str):
-        kind = s.dtype
+    def _infer_field_types(self, sample: pl.DataFrame) -> Dict[str, Tuple[str, str]]:
+        schema = dict(sample.schema)
+        geo_fields = {col for col in schema if is_geo_field(col)}
+
+        temporal_candidate_cols = [
+            col
+            for col, dtype in schema.items()
+            if not (_is_numeric_dtype(dtype) or _is_temporal_dtype(dtype)) and col not in geo_fields
+        ]
+        temporal_ratios = get_temporal_ratios(
+            pd.DataFrame({col: sample[col].to_list() for col in temporal_candidate_cols}, dtype=object),
+            self.infer_string_to_date,
+        )
+
+        low_cardinality_cols = set()
+        if self.infer_number_to_dimension:
+            integer_cols = [col for col, dtype in schema.items() if _is_integer_dtype(dtype) and col not in geo_fields]
+            if integer_cols:
+                cardinalities = sample.select(pl.col(integer_cols).n_unique()).row(0, named=True)
+                low_cardinality_cols = {
+                    col
+                    for col, cardinality in cardinalities.items()
+                    if cardinality <= NUMBER_TO_DIMENSION_MAX_CARDINALITY
+                }
+
+        field_types = {}
+        for col, dtype in schema.items():
+            if _is_numeric_dtype(dtype) or col in geo_fields:
+                semantic_type = "quantitative"
+            elif _is_temporal_dtype(dtype) or temporal_ratios.get(col, 0) >= TEMPORAL_INFER_MIN_RATIO:
+                semantic_type = "temporal"
+            else:
+                semantic_type = "nominal"
+
+            if col in geo_fields or col in low_cardinality_cols:
+                analytic_type = "dimension"
+            elif _is_numeric_dtype(dtype):
+                analytic_type = "measure"
+            else:
+                analytic_type = "dimension"
+            field_types[col] = (semantic_type, analytic_type)
+        return field_types
+
+    @property
+    def dataset_type(self) -> str:
+        return "polars_dataframe"
 
-        if _is_numeric_dtype(kind) or is_geo_field(field_name):
-            return "quantitative"
-        if _is_temporal_dtype(kind):
-            return "temporal"
-        if len(s) > 0 and is_temporal_field(s[0], self.infer_string_to_date):
-            return "temporal"
 
-        return "nominal"
+class PolarsLazyFrameDataParser(PolarsDataFrameDataParser):
+    """
+    prop parser for polars.LazyFrame.
+    The lazy frame is registered with duckdb, which pushes projections and filters of queries into the lazy plan,
+    only query results and the sample for type inference are collected.
+    """
+
+    def __init__(
+        self,
+        df: pl.LazyFrame,
+        field_specs: List[FieldSpec],
+        infer_string_to_date: bool,
+        infer_number_to_dimension: bool,
+        other_params: Dict[str, Any],
+    ):
+        super().__init__(df, field_specs, infer_string_to_date, infer_number_to_dimension, other_params)
+        self._example_df = self.df.head(1000).collect()
 
-    def _infer_analytic(self, s: pl.Series, field_name: str):
-        kind = s.dtype
+    def to_records(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        df = self.df.head(limit) if limit is not None else self.df
+        return df.collect().fill_nan(None).to_dicts()
 
-        if is_geo_field(field_name):
-            return "dimension"
+    def to_csv(self) -> io.BytesIO:
+        content = io.BytesIO()
+        self.df.collect().write_csv(content)
+        return content
 
-        if self.infer_number_to_dimension and _is_integer_dtype(kind) and len(s.unique()) <= 16:
-            return "dimension"
+    def to_parquet(self) -> io.BytesIO:
+        content = io.BytesIO()
+        self.df.collect().write_parquet(content, compression="snappy")
+        return content
 
-        if _is_numeric_dtype(kind):
-            return "measure"
+    def _rename_dataframe(self, df: pl.LazyFrame) -> pl.LazyFrame:
+        columns = _get_lazy_columns(df)
+        return df.rename({old_col: new_col for old_col, new_col in zip(columns, rename_columns(columns))})
 
-        return "dimension"
+    def _get_infer_sample(self) -> pl.DataFrame:
+        # head rows are pushed down into scans, sampling evenly spaced rows would scan the whole lazy frame
+        return self.df.head(INFER_SAMPLE_SIZE).collect()
 
     @property
     def dataset_type(self) -> str:
-        return "polars_dataframe"
+        return "polars_lazyframe"
+
+    @property
+    def data_size(self) -> int:
+        # never collect the whole lazy frame to the frontend
+        return INFINITY_DATA_SIZE
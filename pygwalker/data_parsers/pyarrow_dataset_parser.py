@@ -0,0 +1,80 @@
+from typing import Any, Dict, List
+
+import pyarrow.dataset as ds
+
+from .base import FieldSpec
+from .file_parser import FILE_FORMAT_READERS, FileDatasetParser, _quote_identifier, _quote_literal
+from pygwalker.services.fname_encodings import rename_columns
+from pygwalker.utils.duckdb_connection import DuckdbConnection
+
+
+def _get_files_source_sql(dataset: ds.Dataset) -> str:
+    """duckdb sql scanning files of a dataset, pyarrow can't scan datasets with duplicate column names"""
+    file_format = getattr(getattr(dataset, "format", None), "default_extname", None)
+    partitioning = getattr(dataset, "partitioning", None)
+    if partitioning is not None and len(partitioning.schema) == 0:
+        partitioning = None
+    if (
+        not isinstance(dataset, ds.FileSystemDataset)
+        or file_format not in FILE_FORMAT_READERS
+        or dataset.filesystem.type_name != "local"
+        or not (partitioning is None or isinstance(partitioning, ds.HivePartitioning))
+    ):
+        raise ValueError(
+            "pyarrow can't scan datasets with duplicate column names, "
+            "pass a pyarrow.Table or local parquet, csv or json files instead."
+        )
+    options = "" if partitioning is None else ", hive_partitioning = true"
+    files = ", ".join(_quote_literal(path) for path in dataset.files)
+    return f"SELECT * FROM {FILE_FORMAT_READERS[file_format]}([{files}]{options})"
+
+
+class PyArrowDatasetDataParser(FileDatasetParser):
+    """
+    Parser for pyarrow.dataset.Dataset.
+    The dataset is registered with duckdb, which pushes projections and filters of queries into its scans,
+    it is never read into one table, exports and the sample for type inference are queried like file datasets.
+    """
+
+    def __init__(
+        self,
+        dataset: ds.Dataset,
+        field_specs: List[FieldSpec],
+        infer_string_to_date: bool,
+        infer_number_to_dimension: bool,
+        other_params: Dict[str, Any],
+    ):
+        self.origin_df = dataset
+        self.field_specs = field_specs
+        self.infer_string_to_date = infer_string_to_date
+        self.infer_number_to_dimension = infer_number_to_dimension
+        self.other_params = other_params
+        self.df = dataset
+        self._duckdb_conn = self._get_dataset_duckdb_conn(dataset)
+
+    def _get_dataset_duckdb_conn(self, dataset: ds.Dataset) -> DuckdbConnection:
+        columns = dataset.schema.names
+        new_columns = rename_columns(columns)
+        if new_columns == columns:
+            return DuckdbConnection({"pygwalker_mid_table": dataset}, self.duckdb_settings)
+
+        if len(set(columns)) == len(columns):
+            # a scanner renames columns without reading the dataset, duckdb still pushes queries down into it
+            self.df = ds.Scanner.from_dataset(
+                dataset, columns={new_column: ds.field(column) for column, new_column in zip(columns, new_columns)}
+            )
+            return DuckdbConnection({"pygwalker_mid_table": self.df}, self.duckdb_settings)
+
+        # duckdb scans the files instead and columns are renamed by position
+        projection = ", ".join(
+            f"#{index + 1} AS {_quote_identifier(new_column)}" for index, new_column in enumerate(new_columns)
+        )
+        return DuckdbConnection(
+            {},
+            self.duckdb_settings,
+            views={"pygwalker_mid_table": f"SELECT {projection} FROM ({_get_files_source_sql(dataset)})"},
+        )
+
+    @property
+    def dataset_type(self) -> str:
+        return "pyarrow_dataset"
@@ -1,13 +1,93 @@
-from typing import Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+import io
 
 import pyarrow as pa
+import pyarrow.compute as pc
 
-from .base import FieldSpec
-from .pandas_parser import PandasDataFrameDataParser
+from .base import (
+    BaseDataFrameDataParser,
+    FieldSpec,
+    INFER_SAMPLE_SIZE,
+    NUMBER_TO_DIMENSION_MAX_CARDINALITY,
+    TEMPORAL_INFER_MIN_RATIO,
+    get_temporal_ratios,
+    is_geo_field,
+)
+from pygwalker.services.fname_encodings import rename_columns
 
 
-class PyArrowTableDataParser(PandasDataFrameDataParser):
-    """Parser for pyarrow.Table inputs using the existing pandas-backed data path."""
+def _is_numeric_type(data_type: pa.DataType) -> bool:
+    return pa.types.is_integer(data_type) or pa.types.is_floating(data_type) or pa.types.is_decimal(data_type)
+
+
+def _is_temporal_type(data_type: pa.DataType) -> bool:
+    return pa.types.is_timestamp(data_type) or pa.types.is_date(data_type)
+
+
+def _value_type(data_type: pa.DataType) -> pa.DataType:
+    return data_type.value_type if pa.types.is_dictionary(data_type) else data_type
+
+
+def infer_arrow_field_types(
+    sample: pa.Table,
+    infer_string_to_date: bool,
+    infer_number_to_dimension: bool,
+) -> Dict[str, Tuple[str, str]]:
+    """infer (semantic_type, analytic_type) of all columns from arrow schema and sample"""
+    schema = {field.name: _value_type(field.type) for field in sample.schema}
+    geo_fields = {col for col in schema if is_geo_field(col)}
+
+    temporal_candidate_cols = [
+        col
+        for col, data_type in schema.items()
+        if not (_is_numeric_type(data_type) or _is_temporal_type(data_type)) and col not in geo_fields
+    ]
+    temporal_ratios = get_temporal_ratios(sample.select(temporal_candidate_cols).to_pandas(), infer_string_to_date)
+
+    low_cardinality_cols = set()
+    if infer_number_to_dimension:
+        low_cardinality_cols = {
+            col
+            for col, data_type in schema.items()
+            if pa.types.is_integer(data_type)
+            and col not in geo_fields
+            and pc.count_distinct(sample[col], mode="all").as_py() <= NUMBER_TO_DIMENSION_MAX_CARDINALITY
+        }
+
+    field_types = {}
+    for col, data_type in schema.items():
+        if _is_numeric_type(data_type) or col in geo_fields:
+            semantic_type = "quantitative"
+        elif _is_temporal_type(data_type) or temporal_ratios.get(col, 0) >= TEMPORAL_INFER_MIN_RATIO:
+            semantic_type = "temporal"
+        else:
+            semantic_type = "nominal"
+
+        if col in geo_fields or col in low_cardinality_cols:
+            analytic_type = "dimension"
+        elif _is_numeric_type(data_type):
+            analytic_type = "measure"
+        else:
+            analytic_type = "dimension"
+        field_types[col] = (semantic_type, analytic_type)
+    return field_types
+
+
+def arrow_table_to_records(table: pa.Table) -> List[Dict[str, Any]]:
+    """convert arrow table to records, NaN are converted to None like other parsers"""
+    columns = [
+        pc.if_else(pc.is_nan(column), None, column) if pa.types.is_floating(column.type) else column
+        for column in table.columns
+    ]
+    return pa.Table.from_arrays(columns, names=table.column_names).to_pylist()
+
+
+class PyArrowTableDataParser(BaseDataFrameDataParser[pa.Table]):
+    """
+    Parser for pyarrow.Table, duckdb scans the table zero-copy.
+    A RecordBatchReader can only be read once, so it is read into a table first and held in memory,
+    pass a pyarrow.dataset.Dataset to keep the data out-of-core(`PyArrowDatasetDataParser`).
+    """
 
     def __init__(
         self,
@@ -17,14 +97,39 @@ class PyArrowTableDataParser(PandasDataFrameDataParser):
         infer_number_to_dimension: bool,
         other_params: Dict,
     ):
+        if isinstance(table, pa.RecordBatchReader):
+            table = table.read_all()
         self.origin_table = table
-        super().__init__(
-            table.to_pandas(),
-            field_specs,
-            infer_string_to_date,
-            infer_number_to_dimension,
-            other_params,
-        )
+        super().__init__(table, field_specs, infer_string_to_date, infer_number_to_dimension, other_params)
+
+    def to_records(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return arrow_table_to_records(self.df.slice(0, limit) if limit is not None else self.df)
+
+    def to_csv(self) -> io.BytesIO:
+        from pyarrow import csv
+
+        content = io.BytesIO()
+        csv.write_csv(self.df, content)
+        return content
+
+    def to_parquet(self) -> io.BytesIO:
+        from pyarrow import parquet
+
+        content = io.BytesIO()
+        parquet.write_table(self.df, content, compression="snappy")
+        return content
+
+    def _rename_dataframe(self, df: pa.Table) -> pa.Table:
+        return df.rename_columns(rename_columns(df.column_names))
+
+    def _get_infer_sample(self) -> pa.Table:
+        if self.df.num_rows <= INFER_SAMPLE_SIZE:
+            return self.df
+        step = self.df.num_rows // INFER_SAMPLE_SIZE
+        return self.df.take(pa.array(range(0, step * INFER_SAMPLE_SIZE, step)))
+
+    def _infer_field_types(self, sample: pa.Table) -> Dict[str, Tuple[str, str]]:
+        return infer_arrow_field_types(sample, self.infer_string_to_date, self.infer_number_to_dimension)
 
     @property
     def dataset_type(self) -> str:
@@ -4,16 +4,37 @@ import logging
 import io
 
 from pyspark.sql import DataFrame
-import sqlglot
+from pyspark.sql.types import BooleanType, DataType, NumericType
 
-from .base import BaseDataParser, get_data_meta_type, INFINITY_DATA_SIZE
+from .base import BaseDataParser, INFINITY_DATA_SIZE
 from .pandas_parser import PandasDataFrameDataParser
 from pygwalker.services.fname_encodings import rename_columns
 from pygwalker.data_parsers.base import FieldSpec
 from pygwalker.utils.payload_to_sql import get_sql_from_payload
+from pygwalker.services.query_cache import get_rows_size
+from pygwalker.services.query_control import query_controller
+from pygwalker.services.sql_memo import transpile_sql
+from pygwalker.utils.randoms import generate_hash_code
+from pygwalker.services.batch_query import (
+    DEFAULT_LOCAL_BATCH_QUERY_WORKERS,
+    execute_batch,
+    resolve_batch_query_max_workers,
+)
 
 logger = logging.getLogger(__name__)
 
+# local properties set by `SparkContext.setJobGroup`
+JOB_GROUP_PROPERTIES = ("spark.jobGroup.id", "spark.job.description", "spark.job.interruptOnCancel")
+
+
+def _get_spark_field_meta_type(data_type: DataType) -> str:
+    if isinstance(data_type, (NumericType, BooleanType)):
+        return "number"
+    # spark collects both of them as naive datetime
+    if data_type.typeName() in ("timestamp", "timestamp_ntz"):
+        return "datetime"
+    return "string"
+
 
 class SparkDataFrameDataParser(BaseDataParser):
     """prop parser for DataFrame of spark"""
@@ -54,18 +75,32 @@ class SparkDataFrameDataParser(BaseDataParser):
 
     @cached_property
     def field_metas(self) -> List[Dict[str, str]]:
-        data = self.get_datas_by_sql("SELECT * FROM pygwalker_mid_table LIMIT 1")
-        return get_data_meta_type(data[0]) if data else []
+        return [
+            {"key": field.name, "type": _get_spark_field_meta_type(field.dataType)} for field in self.df.schema.fields
+        ]
 
     def to_records(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         df = self.df.limit(limit) if limit is not None else self.df
         return [row.asDict() for row in df.collect()]
 
     def get_datas_by_sql(self, sql: str) -> List[Dict[str, Any]]:
+        return self._cached_query("rows", sql, lambda: self._query_datas(sql), get_rows_size)
+
+    def _query_datas(self, sql: str) -> List[Dict[str, Any]]:
         self.df.createOrReplaceTempView("pygwalker_mid_table")
-        sql = sqlglot.transpile(sql, read="duckdb", write="spark")[0]
-        result_df = self.spark.sql(sql)
-        return [row.asDict() for row in result_df.collect()]
+        sql = transpile_sql(sql, read="duckdb", write="spark")
+        spark_context = self.spark.sparkContext
+        job_group = f"pygwalker_{generate_hash_code()}"
+        # job group is a local property of the calling thread, restore the former one for later jobs of the thread
+        former_properties = {key: spark_context.getLocalProperty(key) for key in JOB_GROUP_PROPERTIES}
+        try:
+            with query_controller.interruptible(lambda: spark_context.cancelJobGroup(job_group)):
+                spark_context.setJobGroup(job_group, "pygwalker query", interruptOnCancel=True)
+                result_df = self.spark.sql(sql)
+                return [row.asDict() for row in result_df.collect()]
+        finally:
+            for key, value in former_properties.items():
+                spark_context.setLocalProperty(key, value)
 
     def get_datas_by_payload(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
         sql = get_sql_from_payload("pygwalker_mid_table", payload, {"pygwalker_mid_table": self.field_metas})
@@ -73,11 +108,15 @@ class SparkDataFrameDataParser(BaseDataParser):
 
     def batch_get_datas_by_sql(self, sql_list: List[str]) -> List[List[Dict[str, Any]]]:
         """batch get records"""
-        return [self.get_datas_by_sql(sql) for sql in sql_list]
+        return execute_batch(self.get_datas_by_sql, sql_list, self.batch_query_max_workers)
 
     def batch_get_datas_by_payload(self, payload_list: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
         """batch get records"""
-        return [self.get_datas_by_payload(payload) for payload in payload_list]
+        return execute_batch(self.get_datas_by_payload, payload_list, self.batch_query_max_workers)
+
+    @property
+    def batch_query_max_workers(self) -> int:
+        return resolve_batch_query_max_workers(DEFAULT_LOCAL_BATCH_QUERY_WORKERS)
 
     def to_csv(self) -> io.BytesIO:
         content = io.BytesIO()
@@ -3,11 +3,14 @@ This module contains all the custom errors used by pygwalker.
 """
 
 from enum import Enum
+from typing import Dict
 
 
 class ErrorCode(int, Enum):
     UNKNOWN_ERROR = -1
     INVALID_REQUEST = 10001
+    QUERY_CANCELLED = 10002
+    QUERY_TIMEOUT = 10003
     TOKEN_ERROR = 20001
     CLOUD_CONFIG_LIMIT = 20002
     CLOUD_CHART_NOT_FOUND = 20003
@@ -58,6 +61,33 @@ class CommProtocolError(BaseError):
         super().__init__(*args, code=ErrorCode.INVALID_REQUEST)
 
 
+class BatchQueryError(BaseError):
+    """Raised when some queries of a batch query failed."""
+
+    def __init__(self, errors: Dict[int, Exception]) -> None:
+        first_error = errors[min(errors)]
+        details = "; ".join(f"query {index}: {error}" for index, error in sorted(errors.items()))
+        super().__init__(
+            f"{len(errors)} queries of batch failed. {details}",
+            code=getattr(first_error, "code", ErrorCode.UNKNOWN_ERROR),
+        )
+        self.errors = errors
+
+
+class QueryCancelledError(BaseError):
+    """Raised when a query is cancelled by the frontend."""
+
+    def __init__(self, *args, code: ErrorCode = ErrorCode.QUERY_CANCELLED) -> None:
+        super().__init__(*args, code=code)
+
+
+class QueryTimeoutError(QueryCancelledError):
+    """Raised when a query is cancelled because it runs beyond the deadline of its request."""
+
+    def __init__(self, *args) -> None:
+        super().__init__(*args, code=ErrorCode.QUERY_TIMEOUT)
+
+
 class StreamlitPygwalkerApiError(BaseError):
     """Raised when the config is invalid."""
 
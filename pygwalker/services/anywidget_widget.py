@@ -1,11 +1,10 @@
-import json
 from typing import Any, List, Optional
 
 import anywidget
 import traitlets
 
 from pygwalker.communications.anywidget_comm import AnywidgetCommunication
-from pygwalker.utils.encode import DataFrameEncoder
+from pygwalker.utils.encode import json_dumps
 from pygwalker.utils.frontend_assets import read_frontend_asset
 
 
@@ -25,7 +24,7 @@ def create_anywidget_for_walker(
 ) -> WalkerAnyWidget:
     widget = WalkerAnyWidget()
     comm = communication_cls(walker.gid)
-    widget.props = json.dumps(walker._get_props(env, data_source), cls=DataFrameEncoder)
+    widget.props = json_dumps(walker._get_props(env, data_source))
     comm.register_widget(widget)
     walker._init_callback(comm)
     return widget
@@ -0,0 +1,128 @@
+from typing import Callable, Generic, List, Optional, TypeVar, TYPE_CHECKING
+import atexit
+import logging
+import threading
+import weakref
+
+if TYPE_CHECKING:
+    import duckdb
+    from pygwalker.utils.duckdb_connection import DuckdbConnection
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# seconds to wait at interpreter exit for interrupted builds to release their cursors
+EXIT_JOIN_TIMEOUT = 5.0
+
+_background_builds: "weakref.WeakSet[BackgroundBuild]" = weakref.WeakSet()
+
+
+def _close_background_builds() -> None:
+    # duckdb aborts the process if a cursor is torn down by interpreter exit while its query runs
+    for background_build in list(_background_builds):
+        background_build.close(EXIT_JOIN_TIMEOUT)
+
+
+atexit.register(_close_background_builds)
+
+
+class BackgroundBuild(Generic[T]):
+    """
+    Lifecycle of tables derived from a kernel table in background, such as rollups or samples.
+
+    Each start runs `build(cursor)` on a daemon thread and supersedes builds started before it,
+    their queries are interrupted and their results are dropped.
+    `result` is None until the latest build finishes, or after `close`.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._generation = 0
+        self._started = False
+        self._cursor: Optional["duckdb.DuckDBPyConnection"] = None
+        self._threads: List[threading.Thread] = []
+        self.result: Optional[T] = None
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    def start(
+        self,
+        duckdb_conn: "DuckdbConnection",
+        build: Callable[["duckdb.DuckDBPyConnection"], T],
+        background: bool = True,
+    ) -> None:
+        self._started = True
+        generation = self._supersede()
+        if not background:
+            self._run(duckdb_conn, build, generation)
+            return
+
+        thread = threading.Thread(target=self._run, args=(duckdb_conn, build, generation), name=self.name, daemon=True)
+        with self._lock:
+            self._threads = [running for running in self._threads if running.is_alive()] + [thread]
+        _background_builds.add(self)
+        thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """wait until the latest build finishes, returns False on timeout"""
+        return self._ready.wait(timeout)
+
+    def is_current(self, cursor: "duckdb.DuckDBPyConnection") -> bool:
+        """whether cursor belongs to the latest build, errors of superseded builds are expected"""
+        with self._lock:
+            return cursor is self._cursor
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """interrupt running builds and drop the result, eg: before closing their database"""
+        self._supersede()
+        with self._lock:
+            threads = list(self._threads)
+        for thread in threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+
+    def _supersede(self) -> int:
+        with self._lock:
+            self._generation += 1
+            self.result = None
+            self._ready.clear()
+            generation = self._generation
+            cursor, self._cursor = self._cursor, None
+        if cursor is not None:
+            try:
+                cursor.interrupt()
+            except Exception:
+                pass
+        return generation
+
+    def _run(
+        self,
+        duckdb_conn: "DuckdbConnection",
+        build: Callable[["duckdb.DuckDBPyConnection"], T],
+        generation: int,
+    ) -> None:
+        result = None
+        try:
+            cursor = duckdb_conn.cursor()
+            with self._lock:
+                if generation != self._generation:
+                    return
+                self._cursor = cursor
+            result = build(cursor)
+        except Exception as e:
+            if generation != self._generation:
+                # interrupted by a newer build or `close`, or its database was closed
+                return
+            logger.warning("Failed to build %s: %s", self.name, e)
+
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._cursor = None
+            self.result = result
+            self._ready.set()
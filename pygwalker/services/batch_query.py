@@ -0,0 +1,82 @@
+from typing import Callable, Dict, List, Optional, TypeVar
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import threading
+import os
+
+from pygwalker.errors import BatchQueryError
+from pygwalker.services.global_var import GlobalVarManager
+from pygwalker.services.query_control import query_controller
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+BATCH_QUERY_THREAD_POOL_SIZE = 16
+DEFAULT_LOCAL_BATCH_QUERY_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_REMOTE_BATCH_QUERY_WORKERS = 8
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=BATCH_QUERY_THREAD_POOL_SIZE,
+                thread_name_prefix="pygwalker-batch-query",
+            )
+        return _executor
+
+
+def resolve_batch_query_max_workers(default: int, limit: Optional[int] = None) -> int:
+    """Resolve concurrency of batch queries, user config first, and never exceed the limit of data source."""
+    max_workers = GlobalVarManager.batch_query_max_workers or default
+    if limit is not None:
+        max_workers = min(max_workers, limit)
+    return max(max_workers, 1)
+
+
+def execute_batch(func: Callable[[T], R], items: List[T], max_workers: int) -> List[R]:
+    """
+    Run func over items with at most max_workers concurrent calls.
+    Results keep the order of items, errors of all failed items are raised together as BatchQueryError.
+    """
+    results: List[Optional[R]] = [None] * len(items)
+    errors: Dict[int, Exception] = {}
+
+    if max_workers <= 1 or len(items) <= 1:
+        for index, item in enumerate(items):
+            try:
+                results[index] = func(item)
+            except Exception as e:
+                errors[index] = e
+    else:
+        executor = _get_executor()
+        future_index_map: Dict[Future, int] = {}
+        # queries running on the pool are part of the request of caller, so cancelling it stops them too
+        query_request = query_controller.current_request()
+
+        def run_in_request(item: T) -> R:
+            with query_controller.bind(query_request):
+                return func(item)
+
+        def collect(done_futures):
+            for future in done_futures:
+                index = future_index_map.pop(future)
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    errors[index] = e
+
+        for index, item in enumerate(items):
+            if len(future_index_map) >= max_workers:
+                done, _ = wait(list(future_index_map), return_when=FIRST_COMPLETED)
+                collect(done)
+            future_index_map[executor.submit(run_in_request, item)] = index
+        done, _ = wait(list(future_index_map))
+        collect(done)
+
+    if errors:
+        raise BatchQueryError(errors)
+    return results
@@ -10,17 +10,27 @@ Updated on Tue November 11 15:15:48 2024
 
 import asyncio
 import logging
+import os
 import sys
 import json
-from typing import Dict, Any, Coroutine
+import time
+from typing import Dict, Any, Coroutine, Optional
 from urllib import request
-from threading import Thread
+from threading import Lock, Thread
+
+from appdirs import user_cache_dir
+
 from pygwalker import __version__
 from pygwalker.services.global_var import GlobalVarManager
 from .config import get_local_user_id
 
 
 _UPDATE_URL = "https://5agko11g7e.execute-api.us-west-1.amazonaws.com/default/check_updates"
+UPDATE_CHECK_CACHE_PATH = os.path.join(user_cache_dir("pygwalker"), "update_check.json")
+UPDATE_CHECK_TTL = 24 * 60 * 60
+
+_update_check_lock = Lock()
+_update_checked = False
 
 logger = logging.getLogger(__name__)
 
@@ -111,14 +121,59 @@ def _check_update() -> Dict[str, Any]:
         return {}
 
 
+def _read_update_check_cache() -> Optional[Dict[str, Any]]:
+    try:
+        with open(UPDATE_CHECK_CACHE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_update_check_cache(result: Dict[str, Any]) -> None:
+    tmp_path = f"{UPDATE_CHECK_CACHE_PATH}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(UPDATE_CHECK_CACHE_PATH), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": __version__, "checked_at": time.time(), "result": result}, f)
+        os.replace(tmp_path, UPDATE_CHECK_CACHE_PATH)
+    except (OSError, TypeError, ValueError) as exc:
+        logger.debug("Failed to write PyGWalker update check cache: %s", exc)
+
+
+def _is_update_check_cache_fresh() -> bool:
+    cache = _read_update_check_cache()
+    if not isinstance(cache, dict) or cache.get("version") != __version__:
+        return False
+    checked_at = cache.get("checked_at")
+    return isinstance(checked_at, (int, float)) and 0 <= time.time() - checked_at < UPDATE_CHECK_TTL
+
+
+def _check_update_with_cache() -> None:
+    """
+    Check for updates unless it was already checked within `UPDATE_CHECK_TTL` by this version.
+    """
+    if _is_update_check_cache_fresh():
+        return
+    result = _check_update()
+    if result:
+        _write_update_check_cache(result)
+
+
 def check_update() -> None:
     """
-    Check for update.
+    Check for update in background, at most once per process.
 
     Parameters
     ----------
     None
 
     """
-    if GlobalVarManager.privacy != "offline":
-        Thread(target=_check_update, daemon=True).start()
+    global _update_checked
+
+    if GlobalVarManager.privacy == "offline":
+        return
+    with _update_check_lock:
+        if _update_checked:
+            return
+        _update_checked = True
+    Thread(target=_check_update_with_cache, name="pygwalker-check-update", daemon=True).start()
@@ -1,4 +1,5 @@
 from typing import Any, Callable, Dict, Optional, TYPE_CHECKING, Type, TypeVar
+import functools
 
 from pydantic import BaseModel
 
@@ -7,6 +8,8 @@ from pygwalker.communications.protocol import (
     AskSpecRequest,
     BatchPayloadQueryRequest,
     BatchSqlQueryRequest,
+    CancelRequestRequest,
+    CancelRequestResponse,
     ChatChartRequest,
     EmptyResponse,
     EmptyRequest,
@@ -27,6 +30,7 @@ from pygwalker.services.data_upload_communication import DataUploadCommunication
 from pygwalker.services.desktop_communication import DesktopCommunicationService
 from pygwalker.services.desktop_import import DesktopImportService
 from pygwalker.services.preview_image import PreviewImageTool
+from pygwalker.services.query_control import query_controller
 from pygwalker.services.spec_communication import SpecCommunicationService
 from pygwalker.services.upload_data import BatchUploadDatasToolOnWidgets
 
@@ -36,6 +40,21 @@ if TYPE_CHECKING:
 
 RequestT = TypeVar("RequestT", bound=BaseModel)
 
+# endpoints query data or call remote apis, async servers run them on the request worker pool
+BLOCKING_ENDPOINTS = {
+    "get_datas",
+    "get_datas_by_payload",
+    "batch_get_datas_by_sql",
+    "batch_get_datas_by_payload",
+    "export_dataframe_by_payload",
+    "export_dataframe_by_sql",
+    "upload_spec_to_cloud",
+    "upload_to_cloud_charts",
+    "upload_to_cloud_dashboard",
+    "get_spec_by_text",
+    "get_chart_by_chats",
+}
+
 
 class CommHandler:
     """Register and serve frontend communication callbacks for a walker."""
@@ -71,6 +90,7 @@ class CommHandler:
         self._register_request("get_latest_vis_spec", EmptyRequest, self.spec_communication.get_latest_vis_spec)
         self._register_request("request_data", EmptyRequest, self.data_upload_communication.request_data)
         self._register_request("ping", EmptyRequest, self._ping)
+        self._register_request("cancel_request", CancelRequestRequest, self._cancel_request)
         self._register_request("open_in_desktop", OpenDesktopRequest, self.desktop_communication.open_in_desktop)
 
         if self.walker.use_save_tool:
@@ -105,6 +125,10 @@ class CommHandler:
                 BatchPayloadQueryRequest,
                 self.data_communication.batch_get_datas_by_payload,
             )
+            if self.comm.supports_push:
+                self.walker.data_parser.add_invalidate_listener(
+                    functools.partial(self.data_communication.push_invalidated_datas, self.comm)
+                )
 
         if self.walker.is_export_dataframe:
             self._register_request(
@@ -125,7 +149,10 @@ class CommHandler:
         def _handle(data: Dict[str, Any]) -> Dict[str, Any]:
             return handler(validate_request(request_model, data))
 
-        self.comm.register(endpoint, _handle)
+        self.comm.register(endpoint, _handle, blocking=endpoint in BLOCKING_ENDPOINTS)
 
     def _ping(self, _: EmptyRequest) -> Dict[str, Any]:
         return dump_response(EmptyResponse())
+
+    def _cancel_request(self, request: CancelRequestRequest) -> Dict[str, Any]:
+        return dump_response(CancelRequestResponse(cancelled=query_controller.cancel(request.rid)))
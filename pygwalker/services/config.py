@@ -1,8 +1,9 @@
 import os
 import json
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
 from functools import lru_cache
 
+from pygwalker.utils.duckdb_connection import DUCKDB_SETTING_KEYS
 from pygwalker.utils.randoms import generate_hash_code
 
 from appdirs import user_config_dir
@@ -52,7 +53,46 @@ kanati_token_item = ConfigItem(
     by kanaries token, you can use kanaries service in pygwalker, such as share chart, share config.
     """,
 )
-config_items = [privacy_item, kanati_token_item]
+duckdb_threads_item = ConfigItem(
+    "duckdb_threads",
+    ["number of threads"],
+    default="number of cpu cores",
+    description="""
+    max threads used by duckdb of kernel computation.
+    """,
+)
+duckdb_memory_limit_item = ConfigItem(
+    "duckdb_memory_limit",
+    ["memory size, e.g. 2GB"],
+    default="80% of system memory",
+    description="""
+    max memory used by duckdb of each walker, queries spill to duckdb_temp_directory beyond it.
+    """,
+)
+duckdb_temp_directory_item = ConfigItem(
+    "duckdb_temp_directory",
+    ["directory path"],
+    default=".tmp",
+    description="""
+    directory where duckdb spills data that doesn't fit in duckdb_memory_limit.
+    """,
+)
+duckdb_preserve_insertion_order_item = ConfigItem(
+    "duckdb_preserve_insertion_order",
+    ["true", "false"],
+    default="true",
+    description="""
+    "false" lets duckdb reorder rows of queries without ORDER BY, which uses less memory.
+    """,
+)
+config_items = [
+    privacy_item,
+    kanati_token_item,
+    duckdb_threads_item,
+    duckdb_memory_limit_item,
+    duckdb_temp_directory_item,
+    duckdb_preserve_insertion_order_item,
+]
 
 
 def get_config_params_help() -> str:
@@ -134,6 +174,12 @@ def get_config_dict() -> Dict[str, str]:
     return config
 
 
+def get_duckdb_settings_config() -> Dict[str, Any]:
+    """Get duckdb settings of kernel computation from `duckdb_*` configurations."""
+    config = _read_and_create_file(CONFIG_PATH, DEFAULT_CONFIG)
+    return {key: config[f"duckdb_{key}"] for key in DUCKDB_SETTING_KEYS if config.get(f"duckdb_{key}", "") != ""}
+
+
 def get_all_config_str() -> str:
     config = _read_and_create_file(CONFIG_PATH, DEFAULT_CONFIG)
     return json.dumps(config, indent=4)
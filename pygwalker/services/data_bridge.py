@@ -1,15 +1,17 @@
-from typing import Callable, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Union, TYPE_CHECKING
 
 from typing_extensions import Literal
 
 from pygwalker._constants import JUPYTER_BYTE_LIMIT
 from pygwalker._typing import DataFrame
 from pygwalker.data_parsers.base import BaseDataParser, FieldSpec
-from pygwalker.data_parsers.database_parser import Connector
 from pygwalker.services.cloud_service import CloudService
 from pygwalker.services.data_parsers import get_parser
 from pygwalker.utils.randoms import rand_str
 
+if TYPE_CHECKING:
+    from pygwalker.data_parsers.database_parser import Connector
+
 
 class DataBridge:
     """Own the parser and kernel/browser data path decision for a walker."""
@@ -17,7 +19,7 @@ class DataBridge:
     def __init__(
         self,
         *,
-        dataset: Union[DataFrame, Connector, str],
+        dataset: Union[DataFrame, "Connector", str],
         field_specs: List[FieldSpec],
         cloud_computation: bool,
         kernel_computation: Optional[bool],
@@ -43,17 +45,23 @@ class DataBridge:
     @staticmethod
     def create_data_parser(
         *,
-        dataset: Union[DataFrame, Connector, str],
+        dataset: Union[DataFrame, "Connector", str],
         field_specs: List[FieldSpec],
         cloud_computation: bool,
         kanaries_api_key: str,
         cloud_service: CloudService,
+        duckdb_settings: Optional[Dict[str, Any]] = None,
+        pre_aggregations: Optional[List[List[str]]] = None,
+        progressive_query: Optional[bool] = None,
     ) -> BaseDataParser:
-        data_parser = get_parser(
-            dataset,
-            field_specs,
-            other_params={"kanaries_api_key": kanaries_api_key},
-        )
+        other_params = {"kanaries_api_key": kanaries_api_key}
+        if duckdb_settings is not None:
+            other_params["duckdb_settings"] = duckdb_settings
+        if pre_aggregations is not None:
+            other_params["pre_aggregations"] = pre_aggregations
+        if progressive_query is not None:
+            other_params["progressive_query"] = progressive_query
+        data_parser = get_parser(dataset, field_specs, other_params=other_params)
         if not cloud_computation:
             return data_parser
 
@@ -83,3 +91,11 @@ class DataBridge:
             self.data_parser.get_datas_by_sql("SELECT 1 FROM pygwalker_mid_table LIMIT 1")
         except Exception:
             pass
+
+    def build_pre_aggregations(self) -> None:
+        """build configured rollups in background, charts scan the whole table until they are ready"""
+        self.data_parser.build_pre_aggregations()
+
+    def build_progressive_sample(self) -> None:
+        """sample large kernel tables in background, charts are answered exactly until the sample is ready"""
+        self.data_parser.build_progressive_sample()
@@ -1,7 +1,10 @@
-from typing import TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+import logging
+import uuid
 
 import pandas as pd
 
+from pygwalker.communications.base import BaseCommunication
 from pygwalker.communications.protocol import (
     BatchPayloadQueryRequest,
     BatchSqlQueryRequest,
@@ -10,12 +13,23 @@ from pygwalker.communications.protocol import (
     SqlQueryRequest,
     dump_response,
 )
+from pygwalker.errors import QueryCancelledError, QueryTimeoutError
 from pygwalker.services.global_var import GlobalVarManager
+from pygwalker.services.query_control import query_controller
+from pygwalker.services.request_dispatcher import request_dispatcher
+from pygwalker.utils.encode import to_arrow_ipc_bytes
 from pygwalker.utils.pydantic_compat import model_dump
 
 if TYPE_CHECKING:
     from pygwalker.api.pygwalker import PygWalker
 
+logger = logging.getLogger(__name__)
+
+# action pushing exact datas of an approximate response, its data is a ProgressiveDatasMessage
+PROGRESSIVE_DATAS_ACTION = "update_datas_by_payload"
+# action telling frontend to drop datas it cached locally after the kernel invalidated its query cache
+INVALIDATE_DATAS_ACTION = "invalidate_datas"
+
 
 class DataCommunicationService:
     """Serve data query and dataframe export communication endpoints."""
@@ -24,22 +38,119 @@ class DataCommunicationService:
         self.walker = walker
 
     def get_datas(self, request: SqlQueryRequest):
+        if request.result_format == "arrow":
+            table = self.walker.data_parser.get_datas_by_sql_arrow(request.sql)
+            return {"datas": to_arrow_ipc_bytes(table)}
+        if request.result_format == "columnar":
+            return {"datas": self.walker.data_parser.get_datas_by_sql_columnar(request.sql)}
         datas = self.walker.data_parser.get_datas_by_sql(request.sql)
         return {"datas": datas}
 
     def get_datas_by_payload(self, request: PayloadQueryRequest):
-        datas = self.walker.data_parser.get_datas_by_payload(model_dump(request.payload, exclude_none=True))
+        payload = model_dump(request.payload, exclude_none=True)
+        progressive_datas = self._get_progressive_datas([payload], request.result_format)
+        if progressive_datas is not None:
+            datas, approximate, progressive_id = progressive_datas
+            return {"datas": datas[0], "approximate": approximate[0], "progressiveId": progressive_id}
+        if request.result_format == "arrow":
+            table = self.walker.data_parser.get_datas_by_payload_arrow(payload)
+            return {"datas": to_arrow_ipc_bytes(table)}
+        if request.result_format == "columnar":
+            return {"datas": self.walker.data_parser.get_datas_by_payload_columnar(payload)}
+        datas = self.walker.data_parser.get_datas_by_payload(payload)
         return {"datas": datas}
 
     def batch_get_datas_by_sql(self, request: BatchSqlQueryRequest):
-        result = self.walker.data_parser.batch_get_datas_by_sql(request.query_list)
-        return {"datas": result}
+        return {"datas": self._batch_get_datas_by_sql(request.query_list, request.result_format)}
 
     def batch_get_datas_by_payload(self, request: BatchPayloadQueryRequest):
-        result = self.walker.data_parser.batch_get_datas_by_payload(
-            [model_dump(query, exclude_none=True) for query in request.query_list]
+        payload_list = [model_dump(query, exclude_none=True) for query in request.query_list]
+        progressive_datas = self._get_progressive_datas(payload_list, request.result_format)
+        if progressive_datas is not None:
+            datas, approximate, progressive_id = progressive_datas
+            return {"datas": datas, "approximate": approximate, "progressiveId": progressive_id}
+        return {"datas": self._batch_get_datas_by_payload(payload_list, request.result_format)}
+
+    def _batch_get_datas_by_sql(self, sql_list: List[str], result_format: Optional[str]) -> List[Any]:
+        if result_format == "arrow":
+            tables = self.walker.data_parser.batch_get_datas_by_sql_arrow(sql_list)
+            return [to_arrow_ipc_bytes(table) for table in tables]
+        if result_format == "columnar":
+            return self.walker.data_parser.batch_get_datas_by_sql_columnar(sql_list)
+        return self.walker.data_parser.batch_get_datas_by_sql(sql_list)
+
+    def _batch_get_datas_by_payload(
+        self, payload_list: List[Dict[str, Any]], result_format: Optional[str]
+    ) -> List[Any]:
+        if result_format == "arrow":
+            tables = self.walker.data_parser.batch_get_datas_by_payload_arrow(payload_list)
+            return [to_arrow_ipc_bytes(table) for table in tables]
+        if result_format == "columnar":
+            return self.walker.data_parser.batch_get_datas_by_payload_columnar(payload_list)
+        return self.walker.data_parser.batch_get_datas_by_payload(payload_list)
+
+    def _get_progressive_datas(
+        self, payload_list: List[Dict[str, Any]], result_format: Optional[str]
+    ) -> Optional[Tuple[List[Any], List[bool], str]]:
+        """
+        Answer payloads from sample of data first when `progressive_query` is enabled,
+        returns (datas, approximate flags, progressive id), or None if no payload can be approximated.
+        Exact datas of approximated payloads are computed in background and pushed to frontend,
+        so it needs a communication which can push messages.
+        """
+        comm = getattr(self.walker, "comm", None)
+        if not getattr(self.walker, "progressive_query", None) or comm is None or not comm.supports_push:
+            return None
+
+        sql_list = [self.walker.data_parser.get_approximate_sql_by_payload(payload) for payload in payload_list]
+        indexes = [index for index, sql in enumerate(sql_list) if sql is not None]
+        if not indexes:
+            return None
+
+        approximate = [sql is not None for sql in sql_list]
+        approximate_datas = iter(self._batch_get_datas_by_sql([sql_list[index] for index in indexes], result_format))
+        exact_payloads = [payload for payload, sql in zip(payload_list, sql_list) if sql is None]
+        exact_datas = iter(self._batch_get_datas_by_payload(exact_payloads, result_format) if exact_payloads else [])
+        datas = [next(approximate_datas) if flag else next(exact_datas) for flag in approximate]
+
+        progressive_id = uuid.uuid4().hex
+        request_dispatcher.submit(
+            comm.gid,
+            self._push_exact_datas,
+            progressive_id,
+            indexes,
+            [payload_list[index] for index in indexes],
+            result_format,
         )
-        return {"datas": result}
+        return datas, approximate, progressive_id
+
+    def _push_exact_datas(
+        self,
+        progressive_id: str,
+        indexes: List[int],
+        payload_list: List[Dict[str, Any]],
+        result_format: Optional[str],
+    ) -> None:
+        """the exact query can be cancelled by `cancel_request` with progressive id as rid"""
+        try:
+            with query_controller.request(progressive_id, GlobalVarManager.query_timeout):
+                datas = self._batch_get_datas_by_payload(payload_list, result_format)
+        except QueryTimeoutError as e:
+            logger.warning("Exact datas of progressive query %s timed out: %s", progressive_id, e)
+            return
+        except QueryCancelledError:
+            return
+        except Exception as e:
+            logger.warning("Failed to query exact datas of progressive query %s: %s", progressive_id, e)
+            return
+        self.walker.comm.send_msg_async(
+            PROGRESSIVE_DATAS_ACTION,
+            {"progressiveId": progressive_id, "indexes": indexes, "datas": datas},
+        )
+
+    def push_invalidated_datas(self, comm: BaseCommunication) -> None:
+        """frontend caches exact datas of progressive queries, charts query the kernel again once they are dropped"""
+        comm.send_msg_async(INVALIDATE_DATAS_ACTION, {})
 
     def export_dataframe_by_payload(self, request: PayloadQueryRequest):
         df = pd.DataFrame(self.walker.data_parser.get_datas_by_payload(model_dump(request.payload, exclude_none=True)))
@@ -1,24 +1,33 @@
+import os
 import sys
 import hashlib
 import pandas as pd
-from typing import Dict, Optional, Union, Any, List, Tuple
+from typing import Dict, Optional, Union, Any, List, Tuple, TYPE_CHECKING
 from typing_extensions import Literal
 
 from pygwalker.data_parsers.base import BaseDataParser, FieldSpec
-from pygwalker.data_parsers.database_parser import Connector
 from pygwalker._typing import DataFrame
 
+if TYPE_CHECKING:
+    from pygwalker.data_parsers.database_parser import Connector
+
 __classname2method = {}
 
-DatasetType = Literal["pandas", "polars", "pyarrow", "modin", "pyspark", "connector", "cloud_dataset"]
+DatasetType = Literal[
+    "pandas", "polars", "polars_lazy", "pyarrow", "modin", "pyspark", "connector", "file", "cloud_dataset"
+]
 
 SUPPORTED_DATASET_INPUTS = (
     "pandas.DataFrame",
     "polars.DataFrame",
+    "polars.LazyFrame",
     "pyarrow.Table",
+    "pyarrow.RecordBatchReader",
+    "pyarrow.dataset.Dataset",
     "modin.pandas.DataFrame",
     "pyspark.sql.DataFrame",
     "pygwalker.data_parsers.database_parser.Connector",
+    "parquet/csv/json file, glob or directory path",
     "cloud dataset id string",
 )
 
@@ -29,7 +38,7 @@ def _get_type_name(value: Any) -> str:
 
 
 # pylint: disable=import-outside-toplevel
-def _get_data_parser(dataset: Union[DataFrame, Connector, str]) -> Tuple[BaseDataParser, DatasetType]:
+def _get_data_parser(dataset: Union[DataFrame, "Connector", str, os.PathLike]) -> Tuple[BaseDataParser, DatasetType]:
     """
     Get DataFrameDataParser for dataset
     TODO: Maybe you can find a better way to handle the following code
@@ -52,14 +61,29 @@ def _get_data_parser(dataset: Union[DataFrame, Connector, str]) -> Tuple[BaseDat
             __classname2method[pl.DataFrame] = (PolarsDataFrameDataParser, "polars")
             return __classname2method[pl.DataFrame]
 
+        if isinstance(dataset, pl.LazyFrame):
+            from pygwalker.data_parsers.polars_parser import PolarsLazyFrameDataParser
+
+            __classname2method[pl.LazyFrame] = (PolarsLazyFrameDataParser, "polars_lazy")
+            return __classname2method[pl.LazyFrame]
+
     if "pyarrow" in sys.modules:
         import pyarrow as pa
 
-        if isinstance(dataset, pa.Table):
+        if isinstance(dataset, (pa.Table, pa.RecordBatchReader)):
             from pygwalker.data_parsers.pyarrow_parser import PyArrowTableDataParser
 
-            __classname2method[pa.Table] = (PyArrowTableDataParser, "pyarrow")
-            return __classname2method[pa.Table]
+            __classname2method[type(dataset)] = (PyArrowTableDataParser, "pyarrow")
+            return __classname2method[type(dataset)]
+
+        if "pyarrow.dataset" in sys.modules:
+            import pyarrow.dataset as ds
+
+            if isinstance(dataset, ds.Dataset):
+                from pygwalker.data_parsers.pyarrow_dataset_parser import PyArrowDatasetDataParser
+
+                __classname2method[type(dataset)] = (PyArrowDatasetDataParser, "pyarrow")
+                return __classname2method[type(dataset)]
 
     if "modin.pandas" in sys.modules:
         from modin import pandas as mpd
@@ -79,11 +103,20 @@ def _get_data_parser(dataset: Union[DataFrame, Connector, str]) -> Tuple[BaseDat
             __classname2method[SparkDataFrame] = (SparkDataFrameDataParser, "pyspark")
             return __classname2method[SparkDataFrame]
 
-    if isinstance(dataset, Connector):
-        from pygwalker.data_parsers.database_parser import DatabaseDataParser
+    if "pygwalker.data_parsers.database_parser" in sys.modules:
+        from pygwalker.data_parsers.database_parser import Connector, DatabaseDataParser
+
+        if isinstance(dataset, Connector):
+            __classname2method[DatabaseDataParser] = (DatabaseDataParser, "connector")
+            return __classname2method[DatabaseDataParser]
+
+    if isinstance(dataset, (str, os.PathLike)):
+        from pygwalker.data_parsers.file_parser import FileDatasetParser, is_file_dataset
 
-        __classname2method[DatabaseDataParser] = (DatabaseDataParser, "connector")
-        return __classname2method[DatabaseDataParser]
+        # strings are cached by parser class, a string is either a file path or a cloud dataset id
+        if is_file_dataset(dataset):
+            __classname2method[FileDatasetParser] = (FileDatasetParser, "file")
+            return __classname2method[FileDatasetParser]
 
     if isinstance(dataset, str):
         from pygwalker.data_parsers.cloud_dataset_parser import CloudDatasetParser
@@ -98,7 +131,7 @@ def _get_data_parser(dataset: Union[DataFrame, Connector, str]) -> Tuple[BaseDat
 
 
 def get_parser(
-    dataset: Union[DataFrame, Connector, str],
+    dataset: Union[DataFrame, "Connector", str],
     field_specs: Optional[List[FieldSpec]] = None,
     infer_string_to_date: bool = False,
     infer_number_to_dimension: bool = True,
@@ -126,6 +159,13 @@ def _get_pl_dataset_hash(dataset: DataFrame) -> str:
     return hashlib.md5(hash_bytes).hexdigest()
 
 
+def _get_pl_lazy_dataset_hash(dataset: DataFrame) -> str:
+    """Get polars lazy frame hash value, by its head rows and query plan without collecting all of it."""
+    head_rows = dataset.head(4000).collect()
+    hash_bytes = head_rows.hash_rows().to_numpy().tobytes() + dataset.explain().encode() + b"_polars_lazy"
+    return hashlib.md5(hash_bytes).hexdigest()
+
+
 def _get_pd_dataset_hash(dataset: DataFrame) -> str:
     """Get pandas dataset hash value."""
     row_count = dataset.shape[0]
@@ -138,12 +178,27 @@ def _get_pd_dataset_hash(dataset: DataFrame) -> str:
 
 def _get_pyarrow_dataset_hash(dataset: DataFrame) -> str:
     """Get pyarrow table hash value."""
-    table_shape = (dataset.num_rows, dataset.num_columns)
-    dataset = dataset.to_pandas()
+    import pyarrow as pa
+
+    if isinstance(dataset, pa.RecordBatchReader):
+        # a reader can only be read once, hash it by identity
+        return hashlib.md5(f"{id(dataset)}_{dataset.schema}_pyarrow".encode()).hexdigest()
+    if not isinstance(dataset, pa.Table) and len(set(dataset.schema.names)) != len(dataset.schema.names):
+        # pyarrow can't scan datasets with duplicate column names, hash them by their files
+        files = getattr(dataset, "files", id(dataset))
+        return hashlib.md5(f"{files}_{dataset.schema}_pyarrow".encode()).hexdigest()
+    if isinstance(dataset, pa.Table):
+        table_shape = (dataset.num_rows, dataset.num_columns)
+    else:
+        # pyarrow.dataset.Dataset, avoid reading all of it
+        table_shape = (dataset.count_rows(), len(dataset.schema))
+        dataset = dataset.head(4000)
+
     other_info = str(table_shape) + "_pyarrow"
-    if len(dataset) > 4000:
-        dataset = pd.concat([dataset[:2000], dataset[-2000:]])
-    hash_bytes = pd.util.hash_pandas_object(dataset).values.tobytes() + other_info.encode()
+    if dataset.num_rows > 4000:
+        dataset = pa.concat_tables([dataset.slice(0, 2000), dataset.slice(dataset.num_rows - 2000)])
+    # only convert the rows to be hashed
+    hash_bytes = pd.util.hash_pandas_object(dataset.to_pandas()).values.tobytes() + other_info.encode()
     return hashlib.md5(hash_bytes).hexdigest()
 
 
@@ -160,6 +215,17 @@ def _get_modin_dataset_hash(dataset: DataFrame) -> str:
     return hashlib.md5(hash_bytes).hexdigest()
 
 
+def _get_file_dataset_hash(dataset: Union[str, "os.PathLike[str]"]) -> str:
+    """Get file dataset hash value, by paths, sizes and modified times of matched files without reading them."""
+    from pygwalker.data_parsers.file_parser import get_file_paths
+
+    file_infos = []
+    for file_path in get_file_paths(dataset):
+        file_stat = os.stat(file_path)
+        file_infos.append(f"{file_path}:{file_stat.st_size}:{file_stat.st_mtime_ns}")
+    return hashlib.md5("\n".join([os.fspath(dataset), *file_infos, "_file"]).encode()).hexdigest()
+
+
 def _get_spark_dataset_hash(dataset: DataFrame) -> str:
     """Get pyspark dataset hash value."""
     shape = (dataset.count(), len(dataset.columns))
@@ -172,13 +238,16 @@ def _get_spark_dataset_hash(dataset: DataFrame) -> str:
     return hashlib.md5(hash_bytes).hexdigest()
 
 
-def get_dataset_hash(dataset: Union[DataFrame, Connector, str]) -> str:
+def get_dataset_hash(dataset: Union[DataFrame, "Connector", str]) -> str:
     """Just a less accurate way to get different dataset hash values."""
     _, dataset_type = _get_data_parser(dataset)
 
     if dataset_type == "polars":
         return _get_pl_dataset_hash(dataset)
 
+    if dataset_type == "polars_lazy":
+        return _get_pl_lazy_dataset_hash(dataset)
+
     if dataset_type == "pandas":
         return _get_pd_dataset_hash(dataset)
 
@@ -194,5 +263,8 @@ def get_dataset_hash(dataset: Union[DataFrame, Connector, str]) -> str:
     if dataset_type == "connector":
         return hashlib.md5("_".join([dataset.url, dataset.view_sql, dataset_type]).encode()).hexdigest()
 
+    if dataset_type == "file":
+        return _get_file_dataset_hash(dataset)
+
     if dataset_type == "cloud_dataset":
         return hashlib.md5("_".join([dataset, dataset_type]).encode()).hexdigest()
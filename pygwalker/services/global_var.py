@@ -1,9 +1,15 @@
+from typing import Any, Dict, Optional, Union, TYPE_CHECKING
 import os
 
-from pandas import DataFrame
 from typing_extensions import Literal, deprecated
 
-from .config import get_config
+from .config import get_config, get_duckdb_settings_config
+from .query_cache import query_result_cache
+from .request_dispatcher import request_dispatcher
+from pygwalker.utils.duckdb_connection import check_duckdb_settings
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 
 class GlobalVarManager:
@@ -17,6 +23,9 @@ class GlobalVarManager:
     last_exported_dataframe = None
     max_data_length = 1000 * 1000
     component_url = ""
+    batch_query_max_workers: Optional[int] = None
+    duckdb_settings: Dict[str, Any] = get_duckdb_settings_config()
+    query_timeout: Optional[float] = None
     # Feature flags for AI features (disabled by default)
     enable_askviz = os.getenv("PYGWALKER_ENABLE_ASKVIZ", "false").lower() == "true"
     enable_vlchat = os.getenv("PYGWALKER_ENABLE_VLCHAT", "false").lower() == "true"
@@ -46,7 +55,7 @@ class GlobalVarManager:
         cls.privacy = privacy
 
     @classmethod
-    def set_last_exported_dataframe(cls, df: DataFrame):
+    def set_last_exported_dataframe(cls, df: "DataFrame"):
         cls.last_exported_dataframe = df
 
     @classmethod
@@ -57,3 +66,48 @@ class GlobalVarManager:
     @classmethod
     def set_component_url(cls, url: str):
         cls.component_url = url
+
+    @classmethod
+    def set_batch_query_max_workers(cls, max_workers: Optional[int]):
+        """Set max concurrent queries of a batch query, None means using the default of each data source."""
+        cls.batch_query_max_workers = max_workers
+
+    @classmethod
+    def set_query_cache_max_bytes(cls, max_bytes: int):
+        """Set bytes budget of the kernel query result cache, `0` disables it."""
+        query_result_cache.set_max_bytes(max_bytes)
+
+    @classmethod
+    def set_request_max_workers(cls, max_workers: int, max_concurrency_per_gid: int):
+        """Set worker pool size of http servers(streamlit, gradio, reflex) and max concurrent requests of one walker."""
+        request_dispatcher.configure(max_workers, max_concurrency_per_gid)
+
+    @classmethod
+    def set_query_timeout(cls, timeout: Optional[float]):
+        """Set seconds after which queries of a request are interrupted, unless the request sets its own timeout."""
+        cls.query_timeout = timeout
+
+    @classmethod
+    def set_duckdb_settings(
+        cls,
+        threads: Optional[int] = None,
+        memory_limit: Optional[str] = None,
+        temp_directory: Optional[str] = None,
+        preserve_insertion_order: Optional[Union[bool, str]] = None,
+    ):
+        """
+        Set duckdb resource settings of kernel computation, such as `memory_limit="2GB"`.
+        None keeps the current setting, loaded from `duckdb_*` configurations or duckdb default,
+        walkers created afterwards use them unless `duckdb_settings` is passed to walker.
+        """
+        cls.duckdb_settings = {
+            **cls.duckdb_settings,
+            **check_duckdb_settings(
+                {
+                    "threads": threads,
+                    "memory_limit": memory_limit,
+                    "temp_directory": temp_directory,
+                    "preserve_insertion_order": preserve_insertion_order,
+                }
+            ),
+        }
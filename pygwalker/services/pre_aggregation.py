@@ -0,0 +1,283 @@
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, TYPE_CHECKING
+import threading
+import logging
+
+from pygwalker.services.background_build import BackgroundBuild
+from pygwalker.utils.payload_to_sql import get_payload_sql_key, get_sql_from_payload, payload_sql_memo
+
+if TYPE_CHECKING:
+    import duckdb
+    from pygwalker.utils.duckdb_connection import DuckdbConnection
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_TABLE_PREFIX = "pygwalker_rollup_"
+ROLLUP_COUNT_COLUMN = "__pyg_count"
+# aggregates which can be computed again from the aggregates of a rollup
+ROLLUP_AGGREGATES = ("sum", "count", "min", "max")
+# graphic walker counts rows by summing a computed field `one`
+ROW_COUNT_TRANSFORM_OP = "one"
+
+
+def check_pre_aggregations(pre_aggregations: Any) -> List[Tuple[str, ...]]:
+    """check dimension sets of pre-aggregations, eg: [["city"], ["city", "weather"]]"""
+    if not isinstance(pre_aggregations, (list, tuple)):
+        raise ValueError("`pre_aggregations` must be a list of dimension lists, eg: [['city'], ['city', 'weather']].")
+    dimension_sets = []
+    for dimensions in pre_aggregations:
+        if isinstance(dimensions, str) or not all(isinstance(dimension, str) for dimension in dimensions):
+            raise ValueError(f"dimensions of pre-aggregation must be a list of field names, got {dimensions!r}.")
+        dimension_sets.append(tuple(dimensions))
+    return dimension_sets
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _measure_column(field: str, agg: str) -> str:
+    return f"{field}__pyg_{agg}"
+
+
+class _Rollup:
+    def __init__(
+        self,
+        table_name: str,
+        dimension_metas: List[Dict[str, str]],
+        measures: Sequence[str],
+        row_count: int,
+    ):
+        self.table_name = table_name
+        self.dimensions = {field_meta["key"] for field_meta in dimension_metas}
+        self.measures = set(measures)
+        self.row_count = row_count
+        self.field_metas = (
+            dimension_metas
+            + [{"key": ROLLUP_COUNT_COLUMN, "type": "number"}]
+            + [
+                {"key": _measure_column(measure, agg), "type": "number"}
+                for measure in measures
+                for agg in ROLLUP_AGGREGATES
+            ]
+        )
+
+
+class _AggregateQuery:
+    """an aggregate view of payload, the only shape of workflow a rollup can answer"""
+
+    def __init__(
+        self, workflow: List[Dict[str, Any]], view_index: int, aggregate: Dict[str, Any], row_count_fids: Set[str]
+    ):
+        self.workflow = workflow
+        self.view_index = view_index
+        self.aggregate = aggregate
+        self.row_count_fids = row_count_fids
+        self.filter_fids = {
+            item.get("fid") for step in workflow if step.get("type") == "filter" for item in step.get("filters", [])
+        }
+
+    @property
+    def dimensions(self) -> Set[str]:
+        return set(self.aggregate.get("groupBy", [])) | self.filter_fids
+
+    @property
+    def measures(self) -> Set[str]:
+        return {measure.get("field") for measure in self.aggregate.get("measures", [])} - self.row_count_fids
+
+
+def _get_aggregate_query(payload: Dict[str, Any]) -> Optional[_AggregateQuery]:
+    """filters, then one aggregate view, then sorts, transforms are limited to row count fields"""
+    workflow = payload.get("workflow") or []
+    view_index = None
+    aggregate = None
+    row_count_fids = set()
+    for index, step in enumerate(workflow):
+        step_type = step.get("type")
+        if step_type == "filter" and view_index is None:
+            continue
+        if step_type == "transform" and view_index is None:
+            for transform in step.get("transform", []):
+                if transform.get("expression", {}).get("op") != ROW_COUNT_TRANSFORM_OP:
+                    return None
+                row_count_fids.add(transform.get("key"))
+            continue
+        if step_type == "view" and view_index is None:
+            queries = step.get("query", [])
+            if len(queries) != 1 or queries[0].get("op") != "aggregate":
+                return None
+            view_index, aggregate = index, queries[0]
+            continue
+        if step_type == "sort" and view_index is not None:
+            continue
+        return None
+    if aggregate is None:
+        return None
+    return _AggregateQuery(workflow, view_index, aggregate, row_count_fids)
+
+
+class PreAggregationEngine:
+    """
+    Materialized rollups of a kernel table, for dashboards pivoting over a few low-cardinality dimensions.
+
+    Each rollup groups the table by a dimension set, and keeps sum/count/min/max of numeric fields.
+    Payloads which filter and group by these dimensions only, and aggregate with these functions,
+    are compiled against the smallest matching rollup instead of scanning the whole table.
+    """
+
+    def __init__(self, table_name: str, dimension_sets: List[Tuple[str, ...]]):
+        self.table_name = table_name
+        self.dimension_sets = dimension_sets
+        self._init_state()
+
+    def _init_state(self) -> None:
+        self._lock = threading.Lock()
+        self._background_build: BackgroundBuild[List[_Rollup]] = BackgroundBuild("pygwalker-pre-aggregation")
+        self.hits = 0
+        self.misses = 0
+
+    def check_dimensions(self, field_metas: List[Dict[str, str]]) -> None:
+        field_keys = {field_meta["key"] for field_meta in field_metas}
+        for dimensions in self.dimension_sets:
+            unknown_dimensions = [dimension for dimension in dimensions if dimension not in field_keys]
+            if unknown_dimensions:
+                raise ValueError(f"Unknown dimensions of pre-aggregation: {', '.join(unknown_dimensions)}.")
+
+    def start(
+        self, duckdb_conn: "DuckdbConnection", field_metas: List[Dict[str, str]], background: bool = True
+    ) -> None:
+        """build rollups, queries keep scanning the whole table until they are ready"""
+        self.check_dimensions(field_metas)
+        self._background_build.start(duckdb_conn, lambda cursor: self._build(cursor, field_metas), background)
+
+    def restart(self, duckdb_conn: "DuckdbConnection", field_metas: List[Dict[str, str]]) -> None:
+        """rebuild rollups after data of table changed, if they were built before"""
+        if self._background_build.started:
+            self.start(duckdb_conn, field_metas)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """wait until rollups are built, returns False on timeout"""
+        return self._background_build.wait(timeout)
+
+    def close(self) -> None:
+        """interrupt building rollups and stop answering from them, before their database is closed"""
+        self._background_build.close()
+
+    def _build(self, cursor: "duckdb.DuckDBPyConnection", field_metas: List[Dict[str, str]]) -> List[_Rollup]:
+        rollups = []
+        for index, dimensions in enumerate(self.dimension_sets):
+            if not self._background_build.is_current(cursor):
+                # superseded between two rollups, its result is dropped anyway
+                break
+            measures = [
+                field_meta["key"]
+                for field_meta in field_metas
+                if field_meta["type"] == "number" and field_meta["key"] not in dimensions
+            ]
+            table_name = f"{ROLLUP_TABLE_PREFIX}{index}"
+            select_exprs = [_quote(dimension) for dimension in dimensions]
+            select_exprs.append(f"COUNT(*) AS {_quote(ROLLUP_COUNT_COLUMN)}")
+            select_exprs.extend(
+                f"{agg.upper()}({_quote(measure)}) AS {_quote(_measure_column(measure, agg))}"
+                for measure in measures
+                for agg in ROLLUP_AGGREGATES
+            )
+            group_by = f" GROUP BY {', '.join(_quote(dimension) for dimension in dimensions)}" if dimensions else ""
+            try:
+                cursor.execute(
+                    f"CREATE OR REPLACE TABLE {_quote(table_name)} AS "
+                    f"SELECT {', '.join(select_exprs)} FROM {_quote(self.table_name)}{group_by}"
+                )
+                row_count = cursor.execute(f"SELECT COUNT(*) FROM {_quote(table_name)}").fetchone()[0]
+            except Exception as e:
+                if not self._background_build.is_current(cursor):
+                    raise
+                logger.warning("Failed to build pre-aggregation of %s: %s", list(dimensions), e)
+                continue
+            dimension_metas = [field_meta for field_meta in field_metas if field_meta["key"] in dimensions]
+            rollups.append(_Rollup(table_name, dimension_metas, measures, row_count))
+        return sorted(rollups, key=lambda rollup: rollup.row_count)
+
+    def get_sql(self, payload: Dict[str, Any]) -> Optional[str]:
+        """sql of payload against the smallest matching rollup, None if no rollup can answer it"""
+        rollups = self._background_build.result
+        if not rollups:
+            return None
+
+        query = _get_aggregate_query(payload)
+        rollup = None
+        if query is not None:
+            dimensions, measures = query.dimensions, query.measures
+            rollup = next(
+                (rollup for rollup in rollups if dimensions <= rollup.dimensions and measures <= rollup.measures),
+                None,
+            )
+        rewritten = None if rollup is None else self._rewrite_payload(payload, query, rollup)
+        with self._lock:
+            if rewritten is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if rewritten is None:
+            return None
+
+        rewritten_payload, count_measures = rewritten
+        field_meta = {rollup.table_name: rollup.field_metas}
+        return payload_sql_memo.get_or_compute(
+            ("rollup", get_payload_sql_key(rollup.table_name, rewritten_payload, field_meta)),
+            lambda: _cast_counts(
+                get_sql_from_payload(rollup.table_name, rewritten_payload, field_meta), count_measures
+            ),
+        )
+
+    def _rewrite_payload(
+        self, payload: Dict[str, Any], query: _AggregateQuery, rollup: _Rollup
+    ) -> Optional[Tuple[Dict[str, Any], List[Tuple[str, str]]]]:
+        """rewrite payload against rollup, also returns (column, alias) of counts"""
+        measures = []
+        count_measures = []
+        for measure in query.aggregate.get("measures", []):
+            field, agg, alias = measure.get("field"), measure.get("agg"), measure.get("asFieldKey")
+            if alias is None or agg not in ROLLUP_AGGREGATES:
+                return None
+            if field in query.row_count_fids:
+                if agg in ("min", "max"):
+                    return None
+                column, agg = ROLLUP_COUNT_COLUMN, "sum" if agg == "sum" else "count"
+            else:
+                column = _measure_column(field, agg)
+            if agg == "count":
+                count_measures.append((column, alias))
+            # sum of partial sums or counts, min of partial mins, max of partial maxs
+            measures.append({**measure, "field": column, "agg": "sum" if agg in ("sum", "count") else agg})
+
+        workflow = []
+        for index, step in enumerate(query.workflow):
+            if step.get("type") == "transform":
+                continue
+            if index == query.view_index:
+                step = {**step, "query": [{**query.aggregate, "measures": measures}]}
+            workflow.append(step)
+        return {**payload, "workflow": workflow}, count_measures
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "rollups": len(self._background_build.result or []),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"table_name": self.table_name, "dimension_sets": self.dimension_sets}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_state()
+
+
+def _cast_counts(sql: str, count_measures: List[Tuple[str, str]]) -> str:
+    """counts of rollup are sums of partial counts, cast them back to BIGINT like `count` of the whole table"""
+    for column, alias in count_measures:
+        aggregate_sql = f"sum({_quote(column)})"
+        sql = sql.replace(f"{aggregate_sql} AS {_quote(alias)}", f"CAST({aggregate_sql} AS BIGINT) AS {_quote(alias)}")
+    return sql
@@ -1,15 +1,14 @@
 from typing import List, Dict, Any
 from queue import Queue
 from threading import Thread
-import json
 import logging
 
 from pydantic import BaseModel, Field
 
-from pygwalker.utils.encode import DataFrameEncoder
+from pygwalker.utils.encode import json_dumps
 from pygwalker.utils.display import display_html
 from pygwalker.utils.randoms import generate_hash_code
-from pygwalker.services.render import jinja_env, GWALKER_SCRIPT_BASE64, compress_data
+from pygwalker.services.render import jinja_env, get_gwalker_script_base64, compress_data
 
 
 logger = logging.getLogger(__name__)
@@ -60,9 +59,9 @@ def render_gw_preview_html(
     html = template.render(
         gwalker={
             "id": container_id,
-            "gw_script": GWALKER_SCRIPT_BASE64,
+            "gw_script": get_gwalker_script_base64(),
             "component_script": "PyGWalkerApp.PreviewApp(props, gw_id);",
-            "props": compress_data(json.dumps(props, cls=DataFrameEncoder)),
+            "props": compress_data(json_dumps(props)),
         },
         component_url="",
     )
@@ -96,9 +95,9 @@ def render_gw_chart_preview_html(
     html = template.render(
         gwalker={
             "id": container_id,
-            "gw_script": GWALKER_SCRIPT_BASE64,
+            "gw_script": get_gwalker_script_base64(),
             "component_script": "PyGWalkerApp.ChartPreviewApp(props, gw_id);",
-            "props": compress_data(json.dumps(props, cls=DataFrameEncoder)),
+            "props": compress_data(json_dumps(props)),
         },
         component_url="",
     )
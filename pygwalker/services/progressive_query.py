@@ -0,0 +1,183 @@
+from typing import Any, Dict, List, Optional, Set, TYPE_CHECKING
+import threading
+import logging
+
+from pygwalker.services.background_build import BackgroundBuild
+from pygwalker.services.pre_aggregation import ROW_COUNT_TRANSFORM_OP
+from pygwalker.utils.payload_to_sql import get_payload_sql_key, get_sql_from_payload, payload_sql_memo
+
+if TYPE_CHECKING:
+    import duckdb
+    from pygwalker.utils.duckdb_connection import DuckdbConnection
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_TABLE_NAME = "pygwalker_sample_table"
+# tables smaller than it are scanned fast enough, they are never sampled
+PROGRESSIVE_MIN_ROWS = 1_000_000
+SAMPLE_ROWS = 100_000
+SAMPLE_SEED = 42
+# aggregates of the whole table estimated from the sample, sums and counts are scaled by table rows / sample rows
+SCALED_AGGREGATES = ("sum", "count")
+ESTIMATED_AGGREGATES = SCALED_AGGREGATES + ("mean", "median", "min", "max", "variance", "stdev")
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _get_estimated_measures(payload: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """measures of the aggregate view, None unless workflow ends with one aggregate view and sorts"""
+    workflow = payload.get("workflow") or []
+    view_index = next((index for index, step in enumerate(workflow) if step.get("type") == "view"), None)
+    if view_index is None:
+        return None
+    queries = workflow[view_index].get("query", [])
+    if len(queries) != 1 or queries[0].get("op") != "aggregate":
+        return None
+    if any(step.get("type") != "sort" for step in workflow[view_index + 1 :]):
+        return None
+    measures = queries[0].get("measures", [])
+    if any(measure.get("agg") not in ESTIMATED_AGGREGATES or measure.get("asFieldKey") is None for measure in measures):
+        return None
+    return measures
+
+
+def _get_row_count_fids(payload: Dict[str, Any]) -> Set[str]:
+    return {
+        transform.get("key")
+        for step in payload.get("workflow") or []
+        if step.get("type") == "transform"
+        for transform in step.get("transform", [])
+        if transform.get("expression", {}).get("op") == ROW_COUNT_TRANSFORM_OP
+    }
+
+
+def _scale_aggregates(
+    sql: str, measures: List[Dict[str, Any]], scale: float, row_count_fids: Set[str]
+) -> Optional[str]:
+    """scale sums and counts selected by sample sql, None if some of them are not selected as expected"""
+    # scaled counts are rounded back to integers, including row counts summed over `one` fields
+    scaled_aggs = {
+        measure["asFieldKey"]: measure["agg"] == "count" or measure.get("field") in row_count_fids
+        for measure in measures
+        if measure["agg"] in SCALED_AGGREGATES
+    }
+    if not scaled_aggs:
+        return sql
+
+    # sqlglot is imported on first approximate query, so `import pygwalker` doesn't pay for it
+    import sqlglot
+    import sqlglot.expressions as exp
+
+    select = sqlglot.parse_one(sql, read="duckdb")
+    if not isinstance(select, exp.Select):
+        return None
+    scaled_aliases = set()
+    for projection in select.expressions:
+        is_count = scaled_aggs.get(projection.alias) if isinstance(projection, exp.Alias) else None
+        if is_count is None:
+            continue
+        # graphic walker's row count is inlined as `sum(1)`, so aggregates are matched by alias rather than field
+        scaled = exp.Mul(this=projection.this, expression=exp.Literal.number(scale))
+        if is_count:
+            scaled = exp.cast(exp.func("round", scaled), "BIGINT")
+        projection.set("this", scaled)
+        scaled_aliases.add(projection.alias)
+    if scaled_aliases != set(scaled_aggs):
+        return None
+    return select.sql(dialect="duckdb")
+
+
+class ProgressiveQueryEngine:
+    """
+    A reservoir sample of a large kernel table, for a fast first answer of charts before their exact results.
+
+    Aggregate payloads are compiled against the sample, sums and counts are scaled up to the whole table,
+    other supported aggregates (mean, median, min, max, variance, stdev) are estimated as they are.
+    Tables with fewer than `min_rows` rows are not sampled, their payloads are always answered exactly.
+    """
+
+    def __init__(self, table_name: str, min_rows: int = PROGRESSIVE_MIN_ROWS, sample_rows: int = SAMPLE_ROWS):
+        self.table_name = table_name
+        self.min_rows = min_rows
+        self.sample_rows = sample_rows
+        self._init_state()
+
+    def _init_state(self) -> None:
+        self._lock = threading.Lock()
+        # table rows / sample rows, None if the table is not sampled
+        self._background_build: BackgroundBuild[float] = BackgroundBuild("pygwalker-progressive-sample")
+        self.approximated = 0
+        self.skipped = 0
+
+    def start(self, duckdb_conn: "DuckdbConnection", background: bool = True) -> None:
+        """build sample table, payloads are answered exactly only until it is ready"""
+        self._background_build.start(duckdb_conn, self._build, background)
+
+    def restart(self, duckdb_conn: "DuckdbConnection") -> None:
+        """sample the table again after its data changed, if it was sampled before"""
+        if self._background_build.started:
+            self.start(duckdb_conn)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """wait until sample table is built, returns False on timeout"""
+        return self._background_build.wait(timeout)
+
+    def close(self) -> None:
+        """interrupt sampling and stop answering from the sample, before its database is closed"""
+        self._background_build.close()
+
+    def _build(self, cursor: "duckdb.DuckDBPyConnection") -> Optional[float]:
+        row_count = cursor.execute(f"SELECT COUNT(*) FROM {_quote(self.table_name)}").fetchone()[0]
+        if row_count < self.min_rows:
+            return None
+        cursor.execute(
+            f"CREATE OR REPLACE TABLE {_quote(SAMPLE_TABLE_NAME)} AS SELECT * FROM {_quote(self.table_name)} "
+            f"USING SAMPLE reservoir({int(self.sample_rows)} ROWS) REPEATABLE ({SAMPLE_SEED})"
+        )
+        sample_count = cursor.execute(f"SELECT COUNT(*) FROM {_quote(SAMPLE_TABLE_NAME)}").fetchone()[0]
+        return row_count / sample_count
+
+    def get_sql(self, payload: Dict[str, Any], field_metas: List[Dict[str, str]]) -> Optional[str]:
+        """approximate sql of payload against the sample, None if payload should be answered exactly"""
+        scale = self._background_build.result
+        if scale is None:
+            return None
+
+        measures = _get_estimated_measures(payload)
+        sql = None
+        if measures is not None:
+            field_meta = {SAMPLE_TABLE_NAME: field_metas}
+            sql = payload_sql_memo.get_or_compute(
+                ("sample", scale, get_payload_sql_key(SAMPLE_TABLE_NAME, payload, field_meta)),
+                lambda: _scale_aggregates(
+                    get_sql_from_payload(SAMPLE_TABLE_NAME, payload, field_meta),
+                    measures,
+                    scale,
+                    _get_row_count_fids(payload),
+                ),
+            )
+        with self._lock:
+            if sql is None:
+                self.skipped += 1
+            else:
+                self.approximated += 1
+        return sql
+
+    def stats(self) -> Dict[str, Any]:
+        scale = self._background_build.result
+        with self._lock:
+            return {
+                "sampled": scale is not None,
+                "scale": scale,
+                "approximated": self.approximated,
+                "skipped": self.skipped,
+            }
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"table_name": self.table_name, "min_rows": self.min_rows, "sample_rows": self.sample_rows}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_state()
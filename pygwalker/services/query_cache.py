@@ -0,0 +1,190 @@
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, TypeVar
+from concurrent.futures import Future, wait
+import threading
+import logging
+
+from cachetools import TLRUCache
+
+from pygwalker.services.query_control import query_controller
+from pygwalker.utils.estimate_tools import estimate_average_data_size
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_QUERY_CACHE_MAX_BYTES = 256 << 20
+REMOTE_DATASET_CACHE_TTL = 300
+# callers waiting for a result computed by another caller check their request between waits
+INFLIGHT_WAIT_INTERVAL = 0.1
+
+
+class _CacheEntry:
+    __slots__ = ("value", "size", "ttl")
+
+    def __init__(self, value: Any, size: int, ttl: Optional[float]):
+        self.value = value
+        self.size = size
+        self.ttl = ttl
+
+
+def _entry_ttu(_: Hashable, entry: _CacheEntry, now: float) -> float:
+    return float("inf") if entry.ttl is None else now + entry.ttl
+
+
+def _copy_result(value: T) -> T:
+    """
+    Copy row lists, so callers adding or removing keys of rows don't change cached results.
+    Row values are shared, they are scalars. pyarrow tables are immutable, they are shared as they are.
+    """
+    if isinstance(value, list):
+        return [_copy_result(item) if isinstance(item, (list, dict)) else item for item in value]
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+def _wait_inflight(future: Future) -> None:
+    """wait for the caller computing a result, raise once the request of this caller is cancelled or timed out"""
+    query_request = query_controller.current_request()
+    if query_request is None:
+        wait([future])
+        return
+    while not future.done():
+        query_request.check()
+        wait([future], timeout=INFLIGHT_WAIT_INTERVAL)
+
+
+def get_rows_size(rows: List[Dict[str, Any]]) -> int:
+    """Estimate bytes size of query result rows"""
+    return int(estimate_average_data_size(rows) * len(rows)) + 64
+
+
+def get_batch_rows_size(batch_rows: List[List[Dict[str, Any]]]) -> int:
+    return sum(get_rows_size(rows) for rows in batch_rows)
+
+
+def get_arrow_table_size(table: Any) -> int:
+    return table.nbytes + 64
+
+
+class QueryResultCache:
+    """
+    Process-wide query result cache shared by all data parsers.
+
+    Keys are `(dataset_fingerprint, result_kind, query)`, entries are evicted in LRU order
+    once the estimated bytes size of all results exceeds `max_bytes`,
+    entries with ttl (remote datasets) expire after ttl seconds.
+
+    Callers get their own copy of row lists, see `_copy_result`.
+    Concurrent misses of a key are computed once, the other callers wait for its result
+    until their own request is cancelled or timed out.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_QUERY_CACHE_MAX_BYTES):
+        self._lock = threading.Lock()
+        self._max_bytes = max_bytes
+        self._cache = self._create_cache(max_bytes)
+        self._inflight: Dict[Tuple[Hashable, ...], Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _create_cache(max_bytes: int) -> TLRUCache:
+        return TLRUCache(maxsize=max(max_bytes, 1), ttu=_entry_ttu, getsizeof=lambda entry: entry.size)
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_bytes > 0
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        """Resize cache, `0` disables caching. Cached results are dropped."""
+        with self._lock:
+            self._max_bytes = max_bytes
+            self._cache = self._create_cache(max_bytes)
+
+    def get(self, key: Tuple[Hashable, ...]) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            return True, _copy_result(entry.value)
+
+    def put(self, key: Tuple[Hashable, ...], value: Any, size: int, ttl: Optional[float] = None) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            try:
+                self._cache[key] = _CacheEntry(value, size, ttl)
+            except ValueError:
+                logger.debug("query result is larger than query cache, skip caching it.")
+
+    def get_or_compute(
+        self,
+        key: Tuple[Hashable, ...],
+        compute: Callable[[], T],
+        size_of: Callable[[T], int],
+        ttl: Optional[float] = None,
+    ) -> T:
+        if not self.enabled:
+            return compute()
+        while True:
+            with self._lock:
+                entry = self._cache.get(key)
+                if entry is not None:
+                    self.hits += 1
+                    return _copy_result(entry.value)
+                future = self._inflight.get(key)
+                if future is None:
+                    self.misses += 1
+                    future = self._inflight[key] = Future()
+                    break
+            _wait_inflight(future)
+            try:
+                value = future.result()
+            except Exception:
+                # the computing caller failed, eg: its request was cancelled, compute it again
+                continue
+            with self._lock:
+                self.hits += 1
+            return _copy_result(value)
+
+        try:
+            value = compute()
+            self.put(key, value, size_of(value), ttl)
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self._inflight.pop(key, None)
+        future.set_result(value)
+        return _copy_result(value)
+
+    def invalidate(self, fingerprint: Optional[str] = None) -> None:
+        """Drop cached results of one dataset, or all results when fingerprint is None."""
+        with self._lock:
+            if fingerprint is None:
+                self._cache.clear()
+                return
+            for key in [key for key in self._cache.keys() if key[0] == fingerprint]:
+                self._cache.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._cache),
+                "current_bytes": int(self._cache.currsize),
+                "max_bytes": self.max_bytes,
+            }
+
+
+query_result_cache = QueryResultCache()
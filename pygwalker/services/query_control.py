@@ -0,0 +1,182 @@
+from typing import Callable, Dict, Iterator, List, Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+import threading
+import time
+
+from pygwalker.errors import QueryCancelledError, QueryTimeoutError
+
+Interrupt = Callable[[], None]
+
+# rids cancelled before their request starts, eg: requests waiting in the request dispatcher queue
+PENDING_CANCEL_MAX_SIZE = 1024
+
+
+class QueryRequest:
+    """
+    A running communication request, it can be cancelled by its rid or by its deadline.
+
+    Queries of the request register how to interrupt them while they run,
+    cancelling the request interrupts all of them and skips queries not started yet.
+    """
+
+    def __init__(self, rid: Optional[str], timeout: Optional[float]):
+        self.rid = rid
+        self.timeout = timeout
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+        self.cancel_reason: Optional[str] = None
+        self._lock = threading.Lock()
+        self._interrupts: List[Interrupt] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_reason is not None
+
+    def cancel(self, reason: str = "cancelled") -> bool:
+        """cancel the request, returns False if it is already cancelled"""
+        with self._lock:
+            if self.cancel_reason is not None:
+                return False
+            self.cancel_reason = reason
+            interrupts = list(self._interrupts)
+        for interrupt in interrupts:
+            try:
+                interrupt()
+            except Exception:
+                pass
+        return True
+
+    def check(self) -> None:
+        """raise if the request is cancelled or out of its deadline"""
+        if self.deadline is not None and self.cancel_reason is None and time.monotonic() >= self.deadline:
+            self.cancel("timeout")
+        if self.cancel_reason == "timeout":
+            raise QueryTimeoutError(f"Query timed out after {self.timeout} seconds.")
+        if self.cancel_reason is not None:
+            raise QueryCancelledError("Query was cancelled.")
+
+    def _add_interrupt(self, interrupt: Interrupt) -> None:
+        with self._lock:
+            self._interrupts.append(interrupt)
+
+    def _remove_interrupt(self, interrupt: Interrupt) -> None:
+        with self._lock:
+            self._interrupts.remove(interrupt)
+
+
+class QueryController:
+    """
+    Track requests running queries, so that the frontend can cancel them by rid
+    and queries running beyond the deadline of their request are interrupted.
+
+    Parsers wrap each query with `interruptible`, it is a no-op outside of a request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._requests: Dict[str, QueryRequest] = {}
+        self._pending_cancels: "OrderedDict[str, None]" = OrderedDict()
+        self._cancelled = 0
+        self._timed_out = 0
+
+    def current_request(self) -> Optional[QueryRequest]:
+        return getattr(self._local, "request", None)
+
+    @contextmanager
+    def bind(self, request: Optional[QueryRequest]) -> Iterator[Optional[QueryRequest]]:
+        """run the block as part of request, eg: queries of a batch running on other threads"""
+        previous = self.current_request()
+        self._local.request = request
+        try:
+            yield request
+        finally:
+            self._local.request = previous
+
+    @contextmanager
+    def request(self, rid: Optional[str], timeout: Optional[float] = None) -> Iterator[QueryRequest]:
+        """run the block as a cancellable request, `timeout` is in seconds, None means no deadline"""
+        query_request = QueryRequest(rid, timeout)
+        cancelled_before_start = False
+        if rid is not None:
+            with self._lock:
+                self._requests[rid] = query_request
+                cancelled_before_start = rid in self._pending_cancels
+                self._pending_cancels.pop(rid, None)
+        if cancelled_before_start:
+            self._count_cancelled(query_request.cancel())
+
+        timer = None
+        if timeout is not None:
+            timer = threading.Timer(timeout, self._expire, (query_request,))
+            timer.daemon = True
+            timer.start()
+
+        try:
+            with self.bind(query_request):
+                yield query_request
+        finally:
+            if timer is not None:
+                timer.cancel()
+            if rid is not None:
+                with self._lock:
+                    if self._requests.get(rid) is query_request:
+                        self._requests.pop(rid)
+
+    @contextmanager
+    def interruptible(self, interrupt: Interrupt) -> Iterator[None]:
+        """
+        Run a query which can be stopped by `interrupt` from another thread.
+        Errors raised by an interrupted query are converted to QueryCancelledError or QueryTimeoutError.
+        """
+        query_request = self.current_request()
+        if query_request is None:
+            yield
+            return
+
+        query_request.check()
+        query_request._add_interrupt(interrupt)
+        try:
+            yield
+        except Exception:
+            if query_request.cancelled:
+                query_request.check()
+            raise
+        finally:
+            query_request._remove_interrupt(interrupt)
+
+    def cancel(self, rid: str) -> bool:
+        """
+        Cancel the running request `rid`, returns False if it is not running.
+        A request not started yet is cancelled as soon as it starts.
+        """
+        with self._lock:
+            query_request = self._requests.get(rid)
+            if query_request is None:
+                self._pending_cancels[rid] = None
+                while len(self._pending_cancels) > PENDING_CANCEL_MAX_SIZE:
+                    self._pending_cancels.popitem(last=False)
+                return False
+        return self._count_cancelled(query_request.cancel())
+
+    def _count_cancelled(self, cancelled: bool) -> bool:
+        if cancelled:
+            with self._lock:
+                self._cancelled += 1
+        return cancelled
+
+    def _expire(self, query_request: QueryRequest) -> None:
+        if query_request.cancel("timeout"):
+            with self._lock:
+                self._timed_out += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "running": len(self._requests),
+                "cancelled": self._cancelled,
+                "timed_out": self._timed_out,
+            }
+
+
+query_controller = QueryController()
@@ -1,13 +1,19 @@
-import json
 import base64
+import hashlib
 import html as m_html
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
+import logging
+import os
 import zlib
 
+from appdirs import user_cache_dir
 from jinja2 import Environment, PackageLoader
 
+from pygwalker import __version__
+
 from pygwalker._typing import IAppearance
-from pygwalker.utils.encode import DataFrameEncoder
+from pygwalker.utils.encode import json_dumps
 from pygwalker.utils.estimate_tools import estimate_average_data_size
 from pygwalker.utils.frontend_assets import read_frontend_asset
 from pygwalker.services.global_var import GlobalVarManager
@@ -25,8 +31,55 @@ def compress_data(data: str) -> str:
     return base64.b64encode(compressed_data).decode()
 
 
-GWALKER_SCRIPT = read_frontend_asset("pygwalker-app.iife.js")
-GWALKER_SCRIPT_BASE64 = compress_data(GWALKER_SCRIPT)
+logger = logging.getLogger(__name__)
+
+GWALKER_SCRIPT_NAME = "pygwalker-app.iife.js"
+COMPRESSED_ASSET_CACHE_DIR = os.path.join(user_cache_dir("pygwalker"), "frontend")
+
+
+def _read_compressed_asset_cache(cache_path: str) -> Optional[str]:
+    try:
+        with open(cache_path, "r", encoding="ascii") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_compressed_asset_cache(cache_path: str, content: str) -> None:
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, "w", encoding="ascii") as f:
+            f.write(content)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.debug("failed to write compressed frontend asset cache: %s", e)
+
+
+@lru_cache(maxsize=None)
+def get_gwalker_script_base64() -> str:
+    """
+    Get the compressed and base64 encoded frontend bundle.
+    It is computed on first render and cached on disk, keyed by pygwalker version and asset hash.
+    """
+    script = read_frontend_asset(GWALKER_SCRIPT_NAME)
+    asset_hash = hashlib.sha256(script.encode()).hexdigest()[:16]
+    cache_path = os.path.join(COMPRESSED_ASSET_CACHE_DIR, f"{GWALKER_SCRIPT_NAME}-{__version__}-{asset_hash}.b64")
+
+    script_base64 = _read_compressed_asset_cache(cache_path)
+    if script_base64:
+        return script_base64
+
+    script_base64 = compress_data(script)
+    _write_compressed_asset_cache(cache_path, script_base64)
+    return script_base64
+
+
+def __getattr__(name: str) -> Any:
+    # keep `GWALKER_SCRIPT_BASE64` importable without compressing the bundle at import time
+    if name == "GWALKER_SCRIPT_BASE64":
+        return get_gwalker_script_base64()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_max_limited_datas(datas: List[Dict[str, Any]], byte_limit: int) -> List[Dict[str, Any]]:
@@ -70,9 +123,9 @@ def render_gwalker_html(gid: int, props: Dict[str, Any]) -> str:
     html = template.render(
         gwalker={
             "id": container_id,
-            "gw_script": GWALKER_SCRIPT_BASE64,
+            "gw_script": get_gwalker_script_base64(),
             "component_script": "PyGWalkerApp.GWalker(props, gw_id);",
-            "props": compress_data(json.dumps(props, cls=DataFrameEncoder)),
+            "props": compress_data(json_dumps(props)),
         },
         component_url=GlobalVarManager.component_url,
     )
@@ -0,0 +1,131 @@
+from typing import Any, Dict, Optional, Tuple
+from concurrent.futures import Future
+import threading
+import json
+
+from pygwalker.services.query_control import query_controller
+
+# actions whose newer request of the same charts supersedes the older one
+SUPERSEDABLE_ACTIONS = {"batch_get_datas_by_payload"}
+# workflow steps changing while the user drags a slider or edits a filter, other steps identify the chart
+FILTER_STEP_TYPES = {"filter"}
+
+RequestKey = Tuple[str, str, str]
+TagKey = Tuple[str, str, str]
+
+
+def _dumps_key(data: Any) -> str:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _get_request_key(gid: str, action: str, data: Dict[str, Any]) -> Optional[RequestKey]:
+    try:
+        return gid, action, _dumps_key(data)
+    except (TypeError, ValueError):
+        return None
+
+
+def _get_chart_tag(payload: Any) -> Optional[str]:
+    """explicit tag of payload, or its workflow without filter steps"""
+    if not isinstance(payload, dict):
+        return None
+    tag = payload.get("tag")
+    if isinstance(tag, str) and tag:
+        return tag
+    workflow = payload.get("workflow")
+    if not isinstance(workflow, list):
+        return None
+    return _dumps_key(
+        [step for step in workflow if not isinstance(step, dict) or step.get("type") not in FILTER_STEP_TYPES]
+    )
+
+
+def _get_tag_key(gid: str, action: str, data: Dict[str, Any]) -> Optional[TagKey]:
+    if action not in SUPERSEDABLE_ACTIONS:
+        return None
+    query_list = data.get("queryList")
+    if not isinstance(query_list, list) or not query_list:
+        return None
+    try:
+        tags = [_get_chart_tag(payload) for payload in query_list]
+    except (TypeError, ValueError):
+        return None
+    if any(tag is None for tag in tags):
+        return None
+    # the frontend batches queries of charts computed together, only a batch of the same charts supersedes it
+    return gid, action, _dumps_key(sorted(tags))
+
+
+class _InflightRequest:
+    def __init__(self, request_key: RequestKey, tag_key: Optional[TagKey], rid: Optional[str]):
+        self.request_key = request_key
+        self.tag_key = tag_key
+        self.rid = rid
+        self.future: Future = Future()
+
+
+class RequestCoalescer:
+    """
+    Coalesce blocking communication requests of a walker.
+
+    - identical requests in flight share one execution, later ones just wait for its response.
+    - a newer batch payload request of the same charts cancels the older one, only the last result matters
+      when the user is dragging a slider or editing a filter.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight_map: Dict[RequestKey, _InflightRequest] = {}
+        self._tag_map: Dict[TagKey, _InflightRequest] = {}
+        self._coalesced = 0
+        self._superseded = 0
+
+    def acquire(self, gid: str, action: str, data: Dict[str, Any], rid: Optional[str]) -> Tuple[Future, bool]:
+        """
+        Returns the future of the response shared by identical requests, and whether the caller owns it.
+        The owner must run the request and resolve the future, the others only wait for it.
+        """
+        request_key = _get_request_key(gid, action, data)
+        if request_key is None:
+            return Future(), True
+        tag_key = _get_tag_key(gid, action, data)
+
+        superseded = None
+        with self._lock:
+            inflight = self._inflight_map.get(request_key)
+            if inflight is not None:
+                self._coalesced += 1
+                return inflight.future, False
+
+            inflight = _InflightRequest(request_key, tag_key, rid)
+            self._inflight_map[request_key] = inflight
+            if tag_key is not None:
+                superseded = self._tag_map.get(tag_key)
+                self._tag_map[tag_key] = inflight
+                if superseded is not None:
+                    # new identical requests must not join a cancelled execution
+                    self._inflight_map.pop(superseded.request_key, None)
+                    self._superseded += 1
+
+        if superseded is not None and superseded.rid is not None:
+            query_controller.cancel(superseded.rid)
+        inflight.future.add_done_callback(lambda _: self._release(inflight))
+        return inflight.future, True
+
+    def _release(self, inflight: _InflightRequest) -> None:
+        with self._lock:
+            if self._inflight_map.get(inflight.request_key) is inflight:
+                self._inflight_map.pop(inflight.request_key)
+            if inflight.tag_key is not None and self._tag_map.get(inflight.tag_key) is inflight:
+                self._tag_map.pop(inflight.tag_key)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "inflight": len(self._inflight_map),
+                "coalesced": self._coalesced,
+                "superseded": self._superseded,
+            }
+
+
+request_coalescer = RequestCoalescer()
@@ -0,0 +1,101 @@
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import defaultdict, deque
+import threading
+
+DEFAULT_REQUEST_MAX_WORKERS = 8
+DEFAULT_REQUEST_MAX_CONCURRENCY_PER_GID = 2
+
+
+class RequestDispatcher:
+    """
+    Run blocking communication requests on a bounded worker pool.
+
+    At most `max_concurrency_per_gid` requests of one walker run at the same time,
+    the others wait in a per-gid queue, so one busy dashboard can't occupy every worker.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_REQUEST_MAX_WORKERS,
+        max_concurrency_per_gid: int = DEFAULT_REQUEST_MAX_CONCURRENCY_PER_GID,
+    ):
+        self._lock = threading.Lock()
+        self._max_workers = max_workers
+        self._max_concurrency_per_gid = max_concurrency_per_gid
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._active_map: Dict[str, int] = defaultdict(int)
+        self._pending_map: Dict[str, Deque[Tuple[Future, Callable[[], Any]]]] = defaultdict(deque)
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._max_queue_depth = 0
+
+    def configure(self, max_workers: int, max_concurrency_per_gid: int) -> None:
+        """Resize the worker pool, running requests are not interrupted."""
+        with self._lock:
+            self._max_workers = max_workers
+            self._max_concurrency_per_gid = max_concurrency_per_gid
+            old_executor, self._executor = self._executor, None
+        if old_executor is not None:
+            old_executor.shutdown(wait=False)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max(self._max_workers, 1),
+                thread_name_prefix="pygwalker-request",
+            )
+        return self._executor
+
+    def submit(self, gid: str, func: Callable[..., Any], *args: Any) -> Future:
+        """Queue func(*args) for the walker `gid`, returns a concurrent.futures.Future of its result."""
+        future = Future()
+        with self._lock:
+            self._queued += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queued)
+            self._pending_map[gid].append((future, lambda: func(*args)))
+            self._schedule(gid)
+        return future
+
+    def _schedule(self, gid: str) -> None:
+        pending = self._pending_map[gid]
+        while pending and self._active_map[gid] < max(self._max_concurrency_per_gid, 1):
+            future, call = pending.popleft()
+            self._active_map[gid] += 1
+            self._get_executor().submit(self._run, gid, future, call)
+        if not pending:
+            self._pending_map.pop(gid, None)
+
+    def _run(self, gid: str, future: Future, call: Callable[[], Any]) -> None:
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        try:
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(call())
+                except BaseException as e:
+                    future.set_exception(e)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._active_map[gid] -= 1
+                if self._active_map[gid] <= 0:
+                    self._active_map.pop(gid, None)
+                self._schedule(gid)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "max_workers": self._max_workers,
+                "max_concurrency_per_gid": self._max_concurrency_per_gid,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "max_queue_depth": self._max_queue_depth,
+            }
+
+
+request_dispatcher = RequestDispatcher()
@@ -0,0 +1,66 @@
+from typing import Callable, Dict, Hashable, Tuple, Union
+import threading
+import time
+
+from cachetools import LRUCache
+
+DEFAULT_SQL_MEMO_MAX_ENTRIES = 4096
+
+
+class SqlMemo:
+    """
+    Process-wide bounded memo of sql generated by pure python work, eg: sqlglot transpilation.
+
+    The same queries are generated again and again while the user explores a chart,
+    entries are evicted in LRU order once there are more than `max_entries` of them.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_SQL_MEMO_MAX_ENTRIES):
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._cache = LRUCache(maxsize=max(max_entries, 1))
+        self.hits = 0
+        self.misses = 0
+        # seconds spent generating sql of misses
+        self.compute_seconds = 0.0
+
+    def get_or_compute(self, key: Tuple[Hashable, ...], compute: Callable[[], str]) -> str:
+        with self._lock:
+            sql = self._cache.get(key)
+            if sql is not None:
+                self.hits += 1
+                return sql
+            self.misses += 1
+        start = time.perf_counter()
+        sql = compute()
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.compute_seconds += elapsed
+            self._cache[key] = sql
+        return sql
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._cache),
+                "max_entries": self._max_entries,
+                "compute_seconds": self.compute_seconds,
+            }
+
+
+sql_transpile_memo = SqlMemo()
+
+
+def transpile_sql(sql: str, read: str, write: str) -> str:
+    """transpile one sql statement from `read` dialect to `write` dialect, memoized"""
+    import sqlglot
+
+    return sql_transpile_memo.get_or_compute(
+        ("transpile", read, write, sql), lambda: sqlglot.transpile(sql, read=read, write=write)[0]
+    )
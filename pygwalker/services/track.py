@@ -1,4 +1,8 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+import atexit
+import logging
+import queue
+import threading
 
 from pygwalker.services.global_var import GlobalVarManager
 from pygwalker.services.config import get_local_user_id, should_show_privacy_notice
@@ -6,9 +10,16 @@ from pygwalker.services.config import get_local_user_id, should_show_privacy_not
 SEGMENT_WRITE_KEY = "z58N15R8LShkpUbBSt1ZjdDSdSEF5VpR"
 KANARIES_PUBLIC_KEY = "tk-6572d7b34a03d7fcf6cf0c86-cOzZyr6xqd"
 
+TELEMETRY_QUEUE_MAX_SIZE = 1000
+# events taken from the queue per wake-up of the worker thread
+TELEMETRY_DRAIN_SIZE = 50
+TELEMETRY_EXIT_FLUSH_TIMEOUT = 1.0
+
 _analytics_client = None
 _kanaries_track_client = None
 
+logger = logging.getLogger(__name__)
+
 PRIVACY_NOTICE = (
     "PyGWalker telemetry is enabled. It only sends feature-usage events, not your analyzed data. "
     "To opt out, run `pygwalker config --set privacy=update-only` or `pygwalker config --set privacy=offline`."
@@ -21,7 +32,8 @@ def _get_analytics_client():
         import segment.analytics as analytics
 
         analytics.write_key = SEGMENT_WRITE_KEY
-        analytics.sync_mode = True
+        # its consumer thread uploads queued events in batches
+        analytics.sync_mode = False
         analytics.timeout = 1
         analytics.max_retries = 0
         _analytics_client = analytics
@@ -35,18 +47,127 @@ def _get_kanaries_track_client():
 
         kanaries_track.config.auth_token = KANARIES_PUBLIC_KEY
         kanaries_track.config.proxies = {}
-        kanaries_track.config.sync_send = True
+        # its consumer thread uploads queued events in batches
+        kanaries_track.config.sync_send = False
         kanaries_track.config.timeout = 1
         kanaries_track.config.max_retries = 1
-        kanaries_track.config.thread = 0
+        kanaries_track.config.thread = 1
         _kanaries_track_client = kanaries_track
     return _kanaries_track_client
 
 
 # pylint: disable=broad-exception-caught
+def _send_events(events: List[Tuple[str, Dict[str, Any]]]) -> int:
+    """Hand events to both clients, which upload them in batches, return count of events accepted by them."""
+    sent = 0
+    user_id = get_local_user_id()
+    analytics_client = _get_analytics_client()
+    kanaries_track_client = _get_kanaries_track_client()
+    for event, properties in events:
+        try:
+            accepted, _ = analytics_client.track(user_id=user_id, event=event, properties=properties)
+            kanaries_track_client.track({**properties, "user_id": user_id})
+            if accepted:
+                sent += 1
+        except Exception as e:
+            logger.debug("failed to send telemetry event %s: %s", event, e)
+    return sent
+
+
+class TelemetryDispatcher:
+    """
+    Process-wide background sender of telemetry events.
+
+    Events are put into a bounded queue and handed to the clients by one daemon thread, which drains up to
+    `drain_size` queued events per wake-up, so rendering never waits on importing clients or the network.
+    Consumer threads of the clients upload the events in batches.
+    Events are dropped when the queue is full.
+    """
+
+    def __init__(self, max_queue_size: int = TELEMETRY_QUEUE_MAX_SIZE, drain_size: int = TELEMETRY_DRAIN_SIZE):
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._drain_size = drain_size
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._exit_hook_registered = False
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def put(self, event: str, properties: Dict[str, Any]) -> bool:
+        """Queue an event, return False when it is dropped."""
+        try:
+            self._queue.put_nowait((event, properties))
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        self._ensure_worker()
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until queued events are handed to clients, return False on timeout."""
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(lambda: self._queue.unfinished_tasks == 0, timeout)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"queued": self._queue.qsize(), "sent": self.sent, "failed": self.failed, "dropped": self.dropped}
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="pygwalker-telemetry", daemon=True)
+            self._thread.start()
+
+    def _register_exit_hook(self) -> None:
+        # clients stop their consumer threads at exit, exit hooks run in reverse order,
+        # so queued events are handed to clients before their consumers upload the last batch
+        try:
+            _get_analytics_client()
+            _get_kanaries_track_client()
+        except Exception as e:
+            logger.debug("failed to create telemetry clients: %s", e)
+        with self._lock:
+            if not self._exit_hook_registered:
+                atexit.register(self.flush, TELEMETRY_EXIT_FLUSH_TIMEOUT)
+                self._exit_hook_registered = True
+
+    def _drain(self) -> List[Tuple[str, Dict[str, Any]]]:
+        events = [self._queue.get()]
+        while len(events) < self._drain_size:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def _run(self) -> None:
+        self._register_exit_hook()
+        while True:
+            events = self._drain()
+            sent = 0
+            try:
+                sent = _send_events(events)
+            except Exception as e:
+                logger.debug("failed to send telemetry events: %s", e)
+            finally:
+                with self._lock:
+                    self.sent += sent
+                    self.failed += len(events) - sent
+                for _ in events:
+                    self._queue.task_done()
+
+
+telemetry_dispatcher = TelemetryDispatcher()
+
+
 def track_event(event: str, properties: Optional[Dict[str, Any]] = None):
     """
-    Track an event in Segment and Kanaries.
+    Track an event in Segment and Kanaries, events are sent in background by `telemetry_dispatcher`.
     When privacy config of user is 'events',
     PyGWalker will collect certain events data share which events about which feature is used in pygwalker, it only contains events tag about which feature you arrive for product optimization. No DATA YOU ANALYZE IS SENT.
     We only use these data to improve the user experience of pygwalker. Events data will bind with a unique id, which is generated by pygwalker when it is installed based on timestamp. We will not collect any other information about you.
@@ -64,8 +185,6 @@ def track_event(event: str, properties: Optional[Dict[str, Any]] = None):
         try:
             if should_show_privacy_notice():
                 print(PRIVACY_NOTICE, flush=True)
-            properties = properties or {}
-            _get_analytics_client().track(user_id=get_local_user_id(), event=event, properties=properties)
-            _get_kanaries_track_client().track({**properties, "user_id": get_local_user_id()})
+            telemetry_dispatcher.put(event, properties or {})
         except Exception:
             pass
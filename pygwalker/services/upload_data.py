@@ -1,11 +1,10 @@
 from typing import Dict, Any, List
 import time
-import json
 import html as m_html
 
 from pygwalker.utils.randoms import rand_str
 from pygwalker.utils.display import display_html
-from pygwalker.utils.encode import DataFrameEncoder
+from pygwalker.utils.encode import json_dumps
 from pygwalker.communications.base import BaseCommunication
 from pygwalker import __hash__
 
@@ -17,7 +16,7 @@ def _send_js(js_code: str, slot_id: str):
 
 
 def _send_upload_data_msg(gid: int, msg: Dict[str, Any], slot_id: str):
-    msg = json.dumps(msg, cls=DataFrameEncoder)
+    msg = json_dumps(msg)
     js_code = f"document.getElementById('gwalker-{gid}')?.contentWindow?.postMessage({msg}, '*');"
     _send_js(js_code, slot_id)
 
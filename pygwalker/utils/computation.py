@@ -1,15 +1,21 @@
+import os
+import sys
 import warnings
 from typing import Optional, Tuple
 
 from pygwalker._typing import IComputation
-from pygwalker.data_parsers.database_parser import Connector
 from pygwalker.utils import fallback_value
 
 LEGACY_COMPUTATION_REMOVAL_VERSION = "0.7.0"
 
 
 def _is_connector_dataset(dataset) -> bool:
-    return isinstance(dataset, (Connector, str))
+    # strings are cloud dataset ids or file paths, path-like objects are file datasets
+    if isinstance(dataset, (str, os.PathLike)):
+        return True
+    # a Connector only exists after its module is imported, so sqlalchemy is not imported for other datasets
+    database_parser = sys.modules.get("pygwalker.data_parsers.database_parser")
+    return database_parser is not None and isinstance(dataset, database_parser.Connector)
 
 
 def _warn_legacy_computation_param(name: str, replacement: str) -> None:
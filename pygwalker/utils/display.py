@@ -1,12 +1,14 @@
-from typing import Union
+from typing import Union, TYPE_CHECKING
 
-from IPython.display import display, HTML
-import ipywidgets
+if TYPE_CHECKING:
+    from IPython.display import HTML
+    import ipywidgets
 
 DISPLAY_HANDLER = {}
 
 
-def display_html(html: Union[str, HTML, ipywidgets.Widget], *, slot_id: str = None):
+# pylint: disable=import-outside-toplevel
+def display_html(html: Union[str, "HTML", "ipywidgets.Widget"], *, slot_id: str = None):
     """Judge the presentation method to be used based on the context
 
     Args:
@@ -15,6 +17,8 @@ def display_html(html: Union[str, HTML, ipywidgets.Widget], *, slot_id: str = No
         *
         - slot_id(str): display with given id.
     """
+    from IPython.display import display, HTML
+
     if isinstance(html, str):
         widget = HTML(html)
     else:
@@ -0,0 +1,130 @@
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+import threading
+import weakref
+
+if TYPE_CHECKING:
+    import duckdb
+
+
+DEFAULT_DUCKDB_SETTINGS = {"TimeZone": "UTC"}
+# resource settings users can configure for kernel computation
+DUCKDB_SETTING_KEYS = ("threads", "memory_limit", "temp_directory", "preserve_insertion_order")
+
+
+def check_duckdb_settings(settings: Dict[str, Any]) -> Dict[str, Any]:
+    """check keys of duckdb settings, settings whose value is None are dropped to keep duckdb default"""
+    unknown_keys = set(settings) - set(DUCKDB_SETTING_KEYS)
+    if unknown_keys:
+        raise ValueError(
+            f"Unsupported duckdb settings: {', '.join(sorted(unknown_keys))}. "
+            f"Supported settings: {', '.join(DUCKDB_SETTING_KEYS)}."
+        )
+    return {key: value for key, value in settings.items() if value is not None}
+
+
+def _close_connection(conn_holder: List[Optional["duckdb.DuckDBPyConnection"]]) -> None:
+    conn = conn_holder[0]
+    conn_holder[0] = None
+    if conn is not None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+def fetch_rows(result: "duckdb.DuckDBPyConnection") -> List[Dict[str, Any]]:
+    """fetch the pending result of a duckdb cursor as row dicts"""
+    columns = [column_desc[0] for column_desc in result.description]
+    return [dict(zip(columns, row)) for row in result.fetchall()]
+
+
+def fetch_arrow_table(result: "duckdb.DuckDBPyConnection") -> Any:
+    """fetch the pending result of a duckdb cursor as a pyarrow.Table"""
+    to_arrow_table = getattr(result, "to_arrow_table", None)
+    if to_arrow_table is not None:
+        return to_arrow_table()
+    return result.fetch_arrow_table()
+
+
+class DuckdbConnection:
+    """
+    A dedicated in-memory duckdb database owned by one data parser.
+
+    Tables are registered once per thread cursor, session settings are applied and views
+    (name -> select sql) are created once when the database is created,
+    so parsers never share the process-wide default connection.
+    """
+
+    def __init__(
+        self,
+        tables: Dict[str, Any],
+        settings: Optional[Dict[str, Any]] = None,
+        views: Optional[Dict[str, str]] = None,
+    ):
+        self._tables = tables
+        self._settings = {**DEFAULT_DUCKDB_SETTINGS, **(settings or {})}
+        self._views = views or {}
+        self._init_state()
+
+    def _init_state(self) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._conn_holder = [None]
+        self._generation = 0
+        self._finalizer = weakref.finalize(self, _close_connection, self._conn_holder)
+
+    def _connect(self) -> "duckdb.DuckDBPyConnection":
+        # duckdb is imported on first query, so `import pygwalker` doesn't pay for it
+        try:
+            import duckdb
+        except ModuleNotFoundError as exc:
+            from pygwalker.utils.dependencies import raise_missing_duckdb
+
+            raise_missing_duckdb(exc)
+
+        conn = duckdb.connect()
+        for key, value in self._settings.items():
+            value = str(value).replace("'", "''")
+            try:
+                conn.execute(f"SET GLOBAL {key} = '{value}'")
+            except Exception:
+                # default settings are best effort, but an invalid user setting must not be ignored silently
+                if key not in DEFAULT_DUCKDB_SETTINGS:
+                    conn.close()
+                    raise
+        for name, sql in self._views.items():
+            conn.execute(f'CREATE VIEW "{name}" AS {sql}')
+        return conn
+
+    def cursor(self) -> "duckdb.DuckDBPyConnection":
+        """get the cursor of current thread, tables are registered on first use"""
+        cached = getattr(self._local, "cursor", None)
+        if cached is not None and cached[0] == self._generation:
+            return cached[1]
+
+        with self._lock:
+            if self._conn_holder[0] is None:
+                self._conn_holder[0] = self._connect()
+            cursor = self._conn_holder[0].cursor()
+            generation = self._generation
+
+        for name, table in self._tables.items():
+            cursor.register(name, table)
+        self._local.cursor = (generation, cursor)
+        return cursor
+
+    def execute(self, sql: str) -> "duckdb.DuckDBPyConnection":
+        return self.cursor().execute(sql)
+
+    def close(self) -> None:
+        """close the database and all thread cursors, it will be reopened on next query"""
+        with self._lock:
+            self._generation += 1
+            _close_connection(self._conn_holder)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"_tables": self._tables, "_settings": self._settings, "_views": self._views}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_state()
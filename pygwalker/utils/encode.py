@@ -1,27 +1,202 @@
-import json
-from datetime import datetime
+from typing import Any, Dict, List
+from datetime import datetime, timezone
 from decimal import Decimal
+import base64
+import json
+import math
+import os
+
+import numpy as np
+
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
 
-import pytz
+def _encode_special_value(o: Any) -> Any:
+    """Convert values json can't serialize natively, raise TypeError for unknown values."""
+    if isinstance(o, datetime):
+        if o.tzinfo is None:
+            o = o.replace(tzinfo=timezone.utc)
+        return int(o.timestamp() * 1000)
+    if isinstance(o, Decimal):
+        if o.is_nan():
+            return None
+        return float(o)
+    if isinstance(o, (bytes, bytearray, memoryview)):
+        return base64.b64encode(o).decode()
+    if isinstance(o, np.datetime64):
+        if np.isnat(o):
+            return None
+        return int(o.astype("datetime64[ms]").astype(np.int64))
+    if isinstance(o, (np.generic, np.ndarray)):
+        return o.tolist()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def _encode_default(o: Any) -> Any:
+    try:
+        return _encode_special_value(o)
+    except TypeError:
+        pass
+    try:
+        return str(o)
+    except TypeError:
+        return None
 
 
 class DataFrameEncoder(json.JSONEncoder):
     """JSON encoder for DataFrame"""
 
     def default(self, o):
-        if isinstance(o, datetime):
-            if o.tzinfo is None:
-                o = pytz.utc.localize(o)
-            return int(o.timestamp() * 1000)
-        if isinstance(o, Decimal):
-            if o.is_nan():
-                return None
-            return float(o)
+        return _encode_default(o)
+
+
+def _replace_non_finite(o: Any) -> Any:
+    """Replace NaN/Infinity floats with None, as orjson serializes them to null."""
+    if isinstance(o, float):
+        return o if math.isfinite(o) else None
+    if isinstance(o, dict):
+        return {key: _replace_non_finite(value) for key, value in o.items()}
+    if isinstance(o, (list, tuple)):
+        return [_replace_non_finite(value) for value in o]
+    return o
+
 
+class _FiniteDataFrameEncoder(DataFrameEncoder):
+    def default(self, o):
+        # eg: numpy arrays containing NaN
+        return _replace_non_finite(super().default(o))
+
+
+def _stdlib_dumps_bytes(obj: Any) -> bytes:
+    try:
+        result = json.dumps(obj, cls=DataFrameEncoder, ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+    except ValueError:
+        # NaN/Infinity are not valid json, write them as null like orjson does
+        result = json.dumps(
+            _replace_non_finite(obj),
+            cls=_FiniteDataFrameEncoder,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            allow_nan=False,
+        )
+    return result.encode("utf-8")
+
+
+if orjson is not None and os.getenv("PYGWALKER_JSON_BACKEND", "orjson") == "orjson":
+    JSON_BACKEND = "orjson"
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def json_dumps_bytes(obj: Any) -> bytes:
+        """Serialize obj with DataFrameEncoder semantics to utf-8 json bytes."""
         try:
-            return json.JSONEncoder.default(self, o)
-        except Exception:
-            try:
-                return str(o)
-            except TypeError:
-                return None
+            return orjson.dumps(obj, default=_encode_default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # eg: integers out of 64-bit range
+            return _stdlib_dumps_bytes(obj)
+
+else:
+    JSON_BACKEND = "json"
+
+    def json_dumps_bytes(obj: Any) -> bytes:
+        """Serialize obj with DataFrameEncoder semantics to utf-8 json bytes."""
+        return _stdlib_dumps_bytes(obj)
+
+
+def json_dumps(obj: Any) -> str:
+    """Serialize obj with DataFrameEncoder semantics to json str, using the fastest available backend."""
+    return json_dumps_bytes(obj).decode("utf-8")
+
+
+# string columns whose distinct values are at most this ratio of rows are dictionary encoded
+DICTIONARY_ENCODE_MAX_RATIO = 0.5
+
+
+def _is_string_type(data_type: Any) -> bool:
+    import pyarrow as pa
+
+    return pa.types.is_string(data_type) or pa.types.is_large_string(data_type)
+
+
+def _arrow_array_to_list(array: Any) -> List[Any]:
+    import pyarrow as pa
+
+    data_type = array.type
+    if array.null_count == 0 and (
+        pa.types.is_integer(data_type) or pa.types.is_floating(data_type) or pa.types.is_boolean(data_type)
+    ):
+        return array.to_numpy(zero_copy_only=False).tolist()
+    return array.to_pylist()
+
+
+def arrow_to_columnar_datas(table: Any) -> Dict[str, Any]:
+    """
+    Convert a pyarrow.Table to columnar wire format(`ColumnarDatas`) without materializing row dicts,
+    low-cardinality string columns are dictionary encoded.
+    """
+    values = []
+    dictionaries = []
+    for column in table.columns:
+        column = column.combine_chunks() if column.num_chunks != 1 else column.chunk(0)
+        if _is_string_type(column.type) and len(column) > 1:
+            encoded = column.dictionary_encode()
+            if len(encoded.dictionary) <= len(column) * DICTIONARY_ENCODE_MAX_RATIO:
+                values.append(_arrow_array_to_list(encoded.indices))
+                dictionaries.append(encoded.dictionary.to_pylist())
+                continue
+        values.append(_arrow_array_to_list(column))
+        dictionaries.append(None)
+
+    return {
+        "columns": table.column_names,
+        "values": values,
+        "dictionaries": dictionaries,
+        "rowCount": table.num_rows,
+    }
+
+
+def rows_to_columnar_datas(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Convert row dicts to columnar wire format(`ColumnarDatas`), for parsers without arrow results."""
+    columns = list(rows[0].keys()) if rows else []
+    values = []
+    dictionaries = []
+    for column in columns:
+        column_values = [row.get(column) for row in rows]
+        if len(rows) > 1 and all(value is None or isinstance(value, str) for value in column_values):
+            dictionary = {}
+            indexes = [
+                None if value is None else dictionary.setdefault(value, len(dictionary)) for value in column_values
+            ]
+            if len(dictionary) <= len(rows) * DICTIONARY_ENCODE_MAX_RATIO:
+                values.append(indexes)
+                dictionaries.append(list(dictionary))
+                continue
+        values.append(column_values)
+        dictionaries.append(None)
+
+    return {
+        "columns": columns,
+        "values": values,
+        "dictionaries": dictionaries,
+        "rowCount": len(rows),
+    }
+
+
+def to_arrow_ipc_bytes(table: Any) -> bytes:
+    """
+    Serialize a pyarrow.Table to arrow IPC stream bytes.
+    Decimal columns, eg: duckdb sums of integers, are cast to float64 as json encodes them,
+    the frontend arrow decoder can't read decimals as numbers.
+    """
+    import pyarrow as pa
+
+    decimal_indexes = [index for index, field in enumerate(table.schema) if pa.types.is_decimal(field.type)]
+    for index in decimal_indexes:
+        table = table.set_column(index, table.field(index).name, table.column(index).cast(pa.float64()))
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
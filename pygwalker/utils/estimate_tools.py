@@ -9,6 +9,7 @@ def estimate_average_data_size(datas: List[Dict[str, Any]]) -> int:
     if not datas:
         return 0
 
+    # measured as stdlib json text, `JUPYTER_BYTE_LIMIT` and the data limits of render are tuned against it
     smp0 = datas[:: max(len(datas) // 32, 1)]
     smp1 = datas[:: max(len(datas) // 37, 1)]
     avg_size = len(json.dumps(smp0, cls=DataFrameEncoder)) / len(smp0)
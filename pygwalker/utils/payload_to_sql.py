@@ -1,13 +1,39 @@
-from typing import Dict, List, Any
+from typing import Any, Callable, Dict, List, Optional
+import hashlib
+import json
+
+from pygwalker.services.sql_memo import SqlMemo
+
+PayloadCompiler = Callable[[str, Dict[str, Any], Optional[Dict[str, List[Dict[str, str]]]]], str]
+
+# importing gw_dsl_parser compiles its wasm module and takes seconds, so it is resolved on first compilation only
+_payload_compiler: Optional[PayloadCompiler] = None
+
+# the frontend requests the same workflows again and again, eg: re-rendering a dashboard
+payload_sql_memo = SqlMemo()
+
+
+def _get_payload_compiler() -> PayloadCompiler:
+    global _payload_compiler
+    if _payload_compiler is None:
+        try:
+            from gw_dsl_parser import get_sql_from_payload as compiler
+        except ImportError as exc:
+            raise ImportError(
+                "gw_dsl_parser is not installed, please install it first. conda users please use `pip` to install it."
+            ) from exc
+        _payload_compiler = compiler
+    return _payload_compiler
+
+
+def get_payload_sql_key(table_name: str, payload: Dict[str, Any], field_meta: Any) -> str:
+    """canonical hash of a compilation, the key order of payload and field metas doesn't matter"""
+    content = json.dumps([table_name, payload, field_meta], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(content.encode()).hexdigest()
 
 
 def get_sql_from_payload(table_name: str, payload: Dict[str, Any], field_meta: List[Dict[str, str]] = None) -> str:
-    try:
-        from gw_dsl_parser import get_sql_from_payload as __get_sql_from_payload
-    except ImportError as exc:
-        raise ImportError(
-            "gw_dsl_parser is not installed, please install it first. conda users please use `pip` to install it."
-        ) from exc
-
-    sql = __get_sql_from_payload(table_name, payload, field_meta)
-    return sql
+    return payload_sql_memo.get_or_compute(
+        ("payload", get_payload_sql_key(table_name, payload, field_meta)),
+        lambda: _get_payload_compiler()(table_name, payload, field_meta),
+    )
@@ -0,0 +1,91 @@
+"""Benchmark Connector queries against a local SQLite or DuckDB SQLAlchemy engine."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, Callable
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from pygwalker.data_parsers.database_parser import Connector
+
+
+def create_test_engine(engine_name: str, directory: str, rows: int) -> Engine:
+    if engine_name == "sqlite":
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'benchmark.db')}")
+        sql = (
+            "CREATE TABLE datas AS WITH RECURSIVE seq(id) AS (SELECT 0 UNION ALL SELECT id + 1 FROM seq "
+            f"WHERE id < {rows - 1}) SELECT id, 'city-' || (id % 100) AS city, id / 100.0 AS price, "
+            "id * 0.5 AS score FROM seq"
+        )
+    else:
+        engine = create_engine(f"duckdb:///{os.path.join(directory, 'benchmark.duckdb')}")
+        sql = (
+            "CREATE TABLE datas AS SELECT range AS id, 'city-' || (range % 100) AS city, "
+            f"(range / 100)::DECIMAL(18, 2) AS price, range * 0.5 AS score FROM range({rows})"
+        )
+    with engine.begin() as connection:
+        connection.execute(text(sql))
+    return engine
+
+
+def legacy_query_datas(engine: Engine, sql: str) -> list[dict[str, Any]]:
+    """the former implementation, a connection per query and a dict per mapping row"""
+    with engine.connect() as connection:
+        return [dict(item.items()) for item in connection.execute(text(sql)).mappings()]
+
+
+def measure(func: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def batch_queries(connector: Connector, sql_list: list[str]) -> None:
+    with connector.batch_connections() as connections:
+        for sql in sql_list:
+            connector.query_datas(sql, connections)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--engine", choices=["sqlite", "duckdb"], default="duckdb")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_test_engine(args.engine, directory, args.rows)
+        connector = Connector.from_sqlalchemy_engine(engine, "SELECT * FROM datas")
+        sql = "SELECT * FROM datas"
+        sql_list = [
+            f"SELECT city, SUM(price) AS price FROM datas WHERE id % {index + 2} = 0 GROUP BY city"
+            for index in range(args.batch_size)
+        ]
+        cases = {
+            "full scan: legacy mappings": lambda: legacy_query_datas(engine, sql),
+            "full scan: query_datas (streamed)": lambda: connector.query_datas(sql),
+            "full scan: query_arrow (record batches)": lambda: connector.query_arrow(sql),
+            f"{args.batch_size} queries: connection per query": lambda: [
+                connector.query_datas(sql) for sql in sql_list
+            ],
+            f"{args.batch_size} queries: batch connections": lambda: batch_queries(connector, sql_list),
+        }
+
+        print(f"{args.engine}, {args.rows} rows, median of {args.repeat} runs")
+        for name, func in cases.items():
+            print(f"{name:<44} {measure(func, args.repeat):>9.1f} ms")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark field type inference (`raw_fields`) of dataframe parsers on wide frames."""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from pygwalker.data_parsers.pandas_parser import PandasDataFrameDataParser
+
+
+def build_dataframe(rows: int, columns: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2024-01-01", periods=rows, freq="min")
+    builders: list[Callable[[], Any]] = [
+        lambda: rng.integers(0, 1_000_000, rows),
+        lambda: rng.random(rows),
+        lambda: rng.integers(0, 10, rows),
+        lambda: rng.choice(["a", "b", "c", None], rows),
+        lambda: dates.strftime("%Y-%m-%d %H:%M:%S").to_numpy(dtype=object),
+        lambda: dates,
+    ]
+    return pd.DataFrame({f"col_{index}": builders[index % len(builders)]() for index in range(columns)})
+
+
+def measure(df: pd.DataFrame, infer_string_to_date: bool, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        parser = PandasDataFrameDataParser(df, [], infer_string_to_date, True, {})
+        start = time.perf_counter()
+        parser.raw_fields  # noqa: B018
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--columns", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    df = build_dataframe(args.rows, args.columns)
+    for infer_string_to_date in (False, True):
+        elapsed = measure(df, infer_string_to_date, args.repeat)
+        print(
+            f"raw_fields {args.rows} rows x {args.columns} columns, infer_string_to_date={infer_string_to_date}: {elapsed:.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark encoding a comm query response for http transports (streamlit, gradio, reflex)."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable
+
+from starlette.responses import JSONResponse
+
+from pygwalker.communications.http_response import encode_http_response, to_starlette_response
+from pygwalker.utils.encode import DataFrameEncoder
+
+
+def build_response(rows: int) -> dict[str, Any]:
+    start = datetime(2024, 1, 1)
+    datas = [
+        {
+            "id": index,
+            "city": f"city-{index % 100}",
+            "price": Decimal(index) / 100,
+            "score": index * 0.5,
+            "created_at": start + timedelta(minutes=index),
+        }
+        for index in range(rows)
+    ]
+    return {"code": 0, "data": {"datas": datas}, "message": "success"}
+
+
+def legacy_response(result: dict[str, Any]) -> JSONResponse:
+    return JSONResponse(json.loads(json.dumps(result, cls=DataFrameEncoder)))
+
+
+def pre_encoded_response(result: dict[str, Any], accept_encoding: str = "") -> Any:
+    return to_starlette_response(encode_http_response(result, accept_encoding))
+
+
+def measure(func: Callable[[], Any], repeat: int) -> tuple[float, int]:
+    timings = []
+    body_size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = func()
+        timings.append(time.perf_counter() - start)
+        body_size = len(response.body)
+    return statistics.median(timings) * 1000, body_size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    result = build_response(args.rows)
+    cases = {
+        "json.dumps + json.loads + JSONResponse": lambda: legacy_response(result),
+        "pre-encoded Response": lambda: pre_encoded_response(result),
+        "pre-encoded Response (gzip)": lambda: pre_encoded_response(result, "gzip"),
+    }
+
+    print(f"{args.rows} rows, median of {args.repeat} runs")
+    baseline = None
+    for name, func in cases.items():
+        elapsed, body_size = measure(func, args.repeat)
+        baseline = baseline or elapsed
+        print(f"{name:<42} {elapsed:>9.1f} ms  {body_size / 1024:>9.0f} KiB  {baseline / elapsed:>5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Benchmark `import pygwalker` wall time in fresh interpreters, optionally failing above a budget."""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+IMPORT_CODE = "import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+
+
+def measure_import_time(module: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_CODE.format(module=module)],
+        cwd=REPO_ROOT,
+        check=True,
+        text=True,
+        capture_output=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="pygwalker")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=None, help="exit with 1 when the median exceeds it")
+    args = parser.parse_args()
+
+    # the first run warms up the bytecode cache
+    measure_import_time(args.module)
+    timings = [measure_import_time(args.module) for _ in range(args.repeat)]
+    median = statistics.median(timings)
+    print(f"import {args.module}: median {median * 1000:.0f} ms, min {min(timings) * 1000:.0f} ms ({args.repeat} runs)")
+
+    if args.max_seconds is not None and median > args.max_seconds:
+        print(f"import time exceeds budget of {args.max_seconds * 1000:.0f} ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
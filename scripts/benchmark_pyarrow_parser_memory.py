@@ -0,0 +1,88 @@
+"""Benchmark peak RSS of parsing a pyarrow.Table natively versus converting it to pandas first."""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CHILD_CODE = """
+import resource
+import sys
+
+import pyarrow.parquet as pq
+
+from pygwalker.data_parsers.pandas_parser import PandasDataFrameDataParser
+from pygwalker.data_parsers.pyarrow_parser import PyArrowTableDataParser
+
+mode, path = sys.argv[1], sys.argv[2]
+table = pq.read_table(path)
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+if mode == "to_pandas":
+    parser = PandasDataFrameDataParser(table.to_pandas(), [], False, True, {})
+else:
+    parser = PyArrowTableDataParser(table, [], False, True, {})
+parser.raw_fields
+parser.field_metas
+parser.to_records(300)
+parser.get_datas_by_sql("SELECT city, COUNT(1) AS total FROM pygwalker_mid_table GROUP BY city")
+
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(before, after)
+"""
+
+
+def build_table(rows: int) -> pa.Table:
+    rng = np.random.default_rng(0)
+    cities = np.array([f"city-{index}" for index in range(1000)], dtype=object)
+    return pa.table(
+        {
+            "city": cities[rng.integers(0, len(cities), rows)],
+            "name": [f"user-{index}" for index in range(rows)],
+            "price": rng.random(rows),
+            "count": rng.integers(0, 1000, rows),
+        }
+    )
+
+
+def measure_peak_rss(mode: str, path: str) -> tuple[int, int]:
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD_CODE, mode, path],
+        cwd=REPO_ROOT,
+        env={**os.environ, "PYTHONPATH": str(REPO_ROOT)},
+        check=True,
+        text=True,
+        capture_output=True,
+    )
+    before, after = result.stdout.strip().splitlines()[-1].split()
+    return int(before), int(after)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "table.parquet")
+        pq.write_table(build_table(args.rows), path)
+        for mode in ("to_pandas", "arrow"):
+            before, after = measure_peak_rss(mode, path)
+            print(
+                f"{mode:>9}: peak RSS {after / 1024:.0f} MiB, "
+                f"+{(after - before) / 1024:.0f} MiB over the loaded table ({args.rows} rows)"
+            )
+
+
+if __name__ == "__main__":
+    main()
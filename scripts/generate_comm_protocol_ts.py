@@ -6,6 +6,7 @@ from types import UnionType
 from typing import Any, Dict, List, Type, Union, get_args, get_origin
 
 from pydantic import BaseModel
+from typing_extensions import Literal
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
@@ -24,6 +25,7 @@ MODEL_TS_NAMES = {
     protocol.PayloadQueryRequest: "ICommPayloadQueryRequest",
     protocol.BatchSqlQueryRequest: "ICommBatchQueryRequest",
     protocol.BatchPayloadQueryRequest: "ICommBatchQueryRequest",
+    protocol.CancelRequestRequest: "ICommCancelRequestRequest",
     protocol.UploadSpecToCloudRequest: "ICommUploadSpecToCloudRequest",
     protocol.ChartImageRequest: "ICommChartImageRequest",
     protocol.SaveChartRequest: "ICommSaveChartRequest",
@@ -35,8 +37,11 @@ MODEL_TS_NAMES = {
     protocol.UploadCloudDashboardRequest: "ICommUploadCloudDashboardRequest",
     protocol.EmptyResponse: "ICommEmptyResponse",
     protocol.LatestVisSpecResponse: "ICommLatestVisSpecResponse",
+    protocol.ColumnarDatas: "ICommColumnarDatas",
     protocol.DataRowsResponse: "ICommDataRowsResponse",
     protocol.BatchDataRowsResponse: "ICommBatchDataRowsResponse",
+    protocol.ProgressiveDatasMessage: "ICommProgressiveDatasMessage",
+    protocol.CancelRequestResponse: "ICommCancelRequestResponse",
     protocol.UploadSpecToCloudResponse: "ICommUploadSpecToCloudResponse",
     protocol.CloudCallbackResponse: "ICommCloudCallbackResponse",
     protocol.UploadCloudChartResponse: "ICommUploadCloudChartResponse",
@@ -46,8 +51,10 @@ MODEL_TS_NAMES = {
 FIELD_TYPE_OVERRIDES = {
     (protocol.PayloadQueryRequest, "payload"): "IDataQueryPayload",
     (protocol.BatchPayloadQueryRequest, "query_list"): "IDataQueryPayload[]",
-    (protocol.DataRowsResponse, "datas"): "IRow[]",
-    (protocol.BatchDataRowsResponse, "datas"): "IRow[][]",
+    (protocol.ColumnarDatas, "dictionaries"): "(any[] | null)[]",
+    (protocol.DataRowsResponse, "datas"): "IRow[] | ICommColumnarDatas",
+    (protocol.BatchDataRowsResponse, "datas"): "IRow[][] | ICommColumnarDatas[]",
+    (protocol.ProgressiveDatasMessage, "datas"): "IRow[][] | ICommColumnarDatas[]",
     (protocol.AskSpecRequest, "metas"): "IViewField[]",
     (protocol.ChatChartRequest, "metas"): "IViewField[]",
     (protocol.ChatChartRequest, "chats"): "IChatMessage[]",
@@ -57,6 +64,7 @@ MODEL_ORDER = [
     protocol.SqlQueryRequest,
     protocol.PayloadQueryRequest,
     protocol.BatchSqlQueryRequest,
+    protocol.CancelRequestRequest,
     protocol.UploadSpecToCloudRequest,
     protocol.ChartImageRequest,
     protocol.SaveChartRequest,
@@ -71,8 +79,11 @@ MODEL_ORDER = [
     protocol.EmptyRequest,
     protocol.EmptyResponse,
     protocol.LatestVisSpecResponse,
+    protocol.ColumnarDatas,
     protocol.DataRowsResponse,
     protocol.BatchDataRowsResponse,
+    protocol.ProgressiveDatasMessage,
+    protocol.CancelRequestResponse,
     protocol.UploadSpecToCloudResponse,
     protocol.CloudCallbackResponse,
     protocol.UploadCloudChartResponse,
@@ -120,6 +131,8 @@ def _ts_type(annotation: Any) -> str:
 
     if annotation is Any:
         return "any"
+    if origin is Literal:
+        return " | ".join(f'"{arg}"' for arg in args)
     if annotation is str:
         return "string"
     if annotation is int or annotation is float:
@@ -146,7 +159,13 @@ def _render_interface(model_cls: Type[BaseModel]) -> str:
     if model_cls is protocol.EmptyResponse:
         return "export interface ICommEmptyResponse {}\n"
     if model_cls is protocol.BatchSqlQueryRequest:
-        return "export interface ICommBatchQueryRequest<TQuery> {\n    queryList: TQuery[];\n}\n"
+        result_format_type = _ts_type(_field_annotation(_fields(model_cls)["result_format"]))
+        return (
+            "export interface ICommBatchQueryRequest<TQuery> {\n"
+            "    queryList: TQuery[];\n"
+            f"    resultFormat?: {result_format_type};\n"
+            "}\n"
+        )
     if model_cls is protocol.BatchPayloadQueryRequest:
         return ""
     if model_cls is protocol.CommResponse:
@@ -158,6 +177,7 @@ def _render_interface(model_cls: Type[BaseModel]) -> str:
             "    data: TData;\n"
             "    rid?: string;\n"
             "    gid?: string | number;\n"
+            "    timeout?: number;\n"
             "}\n"
         )
 
@@ -0,0 +1,51 @@
+import subprocess
+import sys
+import time
+
+from pygwalker.services.background_build import BackgroundBuild
+from pygwalker.utils.duckdb_connection import DuckdbConnection
+
+SLOW_SQL = "SELECT COUNT(*) FROM range(100000000000)"
+
+
+def _slow_build(cursor):
+    return cursor.execute(SLOW_SQL).fetchone()[0]
+
+
+def test_close_interrupts_running_build():
+    background_build = BackgroundBuild("test-build")
+    background_build.start(DuckdbConnection({}), _slow_build)
+    time.sleep(0.2)
+
+    start = time.monotonic()
+    background_build.close(timeout=5)
+
+    assert time.monotonic() - start < 5
+    assert not any(thread.is_alive() for thread in background_build._threads)
+    assert background_build.result is None
+    assert not background_build.wait(0)
+
+
+def test_newer_build_supersedes_running_build():
+    duckdb_conn = DuckdbConnection({})
+    background_build = BackgroundBuild("test-build")
+    background_build.start(duckdb_conn, _slow_build)
+    time.sleep(0.2)
+
+    background_build.start(duckdb_conn, lambda cursor: cursor.execute("SELECT 42").fetchone()[0])
+
+    assert background_build.wait(5)
+    assert background_build.result == 42
+    assert background_build.started
+
+
+def test_interpreter_exits_while_building_in_background():
+    code = f"""
+from pygwalker.services.background_build import BackgroundBuild
+from pygwalker.utils.duckdb_connection import DuckdbConnection
+
+BackgroundBuild("test-build").start(DuckdbConnection({{}}), lambda cursor: cursor.execute({SLOW_SQL!r}).fetchall())
+"""
+    result = subprocess.run([sys.executable, "-c", code], check=False, capture_output=True, text=True, timeout=30)
+
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,68 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+from pygwalker.data_parsers.database_parser import Connector
+from pygwalker.errors import BatchQueryError
+from pygwalker.services.batch_query import execute_batch
+from pygwalker.services.data_parsers import get_parser
+from pygwalker.services.global_var import GlobalVarManager
+
+
+def test_execute_batch_keeps_order_and_limits_concurrency():
+    lock = threading.Lock()
+    running = [0]
+    max_running = [0]
+
+    def query(value):
+        with lock:
+            running[0] += 1
+            max_running[0] = max(max_running[0], running[0])
+        time.sleep(0.02 * (5 - value % 5))
+        with lock:
+            running[0] -= 1
+        return value * 2
+
+    assert execute_batch(query, list(range(10)), max_workers=3) == [value * 2 for value in range(10)]
+    assert 1 < max_running[0] <= 3
+
+
+def test_execute_batch_reports_errors_of_each_failed_query():
+    def query(value):
+        if value % 2:
+            raise ValueError(f"bad {value}")
+        return value
+
+    for max_workers in (1, 4):
+        with pytest.raises(BatchQueryError) as exc_info:
+            execute_batch(query, [0, 1, 2, 3], max_workers=max_workers)
+        assert sorted(exc_info.value.errors) == [1, 3]
+        assert "query 1: bad 1" in str(exc_info.value)
+
+
+def test_dataframe_parser_batch_query_runs_in_parallel():
+    parser = get_parser(pd.DataFrame({"a": [1, 2, 3]}))
+    sql_list = [f"SELECT SUM(a) + {index} AS total FROM pygwalker_mid_table" for index in range(8)]
+
+    assert parser.batch_get_datas_by_sql(sql_list) == [[{"total": 6 + index}] for index in range(8)]
+
+
+def test_batch_query_max_workers_respects_connection_pool(tmp_path):
+    memory_connector = Connector("duckdb:///:memory:", "SELECT 1 AS a")
+    file_connector = Connector.from_sqlalchemy_engine(
+        create_engine(f"sqlite:///{tmp_path / 'batch.db'}", pool_size=2),
+        "SELECT 1 AS a",
+    )
+
+    assert get_parser(memory_connector).batch_query_max_workers == 1
+    assert get_parser(file_connector).batch_query_max_workers == 2
+
+    GlobalVarManager.set_batch_query_max_workers(8)
+    try:
+        assert get_parser(file_connector).batch_query_max_workers == 2
+        assert get_parser(pd.DataFrame({"a": [1]})).batch_query_max_workers == 8
+    finally:
+        GlobalVarManager.set_batch_query_max_workers(None)
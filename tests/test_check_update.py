@@ -1,3 +1,7 @@
+import json
+import time
+
+from pygwalker import __version__
 from pygwalker.services import check_update
 from pygwalker.services.global_var import GlobalVarManager
 
@@ -8,7 +12,7 @@ def test_check_update_starts_daemon_thread(monkeypatch):
     GlobalVarManager.privacy = "events"
 
     class FakeThread:
-        def __init__(self, *, target, daemon):
+        def __init__(self, *, target, name, daemon):
             self.target = target
             self.daemon = daemon
 
@@ -16,6 +20,7 @@ def test_check_update_starts_daemon_thread(monkeypatch):
             started_threads.append(self)
 
     monkeypatch.setattr(check_update, "Thread", FakeThread)
+    monkeypatch.setattr(check_update, "_update_checked", False)
 
     try:
         check_update.check_update()
@@ -23,7 +28,7 @@ def test_check_update_starts_daemon_thread(monkeypatch):
         GlobalVarManager.privacy = previous_privacy
 
     assert len(started_threads) == 1
-    assert started_threads[0].target is check_update._check_update
+    assert started_threads[0].target is check_update._check_update_with_cache
     assert started_threads[0].daemon is True
 
 
@@ -33,7 +38,7 @@ def test_check_update_starts_thread_in_update_only_mode(monkeypatch):
     GlobalVarManager.privacy = "update-only"
 
     class FakeThread:
-        def __init__(self, *, target, daemon):
+        def __init__(self, *, target, name, daemon):
             self.target = target
             self.daemon = daemon
 
@@ -41,6 +46,7 @@ def test_check_update_starts_thread_in_update_only_mode(monkeypatch):
             started_threads.append(self)
 
     monkeypatch.setattr(check_update, "Thread", FakeThread)
+    monkeypatch.setattr(check_update, "_update_checked", False)
 
     try:
         check_update.check_update()
@@ -48,7 +54,7 @@ def test_check_update_starts_thread_in_update_only_mode(monkeypatch):
         GlobalVarManager.privacy = previous_privacy
 
     assert len(started_threads) == 1
-    assert started_threads[0].target is check_update._check_update
+    assert started_threads[0].target is check_update._check_update_with_cache
     assert started_threads[0].daemon is True
 
 
@@ -65,6 +71,7 @@ def test_check_update_does_not_start_thread_in_offline_mode(monkeypatch):
             started_threads.append(self)
 
     monkeypatch.setattr(check_update, "Thread", FakeThread)
+    monkeypatch.setattr(check_update, "_update_checked", False)
 
     try:
         check_update.check_update()
@@ -81,3 +88,56 @@ def test_check_update_suppresses_background_request_errors(monkeypatch):
     monkeypatch.setattr(check_update, "_request_on_python", fail_request)
 
     assert check_update._check_update() == {}
+
+
+def test_check_update_starts_thread_once_per_process(monkeypatch):
+    started_threads = []
+    previous_privacy = GlobalVarManager.privacy
+    GlobalVarManager.privacy = "update-only"
+
+    class FakeThread:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def start(self):
+            started_threads.append(self)
+
+    monkeypatch.setattr(check_update, "Thread", FakeThread)
+    monkeypatch.setattr(check_update, "_update_checked", False)
+
+    try:
+        for _ in range(3):
+            check_update.check_update()
+    finally:
+        GlobalVarManager.privacy = previous_privacy
+
+    assert len(started_threads) == 1
+
+
+def test_check_update_skips_request_when_disk_cache_is_fresh(monkeypatch, tmp_path):
+    cache_path = tmp_path / "update_check.json"
+    calls = []
+    monkeypatch.setattr(check_update, "UPDATE_CHECK_CACHE_PATH", str(cache_path))
+    monkeypatch.setattr(check_update, "_check_update", lambda: calls.append(True) or {"ok": True})
+
+    check_update._check_update_with_cache()
+    check_update._check_update_with_cache()
+
+    assert calls == [True]
+    assert json.loads(cache_path.read_text())["version"] == __version__
+
+    expired_at = time.time() - check_update.UPDATE_CHECK_TTL
+    cache_path.write_text(json.dumps({"version": __version__, "checked_at": expired_at}))
+    check_update._check_update_with_cache()
+
+    assert calls == [True, True]
+
+
+def test_check_update_does_not_cache_failed_request(monkeypatch, tmp_path):
+    cache_path = tmp_path / "update_check.json"
+    monkeypatch.setattr(check_update, "UPDATE_CHECK_CACHE_PATH", str(cache_path))
+    monkeypatch.setattr(check_update, "_check_update", lambda: {})
+
+    check_update._check_update_with_cache()
+
+    assert not cache_path.exists()
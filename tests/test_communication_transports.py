@@ -1,19 +1,26 @@
 import asyncio
+import gzip
 import json
 
+import pyarrow as pa
+
 from pygwalker.communications import gradio_comm
 from pygwalker.communications.anywidget_comm import AnywidgetCommunication
 from pygwalker.communications.base import BaseCommunication
 from pygwalker.communications.hacker_comm import HackerCommunication
+from pygwalker.communications.http_response import encode_http_response
 from pygwalker.errors import ErrorCode
+from pygwalker.utils.encode import to_arrow_ipc_bytes
 
 
 class _FakeWidget:
     def __init__(self):
         self.sent = []
+        self.sent_buffers = []
 
-    def send(self, message):
+    def send(self, message, buffers=None):
         self.sent.append(message)
+        self.sent_buffers.append(buffers)
 
 
 def _decode_widget_response(widget):
@@ -35,6 +42,60 @@ def test_anywidget_transport_returns_protocol_error_for_missing_action():
     assert "action" in message["data"]["message"]
 
 
+def test_anywidget_transport_sends_arrow_results_as_buffers():
+    table = pa.table({"city": ["London", "Tokyo"], "value": [1, 2]})
+    ipc_bytes = to_arrow_ipc_bytes(table)
+    comm = AnywidgetCommunication("widget-gid")
+    widget = _FakeWidget()
+    comm.widget = widget
+    comm.register("batch_get_datas_by_payload", lambda _: {"datas": [ipc_bytes, ipc_bytes]})
+
+    comm._on_mesage(
+        None,
+        {"type": "pyg_request", "msg": {"rid": "request-1", "action": "batch_get_datas_by_payload", "data": {}}},
+        [],
+    )
+
+    message = _decode_widget_response(widget)
+    assert message["data"]["data"]["datas"] == [{"__pyg_buffer__": 0}, {"__pyg_buffer__": 1}]
+    assert len(widget.sent_buffers[0]) == 2
+    assert pa.ipc.open_stream(widget.sent_buffers[0][1]).read_all().equals(table)
+
+
+def test_anywidget_transport_pushes_arrow_datas_as_buffers():
+    table = pa.table({"city": ["London"], "value": [1]})
+    comm = AnywidgetCommunication("widget-gid")
+    widget = _FakeWidget()
+    comm.widget = widget
+
+    comm.send_msg_async(
+        "update_datas_by_payload",
+        {"progressiveId": "progressive-1", "indexes": [1], "datas": [to_arrow_ipc_bytes(table)]},
+    )
+
+    message = _decode_widget_response(widget)
+    assert message["data"] == {
+        "progressiveId": "progressive-1",
+        "indexes": [1],
+        "datas": [{"__pyg_buffer__": 0}],
+    }
+    assert pa.ipc.open_stream(widget.sent_buffers[0][0]).read_all().equals(table)
+
+
+def test_anywidget_transport_keeps_row_results_in_json():
+    comm = AnywidgetCommunication("widget-gid")
+    widget = _FakeWidget()
+    comm.widget = widget
+    comm.register("get_datas_by_payload", lambda _: {"datas": [{"city": "London"}]})
+
+    comm._on_mesage(
+        None, {"type": "pyg_request", "msg": {"rid": "request-1", "action": "get_datas_by_payload", "data": {}}}, []
+    )
+
+    assert _decode_widget_response(widget)["data"]["data"]["datas"] == [{"city": "London"}]
+    assert widget.sent_buffers == [None]
+
+
 def test_hacker_transport_returns_protocol_error_for_missing_action():
     comm = HackerCommunication.__new__(HackerCommunication)
     BaseCommunication.__init__(comm, "hacker-gid")
@@ -59,8 +120,9 @@ def test_hacker_transport_returns_protocol_error_for_missing_action():
 
 
 class _FakeRequest:
-    def __init__(self, gid, payload):
+    def __init__(self, gid, payload, headers=None):
         self.path_params = {"gid": gid}
+        self.headers = headers or {}
         self._payload = payload
 
     async def json(self):
@@ -91,6 +153,30 @@ def test_gradio_router_preserves_successful_envelope_routing():
     assert json.loads(response.body) == {"code": 0, "data": {}, "message": "success"}
 
 
+def test_gradio_router_sends_pre_encoded_and_compressed_response():
+    rows = [{"city": f"city-{index}", "count": index} for index in range(2000)]
+    comm = gradio_comm.GradioCommunication("gradio-gid")
+    comm.register("get_datas", lambda _: {"datas": rows}, blocking=True)
+    request = _FakeRequest("gradio-gid", {"action": "get_datas", "data": {}}, {"accept-encoding": "gzip, br"})
+    try:
+        response = asyncio.run(gradio_comm._pygwalker_router(request))
+    finally:
+        gradio_comm.gradio_comm_map.pop("gradio-gid", None)
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"] == "application/json"
+    assert json.loads(gzip.decompress(response.body)) == {"code": 0, "data": {"datas": rows}, "message": "success"}
+
+
+def test_encode_http_response_skips_compression_when_not_accepted():
+    result = {"code": 0, "data": {"datas": [{"value": "x" * 100}] * 500}, "message": "success"}
+
+    for accept_encoding in ["", "br", "gzip;q=0"]:
+        encoded = encode_http_response(result, accept_encoding)
+        assert "Content-Encoding" not in encoded.headers
+        assert json.loads(encoded.body) == result
+
+
 def test_comm_envelope_accepts_integer_gid_before_dispatch():
     comm = BaseCommunication("123")
     comm.register("ping", lambda _: {})
@@ -1,4 +1,9 @@
 from types import SimpleNamespace
+import json
+import threading
+
+import pandas as pd
+import pyarrow as pa
 
 from pygwalker.communications.protocol import (
     BatchPayloadQueryRequest,
@@ -6,8 +11,14 @@ from pygwalker.communications.protocol import (
     PayloadQueryRequest,
     SqlQueryRequest,
 )
-from pygwalker.services.data_communication import DataCommunicationService
+from pygwalker.services.data_communication import (
+    INVALIDATE_DATAS_ACTION,
+    PROGRESSIVE_DATAS_ACTION,
+    DataCommunicationService,
+)
+from pygwalker.services.data_parsers import get_parser
 from pygwalker.services.global_var import GlobalVarManager
+from pygwalker.utils.encode import DataFrameEncoder
 
 
 def test_data_communication_queries_sql_and_payload():
@@ -56,6 +67,112 @@ def test_data_communication_queries_batches():
     ]
 
 
+def test_data_communication_ships_arrow_ipc_when_requested():
+    table = pa.table({"city": ["London", "Tokyo"], "value": [1, 2]})
+    walker = SimpleNamespace(
+        data_parser=SimpleNamespace(
+            get_datas_by_sql_arrow=lambda _sql: table,
+            batch_get_datas_by_payload_arrow=lambda payloads: [table for _ in payloads],
+        )
+    )
+    service = DataCommunicationService(walker)
+
+    sql_response = service.get_datas(SqlQueryRequest(sql="SELECT 1", resultFormat="arrow"))
+    batch_response = service.batch_get_datas_by_payload(
+        BatchPayloadQueryRequest(queryList=[{"workflow": []}, {"workflow": []}], resultFormat="arrow")
+    )
+
+    assert pa.ipc.open_stream(sql_response["datas"]).read_all().equals(table)
+    assert len(batch_response["datas"]) == 2
+    assert all(pa.ipc.open_stream(datas).read_all().equals(table) for datas in batch_response["datas"])
+    assert isinstance(json.loads(json.dumps(sql_response, cls=DataFrameEncoder))["datas"], str)
+
+
+def test_data_communication_ships_columnar_datas_when_requested():
+    columnar_datas = {"columns": ["city"], "values": [["London"]], "dictionaries": [None], "rowCount": 1}
+    walker = SimpleNamespace(
+        data_parser=SimpleNamespace(
+            get_datas_by_sql_columnar=lambda _sql: columnar_datas,
+            batch_get_datas_by_sql_columnar=lambda sql_list: [columnar_datas for _ in sql_list],
+        )
+    )
+    service = DataCommunicationService(walker)
+
+    sql_response = service.get_datas(SqlQueryRequest(sql="SELECT 1", resultFormat="columnar"))
+    batch_response = service.batch_get_datas_by_sql(
+        BatchSqlQueryRequest(queryList=["SELECT 1", "SELECT 2"], resultFormat="columnar")
+    )
+
+    assert sql_response == {"datas": columnar_datas}
+    assert batch_response == {"datas": [columnar_datas, columnar_datas]}
+
+
+def _progressive_walker(supports_push=True):
+    pushed = []
+    pushed_event = threading.Event()
+
+    def send_msg_async(action, data):
+        pushed.append((action, data))
+        pushed_event.set()
+
+    approximate_sql = {"city": "SELECT sampled city"}
+    walker = SimpleNamespace(
+        progressive_query=True,
+        comm=SimpleNamespace(gid="gid", supports_push=supports_push, send_msg_async=send_msg_async),
+        data_parser=SimpleNamespace(
+            get_approximate_sql_by_payload=lambda payload: approximate_sql.get(payload["workflow"][0]["type"]),
+            batch_get_datas_by_sql=lambda sql_list: [[{"approximate": sql}] for sql in sql_list],
+            batch_get_datas_by_payload=lambda payloads: [
+                [{"exact": payload["workflow"][0]["type"]}] for payload in payloads
+            ],
+        ),
+    )
+    return walker, pushed, pushed_event
+
+
+def test_data_communication_answers_from_sample_then_pushes_exact_datas():
+    walker, pushed, pushed_event = _progressive_walker()
+    service = DataCommunicationService(walker)
+
+    response = service.batch_get_datas_by_payload(
+        BatchPayloadQueryRequest(queryList=[{"workflow": [{"type": "city"}]}, {"workflow": [{"type": "raw"}]}])
+    )
+
+    assert response["datas"] == [[{"approximate": "SELECT sampled city"}], [{"exact": "raw"}]]
+    assert response["approximate"] == [True, False]
+    assert pushed_event.wait(10)
+    assert pushed == [
+        (
+            PROGRESSIVE_DATAS_ACTION,
+            {"progressiveId": response["progressiveId"], "indexes": [0], "datas": [[{"exact": "city"}]]},
+        )
+    ]
+
+
+def test_data_communication_answers_exactly_without_push():
+    walker, pushed, _ = _progressive_walker(supports_push=False)
+    service = DataCommunicationService(walker)
+
+    response = service.batch_get_datas_by_payload(
+        BatchPayloadQueryRequest(queryList=[{"workflow": [{"type": "city"}]}])
+    )
+
+    assert response == {"datas": [[{"exact": "city"}]]}
+    assert pushed == []
+
+
+def test_invalidating_query_cache_pushes_invalidated_datas_to_frontend():
+    pushed = []
+    walker = SimpleNamespace(data_parser=get_parser(pd.DataFrame({"city": ["London", "Tokyo"]})))
+    service = DataCommunicationService(walker)
+    comm = SimpleNamespace(send_msg_async=lambda action, data: pushed.append((action, data)))
+    walker.data_parser.add_invalidate_listener(lambda: service.push_invalidated_datas(comm))
+
+    walker.data_parser.invalidate_query_cache()
+
+    assert pushed == [(INVALIDATE_DATAS_ACTION, {})]
+
+
 def test_data_communication_exports_dataframe_to_walker_and_global_state():
     previous_exported_dataframe = GlobalVarManager.last_exported_dataframe
     walker = SimpleNamespace(
@@ -1,21 +1,27 @@
+import datetime
 import gc
+import io
 import os.path
 import pickle
 import subprocess
 import sys
 import weakref
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 import pandas as pd
 import polars as pl
 import pyarrow as pa
+import pyarrow.parquet
 import pytest
 
 from pygwalker.services.data_parsers import get_dataset_hash, get_parser
+from pygwalker.data_parsers import database_parser
 from pygwalker.data_parsers.database_parser import Connector, DatabaseDataParser, text
 from pygwalker.data_parsers.database_parser import _check_view_sql
+from pygwalker.data_parsers.base import FieldSpec, INFER_SAMPLE_SIZE
 from pygwalker.data_parsers.pandas_parser import PandasDataFrameDataParser
 from pygwalker.errors import ViewSqlSameColumnError
+from pygwalker.services.sql_memo import SqlMemo
 
 datas = [
     {"name": "padnas", "count": 3, "date": "2022-01-01"},
@@ -122,13 +128,14 @@ def test_pandas_parser_remains_picklable_after_cached_properties_are_loaded():
 
 
 @pytest.mark.parametrize(
-    "module_name",
+    "trigger_code",
     [
-        "pygwalker.data_parsers.base",
-        "pygwalker.services.render_manager",
+        # duckdb is imported lazily by dataframe parsers, so the error surfaces on first query
+        "importlib.import_module('pygwalker.utils.duckdb_connection').DuckdbConnection({}).execute('SELECT 1')",
+        "importlib.import_module('pygwalker.services.render_manager')",
     ],
 )
-def test_duckdb_import_failure_has_actionable_message(module_name):
+def test_duckdb_import_failure_has_actionable_message(trigger_code):
     repo_root = os.path.dirname(os.path.dirname(__file__))
     code = f"""
 import builtins
@@ -142,7 +149,8 @@ def blocked_import(name, *args, **kwargs):
     return original_import(name, *args, **kwargs)
 
 builtins.__import__ = blocked_import
-importlib.import_module({module_name!r})
+importlib.import_module("pygwalker.data_parsers.base")
+{trigger_code}
 """
     result = subprocess.run(
         [sys.executable, "-c", code],
@@ -254,3 +262,493 @@ def test_database_parser_get_datas_by_sql_queries_connector_view():
                 "SELECT city FROM ___pygwalker_temp_view_name___ WHERE id = 1",
             ]
         ) == [[{"total": 2}], [{"city": "London"}]]
+
+
+def test_dataframe_parsers_use_isolated_duckdb_connections():
+    parser_a = get_parser(pd.DataFrame({"value": [1, 2, 3]}))
+    parser_b = get_parser(pd.DataFrame({"value": [10]}))
+
+    assert parser_a.get_datas_by_sql(sql) == [{"total": 3}]
+    assert parser_b.get_datas_by_sql(sql) == [{"total": 1}]
+    assert parser_a.get_datas_by_sql(sql) == [{"total": 3}]
+
+
+def test_dataframe_parser_queries_from_threads_and_reopens_after_close():
+    from concurrent.futures import ThreadPoolExecutor
+
+    parser = get_parser(pd.DataFrame(datas))
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: parser.get_datas_by_sql(sql), range(8)))
+
+    assert results == [sql_result] * 8
+
+    parser.close()
+    assert parser.get_datas_by_sql(sql) == sql_result
+    assert pickle.loads(pickle.dumps(parser)).get_datas_by_sql(sql) == sql_result
+
+
+def test_dataframe_parser_returns_arrow_tables():
+    dataset_parser = get_parser(pd.DataFrame(datas))
+
+    table = dataset_parser.get_datas_by_sql_arrow(sql)
+    assert isinstance(table, pa.Table)
+    assert table.to_pylist() == sql_result
+    assert [table.to_pylist() for table in dataset_parser.batch_get_datas_by_sql_arrow([sql, sql])] == [
+        sql_result,
+        sql_result,
+    ]
+
+
+@pytest.mark.parametrize("dataframe_type", [pd.DataFrame, pl.DataFrame])
+def test_dataframe_parser_infers_temporal_strings_when_first_value_is_null(dataframe_type):
+    df = dataframe_type(
+        {
+            "date": [None, "2022-01-01", "2022-01-02 10:00:00", "2022-01-03"],
+            "name": [None, "a", "2022-01-01", "b"],
+            "numeric_string": ["1", "2", "3", "4"],
+        }
+    )
+    dataset_parser = get_parser(df, infer_string_to_date=True)
+
+    assert [field["semanticType"] for field in dataset_parser.raw_fields] == ["temporal", "nominal", "nominal"]
+
+
+def test_pandas_parser_infers_date_objects_when_first_value_is_null():
+    df = pd.DataFrame({"date": [None, datetime.date(2022, 1, 1), datetime.date(2022, 1, 2)], "name": ["a", "b", "c"]})
+    dataset_parser = get_parser(df)
+
+    assert [field["semanticType"] for field in dataset_parser.raw_fields] == ["temporal", "nominal"]
+
+
+@pytest.mark.parametrize("dataframe_type", [pd.DataFrame, pl.DataFrame])
+def test_dataframe_parser_infers_types_from_rows_over_whole_dataframe(dataframe_type):
+    row_count = 5000
+    df = dataframe_type(
+        {
+            "date": [None] * 2000 + ["2022-01-01"] * (row_count - 2000),
+            "level": [index // 100 % 20 for index in range(row_count)],
+            "flag": [index % 3 for index in range(row_count)],
+            "lat": [float(index) for index in range(row_count)],
+        }
+    )
+    dataset_parser = get_parser(df, infer_string_to_date=True)
+
+    assert dataset_parser.raw_fields == [
+        {"fid": "date", "name": "date", "semanticType": "temporal", "analyticType": "dimension"},
+        {"fid": "level", "name": "level", "semanticType": "quantitative", "analyticType": "measure"},
+        {"fid": "flag", "name": "flag", "semanticType": "quantitative", "analyticType": "dimension"},
+        {"fid": "lat", "name": "lat", "semanticType": "quantitative", "analyticType": "dimension"},
+    ]
+
+
+@pytest.mark.parametrize(
+    "dataframe",
+    [
+        lambda values: pd.DataFrame({"level": pd.array(values, dtype="Int64")}),
+        lambda values: pl.DataFrame({"level": values}, schema={"level": pl.Int64}),
+    ],
+)
+@pytest.mark.parametrize("distinct_count, analytic_type", [(15, "dimension"), (16, "measure")])
+def test_dataframe_parser_counts_null_as_one_value_of_cardinality(dataframe, distinct_count, analytic_type):
+    values = [index % distinct_count for index in range(100)] + [None] * 10
+    series = pd.Series(values, dtype="Int64")
+    # same boundary as `len(series.unique())`, which counts null once
+    assert (len(series.unique()) <= 16) is (analytic_type == "dimension")
+
+    dataset_parser = get_parser(dataframe(values))
+
+    assert dataset_parser.raw_fields[0]["analyticType"] == analytic_type
+
+
+def test_dataframe_parser_field_specs_override_inferred_types():
+    field_specs = [
+        FieldSpec(fname="count", semantic_type="nominal", analytic_type="measure", display_as="Count"),
+        FieldSpec(fname="not_exist", semantic_type="temporal"),
+    ]
+    dataset_parser = get_parser(pd.DataFrame(datas), field_specs=field_specs)
+
+    assert dataset_parser.raw_fields[1] == {
+        "fid": "count",
+        "name": "Count",
+        "semanticType": "nominal",
+        "analyticType": "measure",
+    }
+    assert dataset_parser.raw_fields[2] == raw_fields_result[2]
+
+
+@pytest.mark.parametrize("dataframe_type", [pd.DataFrame, pl.DataFrame])
+def test_dataframe_parser_field_metas_come_from_schema(dataframe_type):
+    df = dataframe_type(
+        {
+            "name": [None, "a"],
+            "count": [None, 1],
+            "created_at": [None, datetime.datetime(2022, 1, 1)],
+            "updated_at": [None, datetime.datetime(2022, 1, 1, tzinfo=datetime.timezone.utc)],
+        }
+    )
+    dataset_parser = get_parser(df)
+
+    assert dataset_parser.field_metas == [
+        {"key": "name", "type": "string"},
+        {"key": "count", "type": "number"},
+        {"key": "created_at", "type": "datetime"},
+        {"key": "updated_at", "type": "datetime_tz"},
+    ]
+
+
+def test_dataframe_parser_field_metas_of_empty_dataframe_keep_columns():
+    dataset_parser = get_parser(pd.DataFrame({"count": pd.Series([], dtype="int64"), "name": pd.Series([], dtype=str)}))
+
+    assert dataset_parser.field_metas == [{"key": "count", "type": "number"}, {"key": "name", "type": "string"}]
+
+
+def test_connector_streams_query_into_arrow_record_batches(monkeypatch):
+    monkeypatch.setattr(database_parser, "QUERY_STREAM_BATCH_SIZE", 2)
+    connector = Connector.from_sqlalchemy_engine(create_engine("duckdb:///:memory:"), "SELECT 1 AS a")
+    sql = (
+        "SELECT * FROM (VALUES (1, NULL), (2, NULL), (3, 1.25::DECIMAL(4, 2)), (4, NULL), (5, 2.5::DECIMAL(4, 2))) "
+        "t(id, price) ORDER BY id"
+    )
+
+    table = connector.query_arrow(sql)
+
+    assert table.schema.types == [pa.int64(), pa.float64()]
+    assert table["price"].num_chunks == 3
+    assert table.to_pylist() == connector.query_datas(sql)
+    assert table["price"].to_pylist() == [None, None, 1.25, None, 2.5]
+
+
+def test_database_parser_batch_reuses_connections(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'batch.db'}", pool_size=2)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE test_datas AS SELECT 1 AS id, 'London' AS city"))
+    parser = DatabaseDataParser(
+        Connector.from_sqlalchemy_engine(engine, "SELECT * FROM test_datas"), [], False, True, {}
+    )
+    checkouts = []
+    event.listen(engine, "checkout", lambda *_: checkouts.append(1))
+    sql_list = [f"SELECT id + {index} AS id FROM ___pygwalker_temp_view_name___" for index in range(8)]
+
+    assert parser.batch_get_datas_by_sql(sql_list) == [[{"id": 1 + index}] for index in range(8)]
+    assert len(checkouts) <= parser.batch_query_max_workers
+    assert parser.batch_get_datas_by_sql_arrow([sql_list[0]])[0].to_pylist() == [{"id": 1}]
+
+
+def test_database_parser_memoizes_transpiled_sql(monkeypatch):
+    engine = create_engine("duckdb:///:memory:")
+    with engine.connect() as conn:
+        conn.execute(text("CREATE TABLE test_datas AS SELECT 1 AS id, 'London' AS city"))
+        connector = Connector.from_sqlalchemy_connection(conn, "SELECT * FROM test_datas")
+        parser = DatabaseDataParser(connector, [], False, True, {})
+        memo = SqlMemo()
+        monkeypatch.setattr(database_parser, "sql_transpile_memo", memo)
+        sql = "SELECT city FROM ___pygwalker_temp_view_name___ WHERE id = 1"
+
+        formatted_sql = parser._format_sql(sql)
+        view_sql_ast = parser._view_sql_ast
+
+        assert parser._format_sql(sql) == formatted_sql
+        assert parser._format_sql(sql.replace("id = 1", "id = 2")) != formatted_sql
+        assert parser._view_sql_ast is view_sql_ast
+        assert view_sql_ast.sql() == "SELECT * FROM test_datas"
+        stats = memo.stats()
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+        assert stats["compute_seconds"] > 0
+        assert parser.get_datas_by_sql(sql) == [{"city": "London"}]
+
+
+def test_database_parser_field_metas_do_not_query_database():
+    engine = create_engine("duckdb:///:memory:")
+    with engine.connect() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE test_datas AS SELECT * FROM (VALUES "
+                "(NULL, NULL, NULL), (1.5::DECIMAL(4, 2), 'London', TIMESTAMPTZ '2022-01-01 00:00:00+00')"
+                ") t(price, city, created_at)"
+            )
+        )
+        connector = Connector.from_sqlalchemy_connection(conn, "SELECT * FROM test_datas")
+        parser = DatabaseDataParser(connector, [], False, True, {})
+        queried_sqls = []
+        connector.query_datas = lambda sql: queried_sqls.append(sql) or []
+
+        assert parser.field_metas == [
+            {"key": "price", "type": "number"},
+            {"key": "city", "type": "string"},
+            {"key": "created_at", "type": "datetime_tz"},
+        ]
+        assert queried_sqls == []
+
+
+def test_pyarrow_parser_keeps_arrow_table_and_infers_types_from_schema():
+    table = pa.table(
+        {
+            "name": pa.array(["a", None, "b"]).dictionary_encode(),
+            "price": pa.array([1.5, float("nan"), None]),
+            "amount": pa.array([1, 2, 3], type=pa.decimal128(10, 2)),
+            "created_at": pa.array([datetime.datetime(2022, 1, 1)] * 3, type=pa.timestamp("us", tz="UTC")),
+            "day": pa.array(["2022-01-01", "2022-01-02", None]),
+        }
+    )
+    dataset_parser = get_parser(table, infer_string_to_date=True)
+
+    assert isinstance(dataset_parser.df, pa.Table)
+    assert [(field["semanticType"], field["analyticType"]) for field in dataset_parser.raw_fields] == [
+        ("nominal", "dimension"),
+        ("quantitative", "measure"),
+        ("quantitative", "measure"),
+        ("temporal", "dimension"),
+        ("temporal", "dimension"),
+    ]
+    assert [meta["type"] for meta in dataset_parser.field_metas] == [
+        "string",
+        "number",
+        "number",
+        "datetime_tz",
+        "string",
+    ]
+    assert dataset_parser.to_records(2)[1]["price"] is None
+    assert dataset_parser.get_datas_by_sql("SELECT COUNT(name) AS total FROM pygwalker_mid_table") == [{"total": 2}]
+
+
+def test_pyarrow_parser_exports_from_arrow():
+    table = pa.table({"name": ["a", "b"], "count": [1, 2]})
+    dataset_parser = get_parser(table)
+
+    assert pd.read_csv(io.BytesIO(dataset_parser.to_csv().getvalue())).to_dict(orient="records") == [
+        {"name": "a", "count": 1},
+        {"name": "b", "count": 2},
+    ]
+    assert pa.parquet.read_table(io.BytesIO(dataset_parser.to_parquet().getvalue())).equals(table)
+
+
+def test_pyarrow_parser_accepts_record_batch_reader_and_dataset():
+    import pyarrow.dataset as ds
+
+    table = pa.table({key: [row[key] for row in datas] for key in datas[0]})
+    reader = pa.RecordBatchReader.from_batches(table.schema, table.to_batches())
+
+    for dataset in (reader, ds.dataset(table)):
+        dataset_parser = get_parser(dataset)
+        assert dataset_parser.get_datas_by_sql(sql) == sql_result
+        assert dataset_parser.raw_fields == raw_fields_result
+    assert get_dataset_hash(ds.dataset(table)) == get_dataset_hash(ds.dataset(table))
+
+
+def test_pyarrow_dataset_parser_scans_dataset_lazily(tmp_path):
+    import pyarrow.dataset as ds
+
+    table = pa.table({"a\\b": ["x", "y", "z"], "count": [1, 2, 3]})
+    pa.parquet.write_table(table, tmp_path / "data.parquet")
+    dataset_parser = get_parser(ds.dataset(tmp_path, format="parquet"))
+
+    assert dataset_parser.dataset_type == "pyarrow_dataset"
+    # columns are renamed by a scanner over the dataset, it is never read into a table
+    assert isinstance(dataset_parser.df, ds.Scanner)
+    assert dataset_parser.data_size > 1 << 60
+    assert dataset_parser.field_metas == [{"key": "a-b", "type": "string"}, {"key": "count", "type": "number"}]
+    assert dataset_parser.get_datas_by_sql(
+        'SELECT "a-b", count FROM pygwalker_mid_table WHERE count > 1 ORDER BY count'
+    ) == [{"a-b": "y", "count": 2}, {"a-b": "z", "count": 3}]
+    assert dataset_parser.to_records(1) == [{"a-b": "x", "count": 1}]
+    assert pa.parquet.read_table(io.BytesIO(dataset_parser.to_parquet().getvalue())).num_rows == 3
+
+
+def test_pyarrow_dataset_parser_renames_duplicate_columns_by_position(tmp_path):
+    import pyarrow.dataset as ds
+
+    table = pa.Table.from_arrays([pa.array(["x", "y"]), pa.array([1, 2])], names=["a", "a"])
+    pa.parquet.write_table(table, tmp_path / "data.parquet")
+    dataset = ds.dataset(tmp_path / "data.parquet", schema=table.schema)
+    dataset_parser = get_parser(dataset)
+
+    assert dataset_parser.field_metas == [{"key": "a", "type": "string"}, {"key": "a_1", "type": "number"}]
+    assert dataset_parser.get_datas_by_sql("SELECT a FROM pygwalker_mid_table WHERE a_1 = 2") == [{"a": "y"}]
+    assert dataset_parser.to_records() == [{"a": "x", "a_1": 1}, {"a": "y", "a_1": 2}]
+    assert get_dataset_hash(dataset) == get_dataset_hash(ds.dataset(tmp_path / "data.parquet", schema=table.schema))
+
+    # pyarrow can't read in-memory datasets with duplicate names at all
+    with pytest.raises(ValueError, match="duplicate column names"):
+        get_parser(ds.dataset(table))
+
+
+def test_data_parser_on_polars_lazyframe():
+    lf = pl.LazyFrame(datas).filter(pl.col("count") > 0)
+    dataset_parser = get_parser(lf)
+
+    assert dataset_parser.dataset_type == "polars_lazyframe"
+    assert dataset_parser.get_datas_by_sql(sql) == sql_result
+    assert dataset_parser.raw_fields == raw_fields_result
+    assert dataset_parser.field_metas == [
+        {"key": "name", "type": "string"},
+        {"key": "count", "type": "number"},
+        {"key": "date", "type": "string"},
+    ]
+    assert dataset_parser.to_records(1) == to_records_result
+    assert dataset_parser.data_size > 1 << 60
+    assert get_dataset_hash(lf) == get_dataset_hash(lf)
+    assert get_dataset_hash(lf) != get_dataset_hash(lf.filter(pl.col("count") > 3))
+
+
+def test_polars_lazyframe_infers_types_from_head_rows():
+    lf = pl.LazyFrame({"value": list(range(INFER_SAMPLE_SIZE * 3))})
+    dataset_parser = get_parser(lf)
+
+    assert dataset_parser._get_infer_sample().equals(lf.head(INFER_SAMPLE_SIZE).collect())
+
+
+def test_data_parser_on_parquet_files(tmp_path):
+    table = pa.table({key: [row[key] for row in datas] for key in datas[0]})
+    pa.parquet.write_table(table.slice(0, 2), tmp_path / "part-0.parquet")
+    pa.parquet.write_table(table.slice(2), tmp_path / "part-1.parquet")
+
+    for dataset in (str(tmp_path / "*.parquet"), tmp_path):
+        dataset_parser = get_parser(dataset)
+        assert dataset_parser.dataset_type == "file_parquet"
+        assert dataset_parser.get_datas_by_sql(sql) == sql_result
+        assert dataset_parser.raw_fields == raw_fields_result
+        assert dataset_parser.to_records(1) == to_records_result
+        assert dataset_parser.data_size > 1 << 60
+        assert pa.parquet.read_table(io.BytesIO(dataset_parser.to_parquet().getvalue())).num_rows == 5
+
+    dataset_hash = get_dataset_hash(str(tmp_path / "*.parquet"))
+    assert dataset_hash == get_dataset_hash(str(tmp_path / "*.parquet"))
+    pa.parquet.write_table(table, tmp_path / "part-2.parquet")
+    assert dataset_hash != get_dataset_hash(str(tmp_path / "*.parquet"))
+
+
+def test_data_parser_on_hive_partitioned_directory(tmp_path):
+    for city, prices in (("a", [1.5, 2.5]), ("b", [3.5])):
+        partition = tmp_path / f"city={city}"
+        partition.mkdir()
+        pa.parquet.write_table(pa.table({"price": prices}), partition / "data.parquet")
+
+    dataset_parser = get_parser(str(tmp_path))
+    assert [field["fid"] for field in dataset_parser.raw_fields] == ["price", "city"]
+    assert dataset_parser.get_datas_by_sql(
+        "SELECT city, SUM(price) AS total FROM pygwalker_mid_table GROUP BY city ORDER BY city"
+    ) == [{"city": "a", "total": 4.0}, {"city": "b", "total": 3.5}]
+
+
+def test_data_parser_on_csv_file(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("a\\b,count\nx,1\ny,2\n")
+
+    dataset_parser = get_parser(str(file_path))
+    assert dataset_parser.dataset_type == "file_csv"
+    assert dataset_parser.field_metas == [{"key": "a-b", "type": "string"}, {"key": "count", "type": "number"}]
+    assert dataset_parser.to_records() == [{"a-b": "x", "count": 1}, {"a-b": "y", "count": 2}]
+    assert pd.read_csv(io.BytesIO(dataset_parser.to_csv().getvalue())).to_dict(orient="records") == [
+        {"a-b": "x", "count": 1},
+        {"a-b": "y", "count": 2},
+    ]
+
+
+def test_file_dataset_routing(tmp_path):
+    from pygwalker.data_parsers.cloud_dataset_parser import CloudDatasetParser
+    from pygwalker.data_parsers.file_parser import FileDatasetParser
+    from pygwalker.services.data_parsers import _get_data_parser
+
+    file_path = tmp_path / "data.xlsx"
+    file_path.write_bytes(b"")
+
+    assert _get_data_parser(str(file_path))[0] is FileDatasetParser
+    assert _get_data_parser("cloud-dataset-id")[0] is CloudDatasetParser
+    with pytest.raises(ValueError, match="Unsupported file format"):
+        get_parser(file_path)
+
+
+def test_cloud_dataset_parser_batches_columnar_payloads(monkeypatch):
+    from pygwalker.data_parsers import cloud_dataset_parser
+
+    class FakeCloudService:
+        def __init__(self, api_key):
+            self.batches = []
+
+        def query_from_dataset(self, dataset_id, payload):
+            return [{"a": 1, "b": "x"}]
+
+        def batch_query_from_dataset(self, dataset_id, payloads):
+            self.batches.append(payloads)
+            return [{"rows": [{"a": payload["limit"], "b": "x"}]} for payload in payloads]
+
+    monkeypatch.setattr(cloud_dataset_parser, "CloudService", FakeCloudService)
+    parser = cloud_dataset_parser.CloudDatasetParser("batch-columnar-dataset", [], True, False, {})
+    payloads = [{"workflow": [], "limit": 1}, {"workflow": [], "limit": 2}]
+
+    datas = parser.batch_get_datas_by_payload_columnar(payloads)
+    assert [data["values"][0] for data in datas] == [[1], [2]]
+    assert parser.batch_get_datas_by_payload_columnar(payloads) == datas
+    # one batch request for all payloads, repeated payloads are answered by the query cache
+    assert parser._cloud_service.batches == [payloads]
+    parser.invalidate_query_cache()
+
+
+def test_duckdb_settings_of_walker_override_global_settings(monkeypatch):
+    from pygwalker.services.global_var import GlobalVarManager
+
+    monkeypatch.setattr(GlobalVarManager, "duckdb_settings", {})
+    GlobalVarManager.set_duckdb_settings(threads=1, memory_limit="1GB")
+    dataset_parser = get_parser(pd.DataFrame(datas), other_params={"duckdb_settings": {"memory_limit": "512MB"}})
+
+    assert dataset_parser.get_datas_by_sql(
+        "SELECT current_setting('threads') AS threads, current_setting('memory_limit') AS memory_limit"
+    ) == [{"threads": 1, "memory_limit": "488.2 MiB"}]
+    with pytest.raises(ValueError, match="Unsupported duckdb settings: max_memory"):
+        get_parser(pd.DataFrame(datas), other_params={"duckdb_settings": {"max_memory": "1GB"}})
+
+
+def test_duckdb_settings_spill_to_temp_directory(tmp_path):
+    import duckdb
+    import numpy as np
+
+    df = pd.DataFrame({"key": np.arange(3_000_000), "value": np.ones(3_000_000)})
+    query = "SELECT COUNT(1) AS total, SUM(value) AS value FROM (SELECT key, SUM(value) AS value FROM pygwalker_mid_table GROUP BY key)"
+    settings = {"threads": 1, "memory_limit": "40MB", "preserve_insertion_order": False}
+
+    dataset_parser = get_parser(df, other_params={"duckdb_settings": {**settings, "temp_directory": str(tmp_path)}})
+    assert dataset_parser.get_datas_by_sql(query) == [{"total": 3_000_000, "value": 3_000_000.0}]
+
+    dataset_parser = get_parser(df, other_params={"duckdb_settings": {**settings, "temp_directory": ""}})
+    with pytest.raises(duckdb.OutOfMemoryException):
+        dataset_parser.get_datas_by_sql(query)
+
+
+def test_duckdb_settings_from_config(monkeypatch, tmp_path):
+    from pygwalker.services import config
+
+    monkeypatch.setattr(config, "CONFIG_PATH", str(tmp_path / "config.json"))
+    config.set_config({"duckdb_threads": "2", "duckdb_temp_directory": str(tmp_path), "duckdb_memory_limit": ""})
+
+    assert config.get_duckdb_settings_config() == {"threads": "2", "temp_directory": str(tmp_path)}
+
+
+def test_duckdb_settings_of_process_keep_settings_from_config_command(tmp_path):
+    env = {**os.environ, "XDG_CONFIG_HOME": str(tmp_path)}
+    config_command = [sys.executable, "-m", "bin.pygwalker_command", "config"]
+    subprocess.run([*config_command, "--set", "duckdb_threads=2", "duckdb_memory_limit=1GB"], check=True, env=env)
+    code = """
+from pygwalker.services.global_var import GlobalVarManager
+
+GlobalVarManager.set_duckdb_settings(temp_directory="spill")
+print(sorted(GlobalVarManager.duckdb_settings.items()))
+"""
+    result = subprocess.run([sys.executable, "-c", code], check=True, env=env, text=True, capture_output=True)
+
+    assert result.stdout.strip() == str([("memory_limit", "1GB"), ("temp_directory", "spill"), ("threads", "2")])
+
+
+def test_connector_fingerprint_depends_on_password_and_engine_params(monkeypatch):
+    monkeypatch.setattr(Connector, "engine_map", {})
+    view_sql = "SELECT * FROM test_datas"
+
+    connector = Connector("duckdb://user:right@/:memory:", view_sql)
+    wrong_password_connector = Connector("duckdb://user:wrong@/:memory:", view_sql)
+
+    assert connector.url == wrong_password_connector.url == "duckdb://user:***@/%3Amemory%3A"
+    assert connector.fingerprint != wrong_password_connector.fingerprint
+    assert connector.fingerprint == Connector("duckdb://user:right@/:memory:", view_sql).fingerprint
+    assert (
+        connector.fingerprint
+        != Connector("duckdb://user:right@/:memory:", view_sql, {"connect_args": {"read_only": True}}).fingerprint
+    )
@@ -0,0 +1,131 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+import json
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from pygwalker.services.data_parsers import get_parser
+from pygwalker.utils import encode
+from pygwalker.utils.encode import (
+    DataFrameEncoder,
+    arrow_to_columnar_datas,
+    json_dumps,
+    json_dumps_bytes,
+    rows_to_columnar_datas,
+    to_arrow_ipc_bytes,
+)
+
+VALUES = {
+    "naive_datetime": datetime(2024, 1, 1, 12),
+    "aware_datetime": datetime(2024, 1, 1, tzinfo=timezone(timedelta(hours=8))),
+    "date": date(2024, 1, 2),
+    "decimal": Decimal("1.5"),
+    "nan_decimal": Decimal("NaN"),
+    "bytes": b"ab",
+    "np_int": np.int64(5),
+    "np_float": np.float32(1.5),
+    "np_bool": np.bool_(True),
+    "np_datetime": np.datetime64("2024-01-01T12:00"),
+    "np_nat": np.datetime64("NaT"),
+    "np_array": np.array([1, 2]),
+    "big_int": 2**70,
+    1: "non str key",
+}
+
+EXPECTED = {
+    "naive_datetime": 1704110400000,
+    "aware_datetime": 1704038400000,
+    "date": "2024-01-02",
+    "decimal": 1.5,
+    "nan_decimal": None,
+    "bytes": "YWI=",
+    "np_int": 5,
+    "np_float": 1.5,
+    "np_bool": True,
+    "np_datetime": 1704110400000,
+    "np_nat": None,
+    "np_array": [1, 2],
+    "big_int": 2**70,
+    "1": "non str key",
+}
+
+
+def test_json_dumps_uses_millisecond_timestamps_and_native_numpy_values():
+    assert json.loads(json_dumps(VALUES)) == EXPECTED
+    assert json.loads(json_dumps_bytes(VALUES)) == EXPECTED
+
+
+def test_stdlib_encoder_matches_fast_backend():
+    assert json.loads(json.dumps(VALUES, cls=DataFrameEncoder)) == json.loads(json_dumps(VALUES))
+
+
+def test_stdlib_fallback_writes_non_finite_floats_as_null():
+    # integers out of 64-bit range make orjson fall back to the stdlib encoder
+    obj = {
+        "big_int": 2**70,
+        "nan": float("nan"),
+        "inf": float("-inf"),
+        "rows": [{"np_nan": np.float64("nan")}],
+        "np_array": np.array([1.0, np.nan]),
+    }
+    expected = {"big_int": 2**70, "nan": None, "inf": None, "rows": [{"np_nan": None}], "np_array": [1.0, None]}
+    result = json_dumps_bytes(obj)
+    assert json.loads(result, parse_constant=pytest.fail) == expected
+    assert json.loads(encode._stdlib_dumps_bytes(obj), parse_constant=pytest.fail) == expected
+
+
+@pytest.mark.skipif(encode.orjson is None, reason="orjson is not installed")
+def test_orjson_backend_is_selected_when_installed():
+    assert encode.JSON_BACKEND == "orjson"
+
+
+def _decode_columnar_datas(datas):
+    rows = [{} for _ in range(datas["rowCount"])]
+    for column, values, dictionary in zip(datas["columns"], datas["values"], datas["dictionaries"]):
+        for row, value in zip(rows, values):
+            row[column] = dictionary[value] if dictionary is not None and value is not None else value
+    return rows
+
+
+def test_columnar_datas_dictionary_encode_low_cardinality_strings():
+    rows = [
+        {"city": ["London", "Tokyo", None][index % 3], "name": f"user-{index}", "value": index} for index in range(9)
+    ]
+
+    for datas in [rows_to_columnar_datas(rows), arrow_to_columnar_datas(pa.Table.from_pylist(rows))]:
+        assert datas["columns"] == ["city", "name", "value"]
+        assert datas["dictionaries"] == [["London", "Tokyo"], None, None]
+        assert datas["values"][0] == [0, 1, None] * 3
+        assert _decode_columnar_datas(datas) == rows
+
+
+def test_dataframe_parser_returns_columnar_datas_from_arrow_results():
+    parser = get_parser(pd.DataFrame({"city": ["London", "Tokyo", "London", "London"], "value": [1, 2, 3, 4]}))
+    sql = "SELECT city, SUM(value) AS total FROM pygwalker_mid_table GROUP BY city ORDER BY city"
+
+    assert _decode_columnar_datas(parser.get_datas_by_sql_columnar(sql)) == parser.get_datas_by_sql(sql)
+    assert parser.batch_get_datas_by_sql_columnar([sql])[0]["rowCount"] == 2
+
+
+def test_arrow_ipc_bytes_cast_decimals_to_float():
+    table = pa.table({"total": pa.array([Decimal("3"), None], pa.decimal128(38, 0)), "city": ["London", "Tokyo"]})
+
+    result = pa.ipc.open_stream(to_arrow_ipc_bytes(table)).read_all()
+
+    assert result.schema.types == [pa.float64(), pa.string()]
+    assert result.to_pylist() == [{"total": 3.0, "city": "London"}, {"total": None, "city": "Tokyo"}]
+
+
+def test_estimate_average_data_size_measures_stdlib_json_text():
+    from pygwalker.services.render import get_max_limited_datas
+    from pygwalker.utils.estimate_tools import estimate_average_data_size
+
+    # each row is dumped as `{"city": "Z\u00fcrich", "value": 1}`, 35 chars plus the ", " separator of the list
+    rows = [{"city": "Zürich", "value": 1}] * 2048
+
+    assert estimate_average_data_size(rows) == 37
+    assert len(get_max_limited_datas(rows, 37 * 1000)) == 1000
+    assert len(get_max_limited_datas(rows, 37 * 1025)) == 2048
@@ -1,8 +1,13 @@
 import pytest
+import base64
 import json
 import ntpath
+import subprocess
+import sys
+import zlib
 from pathlib import Path
 
+from pygwalker.services import render
 from pygwalker.utils import frontend_assets
 
 
@@ -43,3 +48,44 @@ def test_read_frontend_asset_report_uses_stable_posix_path_with_windows_paths(mo
     message = str(exc_info.value)
     assert "pygwalker/templates/dist/missing.js" in message
     assert "pygwalker\\templates\\dist\\missing.js" not in message
+
+
+def test_gwalker_script_is_compressed_lazily_and_cached_on_disk(monkeypatch, tmp_path):
+    monkeypatch.setattr(render, "COMPRESSED_ASSET_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(render, "read_frontend_asset", lambda _name: "console.log('ok');")
+    render.get_gwalker_script_base64.cache_clear()
+    try:
+        script_base64 = render.get_gwalker_script_base64()
+        assert zlib.decompress(base64.b64decode(script_base64)) == b"console.log('ok');"
+        assert [path.read_text() for path in tmp_path.iterdir()] == [script_base64]
+
+        render.get_gwalker_script_base64.cache_clear()
+        monkeypatch.setattr(render, "compress_data", lambda _data: pytest.fail("cached bundle is compressed again"))
+        assert render.get_gwalker_script_base64() == script_base64
+    finally:
+        render.get_gwalker_script_base64.cache_clear()
+
+
+def test_import_pygwalker_does_not_compress_frontend_bundle():
+    code = """
+import zlib
+
+def blocked_compressobj(*args, **kwargs):
+    raise AssertionError("frontend bundle is compressed at import time")
+
+zlib.compressobj = blocked_compressobj
+
+import pygwalker
+from pygwalker.services import render
+
+assert render.get_gwalker_script_base64.cache_info().currsize == 0
+"""
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).resolve().parents[1],
+        check=False,
+        text=True,
+        capture_output=True,
+    )
+
+    assert result.returncode == 0, result.stderr
@@ -1,4 +1,5 @@
 import ast
+import json
 import re
 from pathlib import Path
 
@@ -10,6 +11,7 @@ from pygwalker.communications import protocol
 
 PYTHON_REQUEST_MODEL_TS_TYPES = {
     "EmptyRequest": "ICommEmptyRequest",
+    "CancelRequestRequest": "ICommCancelRequestRequest",
     "SqlQueryRequest": "ICommSqlQueryRequest",
     "PayloadQueryRequest": "ICommPayloadQueryRequest",
     "BatchSqlQueryRequest": "ICommBatchQueryRequest<string>",
@@ -32,6 +34,7 @@ PROTOCOL_MODEL_TS_INTERFACES = {
     protocol.PayloadQueryRequest: "ICommPayloadQueryRequest",
     protocol.BatchSqlQueryRequest: "ICommBatchQueryRequest",
     protocol.BatchPayloadQueryRequest: "ICommBatchQueryRequest",
+    protocol.CancelRequestRequest: "ICommCancelRequestRequest",
     protocol.UploadSpecToCloudRequest: "ICommUploadSpecToCloudRequest",
     protocol.ChartImageRequest: "ICommChartImageRequest",
     protocol.SaveChartRequest: "ICommSaveChartRequest",
@@ -45,6 +48,7 @@ PROTOCOL_MODEL_TS_INTERFACES = {
     protocol.LatestVisSpecResponse: "ICommLatestVisSpecResponse",
     protocol.DataRowsResponse: "ICommDataRowsResponse",
     protocol.BatchDataRowsResponse: "ICommBatchDataRowsResponse",
+    protocol.CancelRequestResponse: "ICommCancelRequestResponse",
     protocol.UploadSpecToCloudResponse: "ICommUploadSpecToCloudResponse",
     protocol.CloudCallbackResponse: "ICommCloudCallbackResponse",
     protocol.UploadCloudChartResponse: "ICommUploadCloudChartResponse",
@@ -273,6 +277,37 @@ def test_frontend_tracker_loads_segment_only_after_events_opt_in():
     assert 'tracker.setOpen(userConfig.privacy === "events")' in app_source
 
 
+def test_frontend_progressive_queries_are_not_resubmitted_and_stale_ones_are_cancelled():
+    from pygwalker.services.data_communication import INVALIDATE_DATAS_ACTION, PROGRESSIVE_DATAS_ACTION
+
+    repo_root = Path(__file__).resolve().parents[1]
+    data_source = (repo_root / "app/src/dataSource/index.tsx").read_text(encoding="utf-8")
+
+    assert f'registerEndpoint("{PROGRESSIVE_DATAS_ACTION}", (message: ICommProgressiveDatasMessage)' in data_source
+    # charts computed again after exact datas arrive answer pending payloads from their approximate datas
+    assert "state.exactDatas.get(queryKey) ?? state.approximateDatas.get(queryKey)" in data_source
+    assert 'sendMsgAsync("cancel_request", { rid: progressiveId })' in data_source
+    # local datas are scoped per walker communication and dropped when the kernel invalidates its query cache
+    assert "new WeakMap<ICommunication, IProgressiveState>()" in data_source
+    assert f'registerEndpoint("{INVALIDATE_DATAS_ACTION}", () => onInvalidateDatas(state))' in data_source
+
+
+def test_frontend_decodes_arrow_results_of_anywidget_buffers():
+    from pygwalker.communications.anywidget_comm import BUFFER_PLACEHOLDER_KEY
+
+    repo_root = Path(__file__).resolve().parents[1]
+    data_source = (repo_root / "app/src/dataSource/index.tsx").read_text(encoding="utf-8")
+    communication = (repo_root / "app/src/utils/communication.tsx").read_text(encoding="utf-8")
+    package = json.loads((repo_root / "app/package.json").read_text(encoding="utf-8"))
+
+    assert "apache-arrow" in package["dependencies"]
+    assert f'const BUFFER_PLACEHOLDER_KEY = "{BUFFER_PLACEHOLDER_KEY}";' in communication
+    assert "supportsBuffers: true," in communication
+    assert 'const resultFormat = comm?.supportsBuffers ? "arrow" : "columnar";' in data_source
+    assert "tableFromIPC(" in data_source
+    assert (repo_root / "app/tests/arrow-datas.spec.ts").exists()
+
+
 def test_frontend_http_integrations_initialize_communication():
     repo_root = Path(__file__).resolve().parents[1]
     app_source = (repo_root / "app/src/index.tsx").read_text(encoding="utf-8")
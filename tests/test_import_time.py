@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(__file__))
+HEAVY_MODULES = [
+    "pandas",
+    "duckdb",
+    "sqlalchemy",
+    "sqlglot",
+    "pyarrow",
+    "arrow",
+    "jinja2",
+    "IPython",
+    "ipywidgets",
+    "requests",
+]
+# generous default, import takes ~0.2s locally; slow CI machines can raise it with env
+IMPORT_TIME_BUDGET_US = int(float(os.getenv("PYGWALKER_IMPORT_TIME_BUDGET", "1.5")) * 1000 * 1000)
+
+
+def _run_python(code: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        cwd=REPO_ROOT,
+        check=True,
+        text=True,
+        capture_output=True,
+    )
+
+
+def test_import_pygwalker_does_not_import_heavy_modules():
+    code = f"""
+import sys
+import pygwalker
+print(",".join(name for name in {HEAVY_MODULES!r} if name in sys.modules))
+"""
+    result = _run_python(code)
+
+    assert result.stdout.strip() == ""
+
+
+def test_lazy_public_api_resolves_on_access():
+    code = """
+import sys
+import pygwalker
+from pygwalker import walk, FieldSpec, Walker
+from pygwalker.api.adapter import walk as adapter_walk
+assert walk is adapter_walk
+assert pygwalker.spec.__name__ == "pygwalker.spec"
+assert "walk" in dir(pygwalker)
+assert "pandas" in sys.modules
+"""
+    _run_python(code)
+
+
+def test_unknown_attribute_raises_attribute_error():
+    import pygwalker
+
+    with pytest.raises(AttributeError):
+        pygwalker.not_exist_attribute  # noqa: B018
+
+
+def test_import_time_within_budget():
+    # warm up the bytecode cache, then measure cumulative import time of `pygwalker` with `-X importtime`
+    _run_python("import pygwalker")
+    result = _run_python("import pygwalker", "-X", "importtime")
+
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            import_times[name.strip()] = int(cumulative)
+
+    assert import_times["pygwalker"] < IMPORT_TIME_BUDGET_US, (
+        f"import pygwalker took {import_times['pygwalker'] / 1000:.0f}ms, "
+        f"budget is {IMPORT_TIME_BUDGET_US / 1000:.0f}ms"
+    )
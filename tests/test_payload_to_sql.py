@@ -0,0 +1,44 @@
+from pygwalker.services.sql_memo import SqlMemo
+from pygwalker.utils import payload_to_sql
+from pygwalker.utils.payload_to_sql import get_payload_sql_key, get_sql_from_payload
+
+PAYLOAD = {
+    "workflow": [
+        {"type": "view", "query": [{"op": "aggregate", "groupBy": ["city"], "measures": []}]},
+    ],
+    "limit": 100,
+}
+FIELD_META = {"pygwalker_mid_table": [{"key": "city", "type": "string"}]}
+
+
+def test_payload_sql_key_is_canonical():
+    reordered_payload = {"limit": 100, "workflow": PAYLOAD["workflow"]}
+
+    assert get_payload_sql_key("t", PAYLOAD, FIELD_META) == get_payload_sql_key("t", reordered_payload, FIELD_META)
+    assert get_payload_sql_key("t", PAYLOAD, FIELD_META) != get_payload_sql_key("t2", PAYLOAD, FIELD_META)
+    assert get_payload_sql_key("t", PAYLOAD, FIELD_META) != get_payload_sql_key(
+        "t", {**PAYLOAD, "limit": 10}, FIELD_META
+    )
+
+
+def test_repeated_payload_skips_compilation(monkeypatch):
+    compiled = []
+
+    def compiler(table_name, payload, field_meta):
+        compiled.append(payload)
+        return f"SELECT city FROM {table_name} LIMIT {payload['limit']}"
+
+    memo = SqlMemo()
+    monkeypatch.setattr(payload_to_sql, "_payload_compiler", compiler)
+    monkeypatch.setattr(payload_to_sql, "payload_sql_memo", memo)
+
+    assert get_sql_from_payload("pygwalker_mid_table", PAYLOAD, FIELD_META) == (
+        "SELECT city FROM pygwalker_mid_table LIMIT 100"
+    )
+    get_sql_from_payload("pygwalker_mid_table", dict(PAYLOAD), FIELD_META)
+    other_field_meta = {"pygwalker_mid_table": [{"key": "city", "type": "number"}]}
+    get_sql_from_payload("pygwalker_mid_table", PAYLOAD, other_field_meta)
+
+    assert len(compiled) == 2
+    assert memo.stats()["hits"] == 1
+    assert memo.stats()["misses"] == 2
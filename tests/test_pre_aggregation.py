@@ -0,0 +1,112 @@
+import pandas as pd
+import pytest
+
+from pygwalker.services.data_parsers import get_parser
+
+DF = pd.DataFrame(
+    {
+        "city": ["London", "Tokyo", None, "London", "Tokyo", "London"] * 50,
+        "weather": ["rain", "sun", "sun", "sun", "rain", "rain"] * 50,
+        "rentals": [1, 2, 3, 4, None, 6] * 50,
+        "temperature": [10.5, 20.0, 15.5, 12.0, 25.5, 8.0] * 50,
+    }
+)
+ROW_COUNT_TRANSFORM = {
+    "type": "transform",
+    "transform": [{"key": "gw_count_fid", "expression": {"op": "one", "params": [], "as": "gw_count_fid"}}],
+}
+
+
+def _aggregate_payload(group_by, measures, filters=None, transform=False):
+    workflow = []
+    if filters:
+        workflow.append({"type": "filter", "filters": filters})
+    if transform:
+        workflow.append(ROW_COUNT_TRANSFORM)
+    workflow.append({"type": "view", "query": [{"op": "aggregate", "groupBy": group_by, "measures": measures}]})
+    workflow.append({"type": "sort", "by": group_by, "sort": "ascending"})
+    return {"workflow": workflow, "limit": 100}
+
+
+def _get_parser(pre_aggregations):
+    dataset_parser = get_parser(DF, other_params={"pre_aggregations": pre_aggregations})
+    dataset_parser.build_pre_aggregations(background=False)
+    return dataset_parser
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        _aggregate_payload(
+            ["city"],
+            [
+                {"field": "rentals", "agg": "sum", "asFieldKey": "rentals_sum"},
+                {"field": "rentals", "agg": "count", "asFieldKey": "rentals_count"},
+                {"field": "temperature", "agg": "min", "asFieldKey": "temperature_min"},
+                {"field": "temperature", "agg": "max", "asFieldKey": "temperature_max"},
+            ],
+            filters=[{"fid": "weather", "rule": {"type": "one of", "value": ["rain"]}}],
+        ),
+        _aggregate_payload(
+            ["weather"],
+            [{"field": "gw_count_fid", "agg": "sum", "asFieldKey": "gw_count_fid_sum"}],
+            transform=True,
+        ),
+    ],
+)
+def test_rollup_answers_compatible_payloads_like_whole_table(payload):
+    dataset_parser = _get_parser([["city", "weather"], ["weather"]])
+
+    assert "pygwalker_rollup_" in dataset_parser._payload_to_sql(payload)
+    expected = get_parser(DF).get_datas_by_payload_arrow(payload)
+    result = dataset_parser.get_datas_by_payload_arrow(payload)
+    assert result.schema == expected.schema
+    assert result.to_pylist() == expected.to_pylist()
+
+
+def test_smallest_matching_rollup_is_used():
+    dataset_parser = _get_parser([["city", "weather"], ["weather"]])
+    payload = _aggregate_payload(["weather"], [{"field": "rentals", "agg": "sum", "asFieldKey": "rentals_sum"}])
+
+    assert '"pygwalker_rollup_1"' in dataset_parser._payload_to_sql(payload)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        _aggregate_payload(["city"], [{"field": "rentals", "agg": "mean", "asFieldKey": "rentals_mean"}]),
+        _aggregate_payload(
+            ["city"],
+            [{"field": "rentals", "agg": "sum", "asFieldKey": "rentals_sum"}],
+            filters=[{"fid": "temperature", "rule": {"type": "range", "value": [10, 20]}}],
+        ),
+        {"workflow": [{"type": "view", "query": [{"op": "raw", "fields": ["city"]}]}]},
+    ],
+)
+def test_incompatible_payloads_scan_whole_table(payload):
+    dataset_parser = _get_parser([["city", "weather"]])
+
+    assert '"pygwalker_mid_table"' in dataset_parser._payload_to_sql(payload)
+    assert dataset_parser.pre_aggregation.stats() == {"rollups": 1, "hits": 0, "misses": 1}
+
+
+def test_rollups_are_rebuilt_after_invalidating_query_cache():
+    dataset_parser = get_parser(DF, other_params={"pre_aggregations": [["city"]]})
+    payload = _aggregate_payload(["city"], [{"field": "rentals", "agg": "sum", "asFieldKey": "rentals_sum"}])
+
+    assert '"pygwalker_mid_table"' in dataset_parser._payload_to_sql(payload)
+    dataset_parser.build_pre_aggregations()
+    assert dataset_parser.pre_aggregation.wait(10)
+
+    dataset_parser.invalidate_query_cache()
+    assert dataset_parser.pre_aggregation.wait(10)
+    assert dataset_parser.get_datas_by_payload(payload) == get_parser(DF).get_datas_by_payload(payload)
+    assert dataset_parser.pre_aggregation.stats()["hits"] == 1
+
+
+@pytest.mark.parametrize("pre_aggregations", [["city"], [["unknown"]]])
+def test_invalid_pre_aggregations_raise(pre_aggregations):
+    dataset_parser = get_parser(DF, other_params={"pre_aggregations": pre_aggregations})
+
+    with pytest.raises(ValueError):
+        dataset_parser.build_pre_aggregations()
@@ -31,7 +31,7 @@ def test_track_event_prints_privacy_notice_once_and_handles_empty_properties(mon
     monkeypatch.setattr(
         track,
         "_get_analytics_client",
-        lambda: SimpleNamespace(track=lambda **kwargs: analytics_calls.append(kwargs)),
+        lambda: SimpleNamespace(track=lambda **kwargs: analytics_calls.append(kwargs) or (True, kwargs)),
     )
     monkeypatch.setattr(
         track,
@@ -41,6 +41,7 @@ def test_track_event_prints_privacy_notice_once_and_handles_empty_properties(mon
 
     try:
         track.track_event("invoke_props")
+        assert track.telemetry_dispatcher.flush(timeout=5)
     finally:
         GlobalVarManager.privacy = previous_privacy
 
@@ -101,10 +102,10 @@ track_event("invoke_props", {"mode": "test"})
     assert result.returncode == 0, result.stderr
 
 
-def test_analytics_clients_are_configured_without_background_workers(monkeypatch):
+def test_analytics_clients_are_configured_to_upload_in_background_batches(monkeypatch):
     fake_analytics = SimpleNamespace(
         write_key=None,
-        sync_mode=False,
+        sync_mode=True,
         timeout=15,
         max_retries=10,
         track=lambda **_kwargs: None,
@@ -113,10 +114,10 @@ def test_analytics_clients_are_configured_without_background_workers(monkeypatch
         config=SimpleNamespace(
             auth_token=None,
             proxies=None,
-            sync_send=False,
+            sync_send=True,
             timeout=15,
             max_retries=5,
-            thread=1,
+            thread=0,
         ),
         track=lambda _payload: None,
     )
@@ -136,13 +137,13 @@ def test_analytics_clients_are_configured_without_background_workers(monkeypatch
         track._analytics_client = previous_analytics_client
         track._kanaries_track_client = previous_kanaries_track_client
 
-    assert fake_analytics.sync_mode is True
+    assert fake_analytics.sync_mode is False
     assert fake_analytics.timeout == 1
     assert fake_analytics.max_retries == 0
-    assert fake_kanaries_track.config.sync_send is True
+    assert fake_kanaries_track.config.sync_send is False
     assert fake_kanaries_track.config.timeout == 1
     assert fake_kanaries_track.config.max_retries == 1
-    assert fake_kanaries_track.config.thread == 0
+    assert fake_kanaries_track.config.thread == 1
 
 
 def test_kanaries_track_single_retry_setting_does_not_loop(monkeypatch):
@@ -0,0 +1,108 @@
+import pandas as pd
+import pytest
+
+from pygwalker.services.data_parsers import get_parser
+
+DF = pd.DataFrame(
+    {
+        "city": ["London", "Tokyo", "Paris", "London"] * 500,
+        "rentals": [1, 2, 3, 4] * 500,
+        "temperature": [10.5, 20.0, 15.5, 12.0] * 500,
+    }
+)
+ROW_COUNT_TRANSFORM = {
+    "type": "transform",
+    "transform": [{"key": "gw_count_fid", "expression": {"op": "one", "params": [], "as": "gw_count_fid"}}],
+}
+
+
+def _aggregate_payload(measures, workflow_tail=None):
+    return {
+        "workflow": [
+            ROW_COUNT_TRANSFORM,
+            {"type": "view", "query": [{"op": "aggregate", "groupBy": ["city"], "measures": measures}]},
+            *(workflow_tail or [{"type": "sort", "by": ["city"], "sort": "ascending"}]),
+        ],
+        "limit": 100,
+    }
+
+
+def _get_parser(min_rows=0, sample_rows=500):
+    dataset_parser = get_parser(DF, other_params={"progressive_query": True})
+    dataset_parser.progressive_query.min_rows = min_rows
+    dataset_parser.progressive_query.sample_rows = sample_rows
+    dataset_parser.build_progressive_sample(background=False)
+    return dataset_parser
+
+
+def test_sampled_aggregates_are_scaled_to_whole_table():
+    dataset_parser = _get_parser()
+    payload = _aggregate_payload(
+        [
+            {"field": "gw_count_fid", "agg": "sum", "asFieldKey": "row_count"},
+            {"field": "rentals", "agg": "count", "asFieldKey": "rentals_count"},
+            {"field": "rentals", "agg": "sum", "asFieldKey": "rentals_sum"},
+            {"field": "temperature", "agg": "mean", "asFieldKey": "temperature_mean"},
+        ]
+    )
+
+    sql = dataset_parser.get_approximate_sql_by_payload(payload)
+    approximate = {row["city"]: row for row in dataset_parser.get_datas_by_sql(sql)}
+    exact = {row["city"]: row for row in dataset_parser.get_datas_by_payload(payload)}
+
+    assert '"pygwalker_sample_table"' in sql
+    assert dataset_parser.progressive_query.stats()["scale"] == 4.0
+    assert sum(row["row_count"] for row in approximate.values()) == len(DF)
+    assert sum(row["rentals_count"] for row in approximate.values()) == len(DF)
+    assert isinstance(approximate["London"]["rentals_count"], int)
+    assert isinstance(approximate["London"]["row_count"], int)
+    # every row of a city has the same temperature, so the mean of a sample is exact
+    assert approximate["Tokyo"]["temperature_mean"] == exact["Tokyo"]["temperature_mean"]
+    assert approximate["Tokyo"]["rentals_sum"] == pytest.approx(approximate["Tokyo"]["row_count"] * 2)
+
+
+def test_row_counts_scaled_by_fractional_scale_stay_integers():
+    dataset_parser = _get_parser(sample_rows=600)
+    payload = _aggregate_payload([{"field": "gw_count_fid", "agg": "sum", "asFieldKey": "row_count"}])
+
+    sql = dataset_parser.get_approximate_sql_by_payload(payload)
+    rows = dataset_parser.get_datas_by_sql(sql)
+
+    assert dataset_parser.progressive_query.stats()["scale"] == pytest.approx(2000 / 600)
+    assert all(isinstance(row["row_count"], int) for row in rows)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [
+        _aggregate_payload([{"field": "rentals", "agg": "distinctCount", "asFieldKey": "rentals_distinct"}]),
+        _aggregate_payload(
+            [{"field": "rentals", "agg": "sum", "asFieldKey": "rentals_sum"}],
+            workflow_tail=[{"type": "filter", "filters": [{"fid": "rentals_sum", "rule": {"type": "range"}}]}],
+        ),
+        {"workflow": [{"type": "view", "query": [{"op": "raw", "fields": ["city"]}]}]},
+    ],
+)
+def test_payloads_which_can_not_be_estimated_are_answered_exactly(payload):
+    dataset_parser = _get_parser()
+
+    assert dataset_parser.get_approximate_sql_by_payload(payload) is None
+    assert dataset_parser.progressive_query.stats()["skipped"] == 1
+
+
+def test_small_tables_are_not_sampled():
+    dataset_parser = _get_parser(min_rows=len(DF) + 1)
+    payload = _aggregate_payload([{"field": "rentals", "agg": "sum", "asFieldKey": "rentals_sum"}])
+
+    assert dataset_parser.get_approximate_sql_by_payload(payload) is None
+    assert dataset_parser.progressive_query.stats()["sampled"] is False
+
+
+def test_sample_is_rebuilt_after_invalidating_query_cache():
+    dataset_parser = _get_parser()
+    payload = _aggregate_payload([{"field": "rentals", "agg": "sum", "asFieldKey": "rentals_sum"}])
+
+    dataset_parser.invalidate_query_cache()
+    assert dataset_parser.progressive_query.wait(10)
+    sql = dataset_parser.get_approximate_sql_by_payload(payload)
+    assert len(dataset_parser.get_datas_by_sql(sql)) == 3
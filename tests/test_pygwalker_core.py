@@ -686,6 +686,20 @@ def test_ping_callback_rejects_unknown_fields(monkeypatch):
     assert "unexpected" in response["message"]
 
 
+def test_cancel_request_callback_cancels_running_request(monkeypatch):
+    from pygwalker.services.query_control import query_controller
+
+    walker = _make_walker(monkeypatch)
+    comm = BaseCommunication("core")
+    walker._init_callback(comm)
+
+    with query_controller.request("running-rid") as query_request:
+        response = comm._receive_msg("cancel_request", {"rid": "running-rid"})
+
+    assert response == {"code": 0, "data": {"cancelled": True}, "message": "success"}
+    assert query_request.cancelled
+
+
 def test_base_communication_envelope_rejects_missing_action():
     comm = BaseCommunication("core")
 
@@ -1047,6 +1061,25 @@ def test_pygwalker_batch_sql_callback_returns_records(monkeypatch):
     assert calls == [["SELECT 1"]]
 
 
+def test_pygwalker_pushes_invalidated_datas_to_pushing_comms_only(monkeypatch):
+    from pygwalker.services.data_communication import INVALIDATE_DATAS_ACTION
+
+    walker = _make_walker(monkeypatch, kernel_computation=True)
+    pushed = []
+
+    class PushCommunication(BaseCommunication):
+        supports_push = True
+
+        def send_msg_async(self, action, data):
+            pushed.append((self.gid, action))
+
+    walker._init_callback(BaseCommunication("http"))
+    walker._init_callback(PushCommunication("push"))
+    walker.data_parser.invalidate_query_cache()
+
+    assert pushed == [("push", INVALIDATE_DATAS_ACTION)]
+
+
 def test_pygwalker_upload_spec_to_cloud_callback_writes_workspace_path(monkeypatch):
     walker = _make_walker(monkeypatch, use_save_tool=True)
     writes = []
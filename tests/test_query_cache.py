@@ -0,0 +1,176 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import pandas as pd
+import pytest
+
+from pygwalker.errors import QueryCancelledError, QueryTimeoutError
+from pygwalker.services.data_parsers import get_parser
+from pygwalker.services.query_cache import QueryResultCache, query_result_cache
+from pygwalker.services.query_control import query_controller
+
+
+def test_query_cache_counts_hits_and_misses():
+    cache = QueryResultCache(max_bytes=1024)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return [{"total": 1}]
+
+    assert cache.get_or_compute(("dataset", "rows", "SELECT 1"), compute, lambda _: 10) == [{"total": 1}]
+    assert cache.get_or_compute(("dataset", "rows", "SELECT 1"), compute, lambda _: 10) == [{"total": 1}]
+
+    assert len(calls) == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1, "current_bytes": 10, "max_bytes": 1024}
+
+
+def test_query_cache_evicts_least_recently_used_results_by_bytes_size():
+    cache = QueryResultCache(max_bytes=100)
+
+    cache.put(("dataset", "rows", "a"), "a", 40)
+    cache.put(("dataset", "rows", "b"), "b", 40)
+    cache.get(("dataset", "rows", "a"))
+    cache.put(("dataset", "rows", "c"), "c", 40)
+    cache.put(("dataset", "rows", "too large"), "d", 200)
+
+    assert cache.get(("dataset", "rows", "a")) == (True, "a")
+    assert cache.get(("dataset", "rows", "b")) == (False, None)
+    assert cache.get(("dataset", "rows", "c")) == (True, "c")
+    assert cache.get(("dataset", "rows", "too large")) == (False, None)
+
+
+def test_query_cache_expires_results_with_ttl_and_invalidates_by_dataset():
+    cache = QueryResultCache(max_bytes=1024)
+
+    cache.put(("remote", "rows", "SELECT 1"), "expired", 10, ttl=0)
+    cache.put(("dataset_a", "rows", "SELECT 1"), "a", 10)
+    cache.put(("dataset_b", "rows", "SELECT 1"), "b", 10)
+    cache.invalidate("dataset_a")
+
+    assert cache.get(("remote", "rows", "SELECT 1")) == (False, None)
+    assert cache.get(("dataset_a", "rows", "SELECT 1")) == (False, None)
+    assert cache.get(("dataset_b", "rows", "SELECT 1")) == (True, "b")
+
+
+def test_query_cache_can_be_disabled():
+    cache = QueryResultCache(max_bytes=0)
+    calls = []
+
+    for _ in range(2):
+        cache.get_or_compute(("dataset", "rows", "SELECT 1"), lambda: calls.append(1), lambda _: 1)
+
+    assert len(calls) == 2
+
+
+def test_dataframe_parser_reuses_cached_results_until_invalidated():
+    df = pd.DataFrame({"value": [1, 2, 3]})
+    parser = get_parser(df)
+    sql = "SELECT SUM(value) AS total FROM pygwalker_mid_table"
+
+    assert parser.get_datas_by_sql(sql) == [{"total": 6}]
+    parser.df.loc[0, "value"] = 10
+    hits = query_result_cache.hits
+    assert parser.get_datas_by_sql(sql) == [{"total": 6}]
+    assert query_result_cache.hits == hits + 1
+
+    parser.invalidate_query_cache()
+    assert parser.get_datas_by_sql(sql) == [{"total": 15}]
+    assert get_parser(df).get_datas_by_sql(sql) == [{"total": 6}]
+
+
+def test_query_cache_returns_copies_of_rows():
+    cache = QueryResultCache(max_bytes=1024)
+
+    rows = cache.get_or_compute(("dataset", "rows", "SELECT 1"), lambda: [{"total": 1}], lambda _: 10)
+    rows[0]["extra"] = 2
+    rows.append({"total": 3})
+
+    assert cache.get_or_compute(("dataset", "rows", "SELECT 1"), lambda: [], lambda _: 10) == [{"total": 1}]
+
+
+def test_query_cache_computes_concurrent_misses_once():
+    cache = QueryResultCache(max_bytes=1024)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(10)
+        return [{"total": 1}]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(cache.get_or_compute, ("dataset", "rows", "SELECT 1"), compute, lambda _: 10)]
+        assert started.wait(10)
+        futures += [
+            executor.submit(cache.get_or_compute, ("dataset", "rows", "SELECT 1"), compute, lambda _: 10)
+            for _ in range(3)
+        ]
+        release.set()
+        results = [future.result(10) for future in futures]
+
+    assert results == [[{"total": 1}]] * 4
+    assert len(calls) == 1
+
+
+def test_query_cache_waiters_compute_again_when_computing_caller_fails():
+    cache = QueryResultCache(max_bytes=1024)
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing_compute():
+        started.set()
+        release.wait(10)
+        raise RuntimeError("cancelled")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        failing = executor.submit(cache.get_or_compute, ("dataset", "rows", "SELECT 1"), failing_compute, len)
+        assert started.wait(10)
+        waiting = executor.submit(cache.get_or_compute, ("dataset", "rows", "SELECT 1"), lambda: [{"total": 1}], len)
+        release.set()
+
+        with pytest.raises(RuntimeError):
+            failing.result(10)
+        assert waiting.result(10) == [{"total": 1}]
+
+
+def test_query_cache_waiters_stop_waiting_when_their_request_is_cancelled():
+    cache = QueryResultCache(max_bytes=1024)
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_compute():
+        started.set()
+        release.wait(10)
+        return [{"total": 1}]
+
+    def wait_in_request(rid, timeout=None):
+        with query_controller.request(rid, timeout):
+            return cache.get_or_compute(("dataset", "rows", "SELECT 1"), lambda: [{"total": 2}], len)
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        computing = executor.submit(cache.get_or_compute, ("dataset", "rows", "SELECT 1"), slow_compute, len)
+        assert started.wait(10)
+        cancelled = executor.submit(wait_in_request, "waiting-rid")
+        timed_out = executor.submit(wait_in_request, "timed-out-rid", 0.2)
+        with pytest.raises(QueryTimeoutError):
+            timed_out.result(10)
+        query_controller.cancel("waiting-rid")
+        with pytest.raises(QueryCancelledError):
+            cancelled.result(10)
+        assert not computing.done()
+        release.set()
+
+        assert computing.result(10) == [{"total": 1}]
+
+
+def test_closing_parser_drops_its_cached_results():
+    parser = get_parser(pd.DataFrame({"value": [1, 2, 3]}))
+    parser.get_datas_by_sql("SELECT SUM(value) AS total FROM pygwalker_mid_table")
+    assert any(key[0] == parser.dataset_fingerprint for key in query_result_cache._cache.keys())
+
+    parser.close()
+
+    assert not any(key[0] == parser.dataset_fingerprint for key in query_result_cache._cache.keys())
@@ -0,0 +1,136 @@
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+from pygwalker.communications.anywidget_comm import AnywidgetCommunication
+from pygwalker.communications.base import BaseCommunication
+from pygwalker.data_parsers.database_parser import Connector
+from pygwalker.errors import BatchQueryError, ErrorCode, QueryCancelledError, QueryTimeoutError
+from pygwalker.services.batch_query import execute_batch
+from pygwalker.services.data_parsers import get_parser
+from pygwalker.services.query_control import QueryController, query_controller
+
+SLOW_DUCKDB_SQL = "SELECT COUNT(*) AS total FROM range(100000000000) CROSS JOIN pygwalker_mid_table"
+SLOW_SQLITE_SQL = "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) SELECT COUNT(*) FROM c"
+
+
+def _get_parser():
+    return get_parser(pd.DataFrame({"value": [1, 2]}))
+
+
+def test_duckdb_query_is_interrupted_by_request_deadline():
+    dataset_parser = _get_parser()
+
+    start = time.monotonic()
+    with pytest.raises(QueryTimeoutError):
+        with query_controller.request("deadline-rid", timeout=0.2):
+            dataset_parser.get_datas_by_sql(SLOW_DUCKDB_SQL)
+
+    assert time.monotonic() - start < 5
+    # the connection is still usable after the interrupt
+    assert dataset_parser.get_datas_by_sql("SELECT SUM(value) AS total FROM pygwalker_mid_table") == [{"total": 3}]
+
+
+def test_duckdb_query_is_cancelled_by_rid():
+    dataset_parser = _get_parser()
+    threading.Timer(0.2, query_controller.cancel, ("cancel-rid",)).start()
+
+    with pytest.raises(QueryCancelledError) as exc_info:
+        with query_controller.request("cancel-rid"):
+            dataset_parser.get_datas_by_sql_arrow(SLOW_DUCKDB_SQL)
+
+    assert exc_info.value.code == ErrorCode.QUERY_CANCELLED
+
+
+def test_request_cancelled_before_start_skips_its_queries():
+    controller = QueryController()
+    calls = []
+
+    assert controller.cancel("queued-rid") is False
+    with pytest.raises(QueryCancelledError):
+        with controller.request("queued-rid"):
+            with controller.interruptible(lambda: calls.append("interrupt")):
+                calls.append("query")
+
+    assert calls == []
+    assert controller.stats() == {"running": 0, "cancelled": 1, "timed_out": 0}
+
+
+def test_queries_outside_of_request_are_not_interruptible():
+    controller = QueryController()
+
+    with controller.interruptible(lambda: None):
+        pass
+
+    assert controller.cancel("unknown-rid") is False
+
+
+def test_batch_queries_on_worker_threads_are_cancelled_with_request():
+    dataset_parser = _get_parser()
+    threading.Timer(0.2, query_controller.cancel, ("batch-rid",)).start()
+
+    with pytest.raises(BatchQueryError) as exc_info:
+        with query_controller.request("batch-rid"):
+            execute_batch(dataset_parser.get_datas_by_sql, [SLOW_DUCKDB_SQL, SLOW_DUCKDB_SQL + " WHERE 1 = 1"], 2)
+
+    assert exc_info.value.code == ErrorCode.QUERY_CANCELLED
+    assert all(isinstance(error, QueryCancelledError) for error in exc_info.value.errors.values())
+
+
+def test_connector_query_is_cancelled_through_dbapi_connection():
+    connector = Connector.from_sqlalchemy_engine(create_engine("sqlite://"), "SELECT 1 AS value")
+
+    with pytest.raises(QueryTimeoutError):
+        with query_controller.request(None, timeout=0.2):
+            connector.query_datas(SLOW_SQLITE_SQL)
+
+    assert connector.query_datas("SELECT 1 AS value") == [{"value": 1}]
+
+
+def test_communication_applies_envelope_timeout_to_blocking_endpoints():
+    dataset_parser = _get_parser()
+    comm = BaseCommunication("query-control")
+    comm.register("slow_query", lambda _: dataset_parser.get_datas_by_sql(SLOW_DUCKDB_SQL), blocking=True)
+
+    response = asyncio.run(
+        comm._receive_msg_envelope_async({"action": "slow_query", "data": {}, "rid": "comm-rid", "timeout": 0.2})
+    )
+
+    assert response["code"] == ErrorCode.QUERY_TIMEOUT
+    assert "timed out" in response["message"]
+
+
+def test_anywidget_cancel_request_interrupts_running_query():
+    dataset_parser = _get_parser()
+    comm = AnywidgetCommunication("anywidget-query-control")
+    comm.register("slow_query", lambda _: dataset_parser.get_datas_by_sql(SLOW_DUCKDB_SQL), blocking=True)
+    comm.register("cancel_request", lambda data: {"cancelled": query_controller.cancel(data["rid"])})
+    responses = {}
+    finished = threading.Event()
+
+    def send(message, buffers=None):
+        message = json.loads(message["data"])
+        responses[message["rid"]] = message["data"]
+        if message["rid"] == "slow-rid":
+            finished.set()
+
+    comm.widget = SimpleNamespace(send=send)
+    comm._on_mesage(None, {"type": "pyg_request", "msg": {"rid": "slow-rid", "action": "slow_query", "data": {}}}, [])
+    time.sleep(0.2)
+    comm._on_mesage(
+        None,
+        {"type": "pyg_request", "msg": {"rid": "cancel-rid", "action": "cancel_request", "data": {"rid": "slow-rid"}}},
+        [],
+    )
+
+    # the cancel request is answered while the query is still running on the worker pool
+    assert responses["cancel-rid"]["code"] == 0
+    assert "slow-rid" not in responses
+    assert finished.wait(5)
+    assert responses["slow-rid"]["code"] == ErrorCode.QUERY_CANCELLED
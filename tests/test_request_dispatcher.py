@@ -0,0 +1,214 @@
+from types import SimpleNamespace
+import asyncio
+import json
+import threading
+import time
+
+from pygwalker.communications.anywidget_comm import AnywidgetCommunication
+from pygwalker.communications.base import BaseCommunication
+from pygwalker.errors import ErrorCode
+from pygwalker.services.query_control import query_controller
+from pygwalker.services.request_coalescer import RequestCoalescer
+from pygwalker.services.request_dispatcher import RequestDispatcher
+
+
+def test_request_dispatcher_limits_concurrency_per_gid():
+    dispatcher = RequestDispatcher(max_workers=4, max_concurrency_per_gid=1)
+    lock = threading.Lock()
+    running = {"a": 0, "b": 0}
+    max_running = {"a": 0, "b": 0}
+
+    def query(gid):
+        with lock:
+            running[gid] += 1
+            max_running[gid] = max(max_running[gid], running[gid])
+        time.sleep(0.02)
+        with lock:
+            running[gid] -= 1
+        return gid
+
+    futures = [dispatcher.submit(gid, query, gid) for gid in ["a", "a", "a", "b", "b"]]
+
+    assert [future.result(timeout=5) for future in futures] == ["a", "a", "a", "b", "b"]
+    assert max_running == {"a": 1, "b": 1}
+    stats = dispatcher.stats()
+    assert stats["completed"] == 5
+    assert stats["queued"] == 0
+    assert stats["running"] == 0
+    assert stats["max_queue_depth"] >= 3
+
+
+def test_request_dispatcher_propagates_errors():
+    dispatcher = RequestDispatcher(max_workers=1, max_concurrency_per_gid=1)
+
+    def query():
+        raise ValueError("bad query")
+
+    future = dispatcher.submit("gid", query)
+
+    assert isinstance(future.exception(timeout=5), ValueError)
+
+
+def test_async_envelope_runs_blocking_endpoints_off_event_loop():
+    comm = BaseCommunication("async-gid")
+    thread_names = {}
+    comm.register("ping", lambda _: thread_names.setdefault("ping", threading.current_thread().name))
+    comm.register(
+        "get_datas",
+        lambda _: thread_names.setdefault("get_datas", threading.current_thread().name),
+        blocking=True,
+    )
+
+    async def main():
+        loop_thread_name = threading.current_thread().name
+        ping_response, query_response = await asyncio.gather(
+            comm._receive_msg_envelope_async({"action": "ping", "data": {}}),
+            comm._receive_msg_envelope_async({"action": "get_datas", "data": {}}),
+        )
+        return loop_thread_name, ping_response, query_response
+
+    loop_thread_name, ping_response, query_response = asyncio.run(main())
+
+    assert ping_response["code"] == 0
+    assert query_response["code"] == 0
+    assert thread_names["ping"] == loop_thread_name
+    assert thread_names["get_datas"].startswith("pygwalker-request")
+
+
+def test_async_envelope_returns_error_response_of_blocking_endpoint():
+    comm = BaseCommunication("async-gid")
+
+    def query(_):
+        raise ValueError("bad query")
+
+    comm.register("get_datas", query, blocking=True)
+
+    response = asyncio.run(comm._receive_msg_envelope_async({"action": "get_datas", "data": {}}))
+
+    assert response["code"] != 0
+    assert response["message"] == "bad query"
+
+
+def test_request_coalescer_shares_future_of_identical_requests():
+    coalescer = RequestCoalescer()
+    data = {"payload": {"workflow": [], "tag": "chart-1"}}
+
+    owner_future, is_owner = coalescer.acquire("gid", "get_datas_by_payload", data, "rid-1")
+    shared_future, is_shared_owner = coalescer.acquire("gid", "get_datas_by_payload", dict(data), "rid-2")
+    _, is_other_gid_owner = coalescer.acquire("other-gid", "get_datas_by_payload", data, "rid-3")
+
+    assert is_owner and is_other_gid_owner and not is_shared_owner
+    assert shared_future is owner_future
+    owner_future.set_result({"code": 0})
+    assert coalescer.stats() == {"inflight": 1, "coalesced": 1, "superseded": 0}
+
+
+def test_async_envelope_coalesces_identical_requests():
+    comm = BaseCommunication("coalesce-gid")
+    calls = []
+
+    def query(data):
+        calls.append(data)
+        time.sleep(0.1)
+        return {"datas": [{"value": 1}]}
+
+    comm.register("get_datas_by_payload", query, blocking=True)
+    message = {"action": "get_datas_by_payload", "data": {"payload": {"workflow": [], "tag": "chart-1"}}}
+
+    async def main():
+        return await asyncio.gather(
+            *[comm._receive_msg_envelope_async({**message, "rid": f"rid-{index}"}) for index in range(3)]
+        )
+
+    responses = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert [response["data"] for response in responses] == [{"datas": [{"value": 1}]}] * 3
+
+
+def _chart_payload(city):
+    return {
+        "workflow": [
+            {"type": "filter", "filters": [{"fid": "city", "rule": {"type": "one of", "value": [city]}}]},
+            {"type": "view", "query": [{"op": "aggregate", "groupBy": ["city"], "measures": []}]},
+        ],
+        "limit": 50000,
+    }
+
+
+def test_request_coalescer_supersedes_batch_of_same_charts_only():
+    coalescer = RequestCoalescer()
+    domain_payload = {"workflow": [{"type": "view", "query": [{"op": "raw", "fields": ["city"]}]}]}
+
+    coalescer.acquire("gid", "batch_get_datas_by_payload", {"queryList": [_chart_payload("London")]}, "rid-1")
+    coalescer.acquire(
+        "gid", "batch_get_datas_by_payload", {"queryList": [_chart_payload("Tokyo"), domain_payload]}, "rid-2"
+    )
+    assert coalescer.stats()["superseded"] == 0
+
+    coalescer.acquire(
+        "gid", "batch_get_datas_by_payload", {"queryList": [domain_payload, _chart_payload("Paris")]}, "rid-3"
+    )
+    coalescer.acquire("gid", "batch_get_datas_by_sql", {"queryList": ["SELECT 1"]}, "rid-4")
+    coalescer.acquire("gid", "batch_get_datas_by_sql", {"queryList": ["SELECT 2"]}, "rid-5")
+    assert coalescer.stats() == {"inflight": 4, "coalesced": 0, "superseded": 1}
+
+
+def test_async_envelope_cancels_batch_superseded_by_same_charts():
+    comm = BaseCommunication("supersede-gid")
+    interrupted = threading.Event()
+
+    def query(data):
+        cities = [payload["workflow"][0]["filters"][0]["rule"]["value"][0] for payload in data["queryList"]]
+        if cities == ["London"]:
+            with query_controller.interruptible(interrupted.set):
+                interrupted.wait(5)
+            query_controller.current_request().check()
+        return {"datas": cities}
+
+    comm.register("batch_get_datas_by_payload", query, blocking=True)
+
+    def message(rid, city):
+        return {"action": "batch_get_datas_by_payload", "data": {"queryList": [_chart_payload(city)]}, "rid": rid}
+
+    async def send_newer():
+        await asyncio.sleep(0.1)
+        return await comm._receive_msg_envelope_async(message("new-rid", "Tokyo"))
+
+    async def main():
+        return await asyncio.gather(comm._receive_msg_envelope_async(message("old-rid", "London")), send_newer())
+
+    old_response, new_response = asyncio.run(main())
+
+    assert interrupted.is_set()
+    assert old_response["code"] == ErrorCode.QUERY_CANCELLED
+    assert new_response["code"] == 0
+    assert new_response["data"] == {"datas": ["Tokyo"]}
+
+
+def test_anywidget_coalesces_identical_requests():
+    comm = AnywidgetCommunication("anywidget-coalesce-gid")
+    calls = []
+    responses = {}
+    finished = threading.Event()
+
+    def query(data):
+        calls.append(data)
+        time.sleep(0.1)
+        return {"datas": [{"value": 1}]}
+
+    def send(message, buffers=None):
+        message = json.loads(message["data"])
+        responses[message["rid"]] = message["data"]
+        if len(responses) == 3:
+            finished.set()
+
+    comm.register("batch_get_datas_by_payload", query, blocking=True)
+    comm.widget = SimpleNamespace(send=send)
+    for index in range(3):
+        msg = {"rid": f"rid-{index}", "action": "batch_get_datas_by_payload", "data": {"queryList": []}}
+        comm._on_mesage(None, {"type": "pyg_request", "msg": msg}, [])
+
+    assert finished.wait(5)
+    assert len(calls) == 1
+    assert [responses[f"rid-{index}"]["data"] for index in range(3)] == [{"datas": [{"value": 1}]}] * 3
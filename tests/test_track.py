@@ -0,0 +1,70 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from pygwalker.services import track
+
+
+def _patch_clients(monkeypatch, analytics_track):
+    monkeypatch.setattr(track, "get_local_user_id", lambda: "test-user")
+    monkeypatch.setattr(track, "_get_analytics_client", lambda: SimpleNamespace(track=analytics_track))
+    monkeypatch.setattr(track, "_get_kanaries_track_client", lambda: SimpleNamespace(track=lambda _payload: None))
+
+
+def test_telemetry_dispatcher_sends_events_in_background(monkeypatch):
+    sent_events = []
+    release = threading.Event()
+
+    def slow_track(**kwargs):
+        release.wait(5)
+        sent_events.append(kwargs["event"])
+        return True, kwargs
+
+    _patch_clients(monkeypatch, slow_track)
+    dispatcher = track.TelemetryDispatcher()
+
+    start = time.perf_counter()
+    for i in range(3):
+        assert dispatcher.put(f"event_{i}", {}) is True
+    assert time.perf_counter() - start < 1
+
+    release.set()
+    assert dispatcher.flush(timeout=5)
+    assert sent_events == ["event_0", "event_1", "event_2"]
+    assert dispatcher.stats() == {"queued": 0, "sent": 3, "failed": 0, "dropped": 0}
+
+
+def test_telemetry_dispatcher_drops_events_when_queue_is_full(monkeypatch):
+    release = threading.Event()
+    _patch_clients(monkeypatch, lambda **kwargs: (release.wait(5), kwargs))
+    dispatcher = track.TelemetryDispatcher(max_queue_size=2, drain_size=1)
+
+    results = [dispatcher.put(f"event_{i}", {}) for i in range(10)]
+    release.set()
+
+    assert dispatcher.flush(timeout=5)
+    assert results.count(False) == dispatcher.stats()["dropped"]
+    assert dispatcher.stats()["dropped"] >= 7
+
+
+def test_telemetry_dispatcher_survives_client_errors(monkeypatch):
+    def broken_track(**_kwargs):
+        raise OSError("network unavailable")
+
+    _patch_clients(monkeypatch, broken_track)
+    dispatcher = track.TelemetryDispatcher()
+    dispatcher.put("event", {})
+    dispatcher.put("event", {})
+
+    assert dispatcher.flush(timeout=5)
+    assert dispatcher.stats() == {"queued": 0, "sent": 0, "failed": 2, "dropped": 0}
+
+
+def test_telemetry_dispatcher_counts_events_rejected_by_full_client_queue(monkeypatch):
+    _patch_clients(monkeypatch, lambda **kwargs: (kwargs["event"] != "rejected", kwargs))
+    dispatcher = track.TelemetryDispatcher()
+    dispatcher.put("accepted", {})
+    dispatcher.put("rejected", {})
+
+    assert dispatcher.flush(timeout=5)
+    assert dispatcher.stats() == {"queued": 0, "sent": 1, "failed": 1, "dropped": 0}